@@ -0,0 +1,92 @@
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.analytics import (
+    DailyCallerStats,
+    DailyCallStats,
+    DailyEmailStats,
+    DailyHotConversions,
+    DailyResultCodeStats,
+)
+
+
+def _in_window(model, since, until, team_id: Optional[int]):
+    conditions = [model.day >= since, model.day < until]
+    if team_id is not None:
+        conditions.append(model.team_id == team_id)
+    return conditions
+
+
+class AnalyticsController:
+    """
+    Read-only queries over the daily rollup tables kept by
+    jobs.analytics_rollups; they never touch the log tables. Every window
+    is [since, until). caller / sender 0 and an empty result code or
+    status come back as null.
+    """
+
+    # =====================================
+    # CALLS PER CALLER PER DAY
+    # =====================================
+    @staticmethod
+    def calls_per_caller(db: Session, since, until, team_id: Optional[int] = None, caller_id: Optional[int] = None) -> list:
+        stats = DailyCallerStats
+        conditions = _in_window(stats, since, until, team_id)
+        if caller_id is not None:
+            conditions.append(stats.caller_id == caller_id)
+
+        rows = db.execute(
+            select(stats.day, stats.team_id, stats.caller_id, stats.calls)
+            .where(*conditions)
+            .order_by(stats.day, stats.team_id, stats.caller_id)
+        ).mappings()
+        return [{**row, "caller_id": row["caller_id"] or None} for row in rows]
+
+    # =====================================
+    # RESULT CODE DISTRIBUTION
+    # =====================================
+    @staticmethod
+    def result_codes(db: Session, since, until, team_id: Optional[int] = None, caller_id: Optional[int] = None) -> list:
+        # One caller needs the full-grain table; teams read the per-code one
+        stats = DailyCallStats if caller_id is not None else DailyResultCodeStats
+        conditions = _in_window(stats, since, until, team_id)
+        if caller_id is not None:
+            conditions.append(stats.caller_id == caller_id)
+
+        total = func.sum(stats.calls)
+        rows = db.execute(
+            select(stats.team_id, stats.result_code, total.label("calls"))
+            .where(*conditions)
+            .group_by(stats.team_id, stats.result_code)
+            .order_by(stats.team_id, total.desc())
+        ).mappings()
+        return [{**row, "result_code": row["result_code"] or None} for row in rows]
+
+    # =====================================
+    # HOT CONVERSIONS
+    # =====================================
+    @staticmethod
+    def hot_conversions(db: Session, since, until, team_id: Optional[int] = None) -> list:
+        stats = DailyHotConversions
+        rows = db.execute(
+            select(stats.day, stats.team_id, stats.conversions)
+            .where(*_in_window(stats, since, until, team_id))
+            .order_by(stats.day, stats.team_id)
+        ).mappings()
+        return [dict(row) for row in rows]
+
+    # =====================================
+    # EMAIL STATUS
+    # =====================================
+    @staticmethod
+    def email_status(db: Session, since, until, team_id: Optional[int] = None) -> list:
+        stats = DailyEmailStats
+        rows = db.execute(
+            select(stats.team_id, stats.sender_id, stats.status, func.sum(stats.emails).label("emails"))
+            .where(*_in_window(stats, since, until, team_id))
+            .group_by(stats.team_id, stats.sender_id, stats.status)
+            .order_by(stats.team_id, stats.sender_id, stats.status)
+        ).mappings()
+        return [{**row, "status": row["status"] or None} for row in rows]
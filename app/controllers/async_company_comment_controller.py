@@ -0,0 +1,128 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.controllers.company_comment_controller import CompanyCommentController
+from app.models.company import Company
+from app.models.company_comment import CompanyComment
+
+
+class AsyncCompanyCommentController:
+    """
+    CompanyCommentController for the async request path (settings.DB_ASYNC).
+    The comment author is a joined eager load, so serializing needs no IO.
+    """
+
+    # =====================================
+    # CREATE COMMENT
+    # =====================================
+    @staticmethod
+    async def create_comment(company_id: int, message: str, db: AsyncSession, current_user):
+        if not message.strip():
+            raise ValueError("Comment cannot be empty")
+
+        company = await db.scalar(select(Company.id).where(Company.id == company_id))
+        if not company:
+            raise ValueError("Company not found")
+
+        comment = CompanyComment(
+            company_id=company_id,
+            user_id=current_user.id if current_user else None,
+            comment=message,
+            created_at=datetime.utcnow()
+        )
+
+        try:
+            db.add(comment)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            raise e
+
+        comment = await AsyncCompanyCommentController._get_comment(db, comment.id, refresh=True)
+        return CompanyCommentController._serialize(comment)
+
+    # =====================================
+    # GET ALL COMMENTS BY COMPANY ID
+    # =====================================
+    @staticmethod
+    async def get_comments_by_company_id(company_id: int, db: AsyncSession):
+        comments = (
+            await db.scalars(
+                select(CompanyComment)
+                .where(CompanyComment.company_id == company_id)
+                .order_by(desc(CompanyComment.id))
+            )
+        ).unique().all()
+
+        return [CompanyCommentController._serialize(c) for c in comments]
+
+    # =====================================
+    # GET SINGLE COMMENT
+    # =====================================
+    @staticmethod
+    async def get_comment(comment_id: int, db: AsyncSession):
+        comment = await AsyncCompanyCommentController._get_comment(db, comment_id)
+        if not comment:
+            raise ValueError("Comment not found")
+
+        return CompanyCommentController._serialize(comment)
+
+    # =====================================
+    # UPDATE COMMENT
+    # =====================================
+    @staticmethod
+    async def update_comment(comment_id: int, message: str, db: AsyncSession, current_user):
+        if not message.strip():
+            raise ValueError("Comment cannot be empty")
+
+        comment = await AsyncCompanyCommentController._get_comment(db, comment_id)
+        if not comment:
+            raise ValueError("Comment not found")
+
+        if current_user and comment.user_id != current_user.id:
+            raise PermissionError("You are not allowed to update this comment")
+
+        comment.comment = message
+
+        try:
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            raise e
+
+        comment = await AsyncCompanyCommentController._get_comment(db, comment_id, refresh=True)
+        return CompanyCommentController._serialize(comment)
+
+    # =====================================
+    # DELETE COMMENT
+    # =====================================
+    @staticmethod
+    async def delete_comment(comment_id: int, db: AsyncSession, current_user):
+        comment = await AsyncCompanyCommentController._get_comment(db, comment_id)
+        if not comment:
+            raise ValueError("Comment not found")
+
+        if current_user and comment.user_id != current_user.id:
+            raise PermissionError("You are not allowed to delete this comment")
+
+        try:
+            await db.delete(comment)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            raise e
+
+        return {"message": "Comment deleted successfully"}
+
+    # =====================================
+    # PRIVATE HELPERS
+    # =====================================
+    @staticmethod
+    async def _get_comment(db: AsyncSession, comment_id: int, refresh: bool = False) -> Optional[CompanyComment]:
+        statement = select(CompanyComment).where(CompanyComment.id == comment_id)
+        if refresh:
+            statement = statement.execution_options(populate_existing=True)
+        return (await db.scalars(statement)).unique().first()
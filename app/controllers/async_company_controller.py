@@ -0,0 +1,189 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+
+from app.controllers.company_controller import DEFAULT_HISTORY_LIMIT, CompanyController
+from app.models.company import Company
+from app.models.company_history import CompanyHistory
+from app.schemas.company_schema import CompanyCreateRequest
+from utils.pagination import DEFAULT_PAGE_SIZE
+from utils.reference_cache import reference_cache
+
+
+class AsyncCompanyController:
+    """
+    CompanyController for the async request path (settings.DB_ASYNC), with
+    the same queries and response shapes.
+    """
+
+    # =========================
+    # GET COMPANIES (ONE PAGE)
+    # =========================
+    @staticmethod
+    async def get_companies_page(
+        db: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        include_histories: bool = True,
+        history_limit: Optional[int] = DEFAULT_HISTORY_LIMIT,
+    ):
+        statement = CompanyController._companies_page_statement(cursor, limit)
+        companies = (await db.scalars(statement)).all()
+        has_more = len(companies) > limit
+        companies = companies[:limit]
+
+        histories = None
+        if include_histories:
+            histories = {}
+            if companies:
+                rows = await db.execute(
+                    CompanyController._history_summaries_statement([c.id for c in companies], history_limit)
+                )
+                histories = CompanyController._group_histories(rows)
+
+        # The shared serializer reads timezone labels synchronously
+        await reference_cache.warm_async("timezones", [c.timezone_id for c in companies])
+        return CompanyController._companies_page_result(companies, histories, has_more)
+
+    # =========================
+    # CREATE COMPANY
+    # =========================
+    @staticmethod
+    async def create_company_in_db(request: CompanyCreateRequest, db: AsyncSession):
+        existing = await db.scalar(select(Company.id).where(Company.name == request.name).limit(1))
+        if existing:
+            raise HTTPException(status_code=400, detail="Company name already exists")
+
+        symbol = request.symbol or request.name[:3].upper()
+
+        new_company = Company(
+            name=request.name,
+            symbol=symbol,
+            country=request.country,
+            city=request.city,
+            state=request.state,
+            zip=request.zip,
+            website=request.website,
+            timezone_id=request.timezone_id,
+        )
+
+        try:
+            db.add(new_company)
+            await db.commit()
+            await db.refresh(new_company)
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=400, detail="Company name must be unique")
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail=str(e))
+
+        return {
+            "id": new_company.id,
+            "name": new_company.name,
+            "symbol": new_company.symbol,
+            "country": new_company.country,
+            "state": new_company.state,
+            "city": new_company.city,
+            "zip": new_company.zip,
+            "timezone": await reference_cache.label_async("timezones", new_company.timezone_id)
+        }
+
+    # =========================
+    # UPDATE COMPANY
+    # =========================
+    @staticmethod
+    async def update_company(company_id: int, request: CompanyCreateRequest, db: AsyncSession, current_user=None):
+        company = await db.get(Company, company_id)
+        if not company:
+            raise HTTPException(status_code=404, detail="Company not found")
+
+        existing = await db.scalar(
+            select(Company.id).where(Company.name == request.name, Company.id != company_id).limit(1)
+        )
+        if existing:
+            raise HTTPException(status_code=400, detail="Company name already exists")
+
+        symbol = request.symbol or request.name[:3].upper()
+        now = datetime.utcnow()
+        username = current_user.username if current_user else "System"
+
+        history_parts = []
+
+        if company.name != request.name:
+            company.previous_company_name = company.name
+            company.backup_company_name = request.name
+            company.last_modified_time_name = now
+            company.last_modified_by_name = username
+            history_parts.append(f"name {company.name} to {request.name}")
+
+        if company.symbol != symbol:
+            company.previous_company_symbol = company.symbol
+            company.backup_company_symbol = symbol
+            company.last_modified_time_symbol = now
+            company.last_modified_by_symbol = username
+            history_parts.append(f"symbol {company.symbol} to {symbol}")
+
+        fields_to_track = ["country", "state", "city", "zip", "website", "timezone_id"]
+        for field in fields_to_track:
+            old_value = getattr(company, field)
+            new_value = getattr(request, field, None)
+            if old_value != new_value:
+                setattr(company, field, new_value)
+                history_parts.append(f"{field} {old_value} to {new_value}")
+
+        company.name = request.name
+        company.symbol = symbol
+
+        if history_parts:
+            now_str = now.strftime("%Y-%m-%d %H:%M:%S")
+            history_text = f"{now_str} - Modified by {username} - Company " + ", ".join(history_parts)
+            db.add(CompanyHistory(
+                company_id=company.id,
+                user_id=current_user.id if current_user else None,
+                history=history_text,
+                changed_at=now
+            ))
+
+        try:
+            await db.commit()
+            await db.refresh(company)
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail=str(e))
+
+        return {
+            "id": company.id,
+            "name": company.name,
+            "symbol": company.symbol,
+            "country": company.country,
+            "state": company.state,
+            "city": company.city,
+            "zip": company.zip,
+            "website": company.website,
+            "timezone": await reference_cache.label_async("timezones", company.timezone_id)
+        }
+
+    # =========================
+    # DELETE COMPANY
+    # =========================
+    @staticmethod
+    async def delete_company(company_id: int, db: AsyncSession):
+        company = await db.get(Company, company_id)
+        if not company:
+            raise HTTPException(status_code=404, detail="Company not found")
+
+        # AsyncSession.delete loads the cascaded leads/histories/comments
+        # itself, so no eager loading is needed here
+        await db.delete(company)
+        try:
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail=str(e))
+
+        return {"message": "Company deleted successfully"}
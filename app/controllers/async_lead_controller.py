@@ -0,0 +1,131 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+
+from app.controllers.lead_controller import LeadController
+from app.models.lead import Lead
+from app.schemas.lead_schema import LeadCreateRequest, LeadUpdateRequest
+from utils.pagination import DEFAULT_PAGE_SIZE
+from utils.reference_cache import reference_cache
+
+
+class AsyncLeadController:
+    """
+    LeadController for the async request path (settings.DB_ASYNC). Same
+    queries and response shapes; company and agent come from the model's
+    joined eager loads, so serializing never triggers lazy IO.
+    """
+
+    @staticmethod
+    async def create_lead_in_db(request: LeadCreateRequest, db: AsyncSession):
+        lead = Lead(
+            full_name=request.full_name,
+            company_id=request.company_id,
+            role=request.role,
+            phone=request.phone,
+            email=request.email if request.email else None,
+            others_contacts=request.others_contacts if request.others_contacts else None,
+            contact_type_id=request.contact_type_id,
+        )
+
+        db.add(lead)
+        await db.commit()
+
+        lead = await AsyncLeadController._get_lead(db, lead.id, refresh=True)
+        await AsyncLeadController._warm_labels(leads=[lead])
+        return LeadController._serialize_lead(lead)
+
+    @staticmethod
+    async def update_lead(lead_id: int, updates: LeadUpdateRequest, db: AsyncSession):
+        lead = await AsyncLeadController._get_lead(db, lead_id)
+        if not lead:
+            raise HTTPException(status_code=404, detail="Lead not found")
+
+        update_fields = [
+            "full_name", "role", "phone", "email",
+            "others_contacts", "company_id", "contact_type_id"
+        ]
+
+        for field in update_fields:
+            value = getattr(updates, field)
+            if value is not None:
+                setattr(lead, field, value)
+
+        await db.commit()
+
+        lead = await AsyncLeadController._get_lead(db, lead_id, refresh=True)
+        await AsyncLeadController._warm_labels(leads=[lead])
+        return LeadController._serialize_lead(lead)
+
+    @staticmethod
+    async def get_leads_page(
+        db: AsyncSession,
+        fields: list,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        company_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        contact_type_id: Optional[int] = None,
+        lead_type_id: Optional[int] = None,
+        not_work_anymore: Optional[bool] = None,
+        follow_up_from: Optional[date] = None,
+        follow_up_to: Optional[date] = None,
+    ):
+        statement = LeadController._leads_page_statement(
+            fields, cursor, limit,
+            company_id=company_id,
+            user_id=user_id,
+            contact_type_id=contact_type_id,
+            lead_type_id=lead_type_id,
+            not_work_anymore=not_work_anymore,
+            follow_up_from=follow_up_from,
+            follow_up_to=follow_up_to,
+        )
+        rows = (await db.execute(statement)).all()
+        await AsyncLeadController._warm_labels(rows=rows)
+        return LeadController._leads_page_result(rows, fields, limit)
+
+    @staticmethod
+    async def get_lead_by_id(lead_id: int, db: AsyncSession):
+        lead = await AsyncLeadController._get_lead(db, lead_id)
+        if not lead:
+            return None
+        await AsyncLeadController._warm_labels(leads=[lead])
+        return LeadController._serialize_lead(lead)
+
+    @staticmethod
+    async def get_leads_for_user(user_id: int, db: AsyncSession):
+        leads = (await db.scalars(select(Lead).where(Lead.user_id == user_id))).unique().all()
+        await AsyncLeadController._warm_labels(leads=leads)
+        return [LeadController._serialize_lead(lead) for lead in leads]
+
+    @staticmethod
+    async def _get_lead(db: AsyncSession, lead_id: int, refresh: bool = False) -> Optional[Lead]:
+        statement = select(Lead).where(Lead.id == lead_id)
+        if refresh:
+            # Reload relationships too, e.g. after company_id changed
+            statement = statement.execution_options(populate_existing=True)
+        return (await db.scalars(statement)).unique().first()
+
+    @staticmethod
+    async def _warm_labels(leads: list = (), rows: list = ()):
+        """
+        LeadController's serializers read reference labels synchronously:
+        load the ones they will need off the event loop first.
+        """
+        wanted = {"lead_types": set(), "contact_types": set(), "timezones": set()}
+        for lead in leads:
+            wanted["lead_types"].add(lead.lead_type_id)
+            wanted["contact_types"].add(lead.contact_type_id)
+            if lead.company:
+                wanted["timezones"].add(lead.company.timezone_id)
+        for row in rows:
+            wanted["lead_types"].add(getattr(row, "lead_type_id", None))
+            wanted["contact_types"].add(getattr(row, "contact_type_id", None))
+            wanted["timezones"].add(getattr(row, "company_timezone_id", None))
+
+        for name, ids in wanted.items():
+            await reference_cache.warm_async(name, ids)
@@ -1,27 +1,58 @@
 from datetime import datetime, timedelta
 
 from fastapi import HTTPException
-from passlib.context import CryptContext
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from jose import jwt, JWTError
 
-from app.models.user import User
+from app.models.user import User, slim_user_options
 from app.models.token import UserToken
 from app.middlewares.auth_middleware import create_token
 from config.settings import settings
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from database.replicas import use_primary
+from utils.jwt_helper import hash_token
+from utils.password_hasher import PasswordPoolSaturated, password_hasher
+from utils.principal_cache import principal_cache
 
 
 # ============================================================
 # Login: create access + refresh token and store in DB
 # ============================================================
 
-def login(email: str, password: str, db: Session):
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not pwd_context.verify(password, user.password):
+def _find_login_user(email: str, db: Session):
+    user = (
+        db.query(User)
+        .options(*slim_user_options(User.password))
+        .filter(User.email == email)
+        .first()
+    )
+    # Don't hold a pooled DB connection while the hash runs
+    db.close()
+    return user
+
+
+async def login(email: str, password: str, db: Session):
+    user = await run_in_threadpool(_find_login_user, email, db)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    # Verify on the dedicated password pool, waiting on the event loop so a
+    # pending login holds no request thread; shed load when the pool is full
+    try:
+        password_ok, upgraded_hash = await password_hasher.verify_and_update_async(password, user.password)
+    except PasswordPoolSaturated:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many login attempts in progress, please retry",
+            headers={"Retry-After": "1"},
+        )
+    if not password_ok:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    return await run_in_threadpool(_issue_tokens, user, upgraded_hash, db)
+
+
+def _issue_tokens(user: User, upgraded_hash, db: Session) -> dict:
     # Create tokens
     access_token = create_token(
         {"sub": user.email},
@@ -36,11 +67,16 @@ def login(email: str, password: str, db: Session):
     # Store in DB
     token_entry = UserToken(
         user_id=user.id,
-        access_token=access_token,
-        refresh_token=refresh_token,
+        access_token_hash=hash_token(access_token),
+        refresh_token_hash=hash_token(refresh_token),
         expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     )
     db.add(token_entry)
+
+    # Transparently move the stored hash to the current scheme / cost
+    if upgraded_hash:
+        db.query(User).filter(User.id == user.id).update({"password": upgraded_hash})
+
     db.commit()
     db.refresh(token_entry)
 
@@ -61,7 +97,9 @@ def login(email: str, password: str, db: Session):
 # ============================================================
 
 def logout(access_token: str, db: Session):
-    token = db.query(UserToken).filter(UserToken.access_token == access_token).first()
+    principal_cache.invalidate(access_token)
+
+    token = db.query(UserToken).filter(UserToken.access_token_hash == hash_token(access_token)).first()
     if token:
         db.delete(token)
         db.commit()
@@ -72,8 +110,15 @@ def logout(access_token: str, db: Session):
 # ============================================================
 
 def refresh_tokens(refresh_token: str, db: Session):
+    # The row is rotated below, so read it from the primary, not a replica
+    use_primary(db)
+
     # Check token in DB
-    token_record = db.query(UserToken).filter(UserToken.refresh_token == refresh_token).first()
+    token_record = (
+        db.query(UserToken)
+        .filter(UserToken.refresh_token_hash == hash_token(refresh_token))
+        .first()
+    )
     if not token_record:
         raise HTTPException(status_code=401, detail="Invalid refresh token")
 
@@ -94,7 +139,12 @@ def refresh_tokens(refresh_token: str, db: Session):
         raise HTTPException(status_code=401, detail="Invalid refresh token")
 
     # Get user
-    user = db.query(User).filter(User.id == token_record.user_id).first()
+    user = (
+        db.query(User)
+        .options(*slim_user_options())
+        .filter(User.id == token_record.user_id)
+        .first()
+    )
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
@@ -108,9 +158,10 @@ def refresh_tokens(refresh_token: str, db: Session):
         timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     )
 
-    # Update DB
-    token_record.access_token = new_access_token
-    token_record.refresh_token = new_refresh_token
+    # Update DB (the previous access token stops being valid)
+    principal_cache.invalidate_digest(token_record.access_token_hash)
+    token_record.access_token_hash = hash_token(new_access_token)
+    token_record.refresh_token_hash = hash_token(new_refresh_token)
     token_record.expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
 
     db.commit()
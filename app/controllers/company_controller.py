@@ -1,44 +1,151 @@
 from datetime import datetime
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
+from typing import Optional
+
+from sqlalchemy import desc, func, select
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import IntegrityError
-from fastapi import HTTPException, status
+from fastapi import HTTPException
 
 from app.models.company import Company
 from app.models.company_history import CompanyHistory
 from app.schemas.company_schema import CompanyCreateRequest
+from utils.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+from utils.reference_cache import reference_cache
+
+DEFAULT_HISTORY_LIMIT = 20
+MAX_HISTORY_LIMIT = 200
+
+
+# Flattened CSV header for company exports (histories joined with " | ")
+COMPANY_EXPORT_COLUMNS = [
+    "id", "name", "symbol", "country", "state", "city", "zip", "website",
+    "timezone_id", "timezone", "previous_company_name", "previous_company_symbol",
+    "histories",
+]
 
 
 class CompanyController:
 
     # =========================
-    # GET ALL COMPANIES
+    # GET COMPANIES (ONE PAGE)
     # =========================
     @staticmethod
-    def get_all_companies(db: Session):
-        companies = db.query(Company).order_by(desc(Company.id)).all()
-
-        result = []
-        for company in companies:
-            histories = [h.history for h in company.histories]
-
-            result.append({
-                "id": company.id,
-                "name": company.name,
-                "symbol": company.symbol,
-                "country": company.country,
-                "state": company.state,
-                "city": company.city,
-                "zip": company.zip,
-                "website": company.website,
-                "timezone_id": company.timezone_id,
-                "timezone": company.timezone.label if company.timezone else None,
-                "previous_company_name": company.previous_company_name,
-                "previous_company_symbol": company.previous_company_symbol,
-                "histories": histories
-            })
-
-        return result
+    def get_companies_page(
+        db: Session,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        include_histories: bool = True,
+        history_limit: Optional[int] = DEFAULT_HISTORY_LIMIT,
+    ):
+        """
+        One keyset page of companies, newest first. Histories for the whole
+        page come from a single query, so the query count does not grow with
+        the page size. Returns (items, next_cursor).
+        """
+        statement = CompanyController._companies_page_statement(cursor, limit)
+        companies = db.scalars(statement).all()
+        has_more = len(companies) > limit
+        companies = companies[:limit]
+
+        histories = None
+        if include_histories:
+            histories = CompanyController._history_summaries(
+                db, [c.id for c in companies], history_limit
+            )
+        return CompanyController._companies_page_result(companies, histories, has_more)
+
+    @staticmethod
+    def _companies_page_statement(cursor: Optional[str], limit: int):
+        statement = select(Company).order_by(desc(Company.id))
+
+        before_id = decode_cursor(cursor).get("id")
+        if before_id is not None and not isinstance(before_id, int):
+            raise ValueError("Invalid cursor")
+        if before_id is not None:
+            statement = statement.where(Company.id < before_id)
+
+        # One extra row tells whether another page exists
+        return statement.limit(limit + 1)
+
+    @staticmethod
+    def _companies_page_result(companies: list, histories: Optional[dict], has_more: bool):
+        items = [
+            CompanyController._serialize_company(
+                company,
+                histories.get(company.id, []) if histories is not None else None,
+            )
+            for company in companies
+        ]
+        next_cursor = encode_cursor({"id": companies[-1].id}) if has_more else None
+        return items, next_cursor
+
+    @staticmethod
+    def _history_summaries(db: Session, company_ids: list, per_company: Optional[int]):
+        """
+        Newest history texts per company (at most `per_company` each) for all
+        `company_ids` in one windowed query.
+        """
+        if not company_ids:
+            return {}
+
+        rows = db.execute(CompanyController._history_summaries_statement(company_ids, per_company))
+        return CompanyController._group_histories(rows)
+
+    @staticmethod
+    def _history_summaries_statement(company_ids: list, per_company: Optional[int]):
+        ranked = (
+            select(
+                CompanyHistory.company_id,
+                CompanyHistory.history,
+                func.row_number()
+                .over(
+                    partition_by=CompanyHistory.company_id,
+                    order_by=(CompanyHistory.changed_at.desc(), CompanyHistory.id.desc()),
+                )
+                .label("position"),
+            )
+            .where(CompanyHistory.company_id.in_(company_ids))
+            .subquery()
+        )
+        statement = select(ranked.c.company_id, ranked.c.history)
+        if per_company is not None:
+            statement = statement.where(ranked.c.position <= per_company)
+        return statement.order_by(ranked.c.company_id, ranked.c.position)
+
+    @staticmethod
+    def _group_histories(rows) -> dict:
+        summaries = {}
+        for company_id, history in rows:
+            summaries.setdefault(company_id, []).append(history)
+        return summaries
+
+    # =========================
+    # STREAM ALL COMPANIES (EXPORT)
+    # =========================
+    @staticmethod
+    def stream_companies(session_factory, batch_size: int = 500):
+        """
+        Yield every company in get_all_companies shape, `batch_size` rows at a
+        time through a server-side cursor; histories are loaded per batch.
+        Owns its session because it runs after the request has returned.
+        """
+        db = session_factory()
+        try:
+            query = (
+                db.query(Company)
+                .options(
+                    selectinload(Company.histories)
+                    .load_only(CompanyHistory.history)
+                    .lazyload(CompanyHistory.user)
+                )
+                .order_by(desc(Company.id))
+                .yield_per(batch_size)
+            )
+            for company in query:
+                histories = [h.history for h in company.histories]
+                yield CompanyController._serialize_company(company, histories)
+        finally:
+            db.close()
 
     # =========================
     # CREATE COMPANY
@@ -83,7 +190,7 @@ class CompanyController:
             "state": new_company.state,
             "city": new_company.city,
             "zip": new_company.zip,
-            "timezone": new_company.timezone.label if new_company.timezone else None
+            "timezone": reference_cache.label("timezones", new_company.timezone_id)
         }
 
     # =========================
@@ -164,7 +271,7 @@ class CompanyController:
             "city": company.city,
             "zip": company.zip,
             "website": company.website,
-            "timezone": company.timezone.label if company.timezone else None
+            "timezone": reference_cache.label("timezones", company.timezone_id)
         }
 
     # =========================
@@ -183,4 +290,27 @@ class CompanyController:
             db.rollback()
             raise HTTPException(status_code=500, detail=str(e))
 
-        return {"message": "Company deleted successfully"}
\ No newline at end of file
+        return {"message": "Company deleted successfully"}
+
+    # =========================
+    # PRIVATE SERIALIZER
+    # =========================
+    @staticmethod
+    def _serialize_company(company: Company, histories: Optional[list]):
+        data = {
+            "id": company.id,
+            "name": company.name,
+            "symbol": company.symbol,
+            "country": company.country,
+            "state": company.state,
+            "city": company.city,
+            "zip": company.zip,
+            "website": company.website,
+            "timezone_id": company.timezone_id,
+            "timezone": reference_cache.label("timezones", company.timezone_id),
+            "previous_company_name": company.previous_company_name,
+            "previous_company_symbol": company.previous_company_symbol,
+        }
+        if histories is not None:
+            data["histories"] = histories
+        return data
\ No newline at end of file
@@ -1,8 +1,55 @@
 # lead_controller.py
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from app.models.company import Company
 from app.models.lead import Lead
+from app.models.user import User
 from app.schemas.lead_schema import LeadCreateRequest, LeadUpdateRequest
+from utils.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+from utils.reference_cache import reference_cache
+
+
+# Columns (and joins) each field of _serialize_lead needs, in serializer order.
+# Listing queries select only the columns of the requested fields; reference
+# labels (lead type, contact type, timezone) come from the reference cache.
+LEAD_LIST_FIELDS = {
+    "id": ((Lead.id,), ()),
+    "lead_id": ((Company.id.label("company_pk"), Company.symbol.label("company_symbol"), Lead.full_name), ("company",)),
+    "full_name": ((Lead.full_name,), ()),
+    "role": ((Lead.role,), ()),
+    "phone": ((Lead.phone,), ()),
+    "email": ((Lead.email,), ()),
+    "assigned_to": ((Lead.assigned_to,), ()),
+    "agent": ((User.username.label("agent_username"),), ("agent",)),
+    "follow_up_date": ((Lead.follow_up_date,), ()),
+    "lead_type": ((Lead.lead_type_id,), ()),
+    "contact_type": ((Lead.contact_type_id,), ()),
+    "date_become_hot": ((Lead.date_become_hot,), ()),
+    "others_contacts": ((Lead.others_contacts,), ()),
+    "company": (
+        (
+            Company.id.label("company_pk"),
+            Company.name.label("company_name"),
+            Company.symbol.label("company_symbol"),
+            Company.timezone_id.label("company_timezone_id"),
+        ),
+        ("company",),
+    ),
+}
+
+# Flattened CSV header for lead exports
+LEAD_EXPORT_COLUMNS = [f for f in LEAD_LIST_FIELDS if f != "company"] + [
+    "company.id", "company.name", "company.symbol", "company.timezone",
+]
+
+_LEAD_LIST_JOINS = {
+    "company": (Company, Lead.company_id == Company.id),
+    "agent": (User, Lead.user_id == User.id),
+}
 
 
 class LeadController:
@@ -59,6 +106,37 @@ class LeadController:
         leads = db.query(Lead).all()
         return [LeadController._serialize_lead(lead) for lead in leads]
 
+    @staticmethod
+    def get_leads_page(
+        db: Session,
+        fields: list,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        company_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        contact_type_id: Optional[int] = None,
+        lead_type_id: Optional[int] = None,
+        not_work_anymore: Optional[bool] = None,
+        follow_up_from: Optional[date] = None,
+        follow_up_to: Optional[date] = None,
+    ):
+        """
+        One keyset page of leads ordered by id, selecting only the columns
+        behind `fields`. Returns (items, next_cursor); next_cursor is None on
+        the last page.
+        """
+        statement = LeadController._leads_page_statement(
+            fields, cursor, limit,
+            company_id=company_id,
+            user_id=user_id,
+            contact_type_id=contact_type_id,
+            lead_type_id=lead_type_id,
+            not_work_anymore=not_work_anymore,
+            follow_up_from=follow_up_from,
+            follow_up_to=follow_up_to,
+        )
+        return LeadController._leads_page_result(db.execute(statement).all(), fields, limit)
+
     @staticmethod
     def get_lead_by_id(lead_id: int, db: Session):
         lead = db.query(Lead).filter(Lead.id == lead_id).first()
@@ -71,6 +149,109 @@ class LeadController:
         leads = db.query(Lead).filter(Lead.user_id == user_id).all()
         return [LeadController._serialize_lead(lead) for lead in leads]
 
+    @staticmethod
+    def stream_leads(session_factory, batch_size: int = 1000):
+        """
+        Yield every lead in _serialize_lead shape, fetching `batch_size` rows
+        at a time through a server-side cursor. Owns its session because it
+        runs after the request's dependencies have been closed.
+        """
+        fields = list(LEAD_LIST_FIELDS)
+        db = session_factory()
+        try:
+            statement = (
+                LeadController._lead_columns_statement(fields)
+                .order_by(Lead.id)
+                .execution_options(yield_per=batch_size)
+            )
+            for row in db.execute(statement):
+                yield LeadController._project_lead_row(row, fields)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _lead_columns_statement(fields: list):
+        columns = {"id": Lead.id}
+        joins = set()
+        for field in fields:
+            field_columns, field_joins = LEAD_LIST_FIELDS[field]
+            for column in field_columns:
+                columns.setdefault(column.key, column)
+            joins.update(field_joins)
+
+        statement = select(*columns.values()).select_from(Lead)
+        for name, (target, onclause) in _LEAD_LIST_JOINS.items():
+            if name in joins:
+                statement = statement.outerjoin(target, onclause)
+        return statement
+
+    @staticmethod
+    def _leads_page_statement(fields: list, cursor: Optional[str], limit: int, **filters):
+        """
+        Keyset page query shared by the sync and async controllers. `filters`
+        are the optional get_leads_page filters; None values are ignored.
+        """
+        statement = LeadController._lead_columns_statement(fields)
+
+        after_id = decode_cursor(cursor).get("id")
+        if after_id is not None and not isinstance(after_id, int):
+            raise ValueError("Invalid cursor")
+        if after_id is not None:
+            statement = statement.where(Lead.id > after_id)
+
+        conditions = {
+            "company_id": lambda v: Lead.company_id == v,
+            "user_id": lambda v: Lead.user_id == v,
+            "contact_type_id": lambda v: Lead.contact_type_id == v,
+            "lead_type_id": lambda v: Lead.lead_type_id == v,
+            "not_work_anymore": lambda v: Lead.not_work_anymore == v,
+            "follow_up_from": lambda v: Lead.follow_up_date >= v,
+            "follow_up_to": lambda v: Lead.follow_up_date <= v,
+        }
+        for name, value in filters.items():
+            if value is not None:
+                statement = statement.where(conditions[name](value))
+
+        # Fetch one extra row to know whether another page exists
+        return statement.order_by(Lead.id).limit(limit + 1)
+
+    @staticmethod
+    def _leads_page_result(rows: list, fields: list, limit: int):
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        items = [LeadController._project_lead_row(row, fields) for row in rows]
+        next_cursor = encode_cursor({"id": rows[-1].id}) if has_more else None
+        return items, next_cursor
+
+    @staticmethod
+    def _project_lead_row(row, fields: list):
+        """
+        Build the _serialize_lead shape (restricted to `fields`) from a
+        column row produced by get_leads_page.
+        """
+        item = {}
+        for field in fields:
+            if field == "lead_id":
+                company_name_safe = row.company_symbol if row.company_pk is not None else ""
+                item["lead_id"] = f"{company_name_safe}-{row.full_name}"
+            elif field == "agent":
+                item["agent"] = row.agent_username
+            elif field == "lead_type":
+                item["lead_type"] = reference_cache.label("lead_types", row.lead_type_id)
+            elif field == "contact_type":
+                item["contact_type"] = reference_cache.label("contact_types", row.contact_type_id)
+            elif field == "company":
+                item["company"] = {
+                    "id": row.company_pk,
+                    "name": row.company_name,
+                    "symbol": row.company_symbol,
+                    "timezone": reference_cache.label("timezones", row.company_timezone_id),
+                } if row.company_pk is not None else None
+            else:
+                item[field] = getattr(row, field)
+        return item
+
     @staticmethod
     def _serialize_lead(lead: Lead):
         """
@@ -84,7 +265,7 @@ class LeadController:
                 "id": lead.company.id,
                 "name": lead.company.name,
                 "symbol": lead.company.symbol,
-                "timezone": lead.company.timezone.label if lead.company.timezone else None,
+                "timezone": reference_cache.label("timezones", lead.company.timezone_id),
             }
             company_name_safe = lead.company.symbol
 
@@ -100,8 +281,8 @@ class LeadController:
             "assigned_to": getattr(lead, "assigned_to", None),
             "agent": lead.agent.username if getattr(lead, "agent", None) else None,
             "follow_up_date": getattr(lead, "follow_up_date", None),
-            "lead_type": lead.lead_type.label if getattr(lead, "lead_type", None) else None,
-            "contact_type": lead.contact_type.label if getattr(lead, "contact_type", None) else None,
+            "lead_type": reference_cache.label("lead_types", lead.lead_type_id),
+            "contact_type": reference_cache.label("contact_types", lead.contact_type_id),
             "date_become_hot": getattr(lead, "date_become_hot", None),
             "others_contacts": getattr(lead, "others_contacts", None),
             "company": company_data
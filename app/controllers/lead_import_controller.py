@@ -0,0 +1,223 @@
+import csv
+import io
+import json
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.company import Company
+from app.models.contact_type_option import ContactTypeOption
+from app.models.lead import Lead
+from app.models.lead_type_option import LeadTypeOption
+from app.schemas.lead_schema import LeadCreateRequest
+
+IMPORT_FORMATS = ("csv", "ndjson")
+IMPORT_BATCH_SIZE = 1000
+
+# Lead columns written by an import, in COPY order
+_IMPORT_COLUMNS = [
+    "full_name", "company_id", "role", "phone", "email",
+    "others_contacts", "contact_type_id", "lead_type_id",
+]
+
+
+class LeadImportController:
+
+    # =====================================
+    # PARSE UPLOAD
+    # =====================================
+    @staticmethod
+    def parse_rows(text: str, import_format: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+        """
+        Yield (row number, raw row, parse error) for a CSV or NDJSON upload.
+        Row numbers are 1-based and count data rows only.
+        """
+        if import_format == "csv":
+            for number, row in enumerate(csv.DictReader(io.StringIO(text)), start=1):
+                yield number, row, None
+            return
+
+        number = 0
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield number, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(row, dict):
+                yield number, None, "Each line must be a JSON object"
+                continue
+            yield number, row, None
+
+    # =====================================
+    # IMPORT
+    # =====================================
+    @staticmethod
+    def import_leads(
+        db: Session,
+        rows: Iterable[Tuple[int, Optional[dict], Optional[str]]],
+        batch_size: int = IMPORT_BATCH_SIZE,
+    ):
+        """
+        Validate rows with LeadCreateRequest and insert the valid ones in
+        batched transactions. Returns counts, timing and a per-row error list.
+        """
+        started = time.perf_counter()
+        lookups = LeadImportController._load_lookups(db)
+
+        inserted = 0
+        errors = []
+        batch: List[Tuple[int, dict]] = []
+
+        def flush():
+            nonlocal inserted
+            if not batch:
+                return
+            try:
+                LeadImportController._insert_batch(db, [values for _, values in batch])
+                db.commit()
+                inserted += len(batch)
+            except Exception as e:
+                db.rollback()
+                errors.extend({"row": number, "errors": [f"Batch insert failed: {e}"]} for number, _ in batch)
+            batch.clear()
+
+        for number, raw, parse_error in rows:
+            if parse_error:
+                errors.append({"row": number, "errors": [parse_error]})
+                continue
+
+            values, row_errors = LeadImportController._validate_row(raw, lookups)
+            if row_errors:
+                errors.append({"row": number, "errors": row_errors})
+                continue
+
+            batch.append((number, values))
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+
+        elapsed = time.perf_counter() - started
+        return {
+            "inserted": inserted,
+            "failed": len(errors),
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(inserted / elapsed, 1) if elapsed else None,
+            "errors": sorted(errors, key=lambda e: e["row"]),
+        }
+
+    # =====================================
+    # PRIVATE HELPERS
+    # =====================================
+    @staticmethod
+    def _load_lookups(db: Session) -> dict:
+        """
+        In-memory maps used to resolve and check foreign keys without a query
+        per row. Names, symbols and labels are matched case-insensitively.
+        """
+        companies = {}
+        company_ids = set()
+        for company_id, name, symbol in db.query(Company.id, Company.name, Company.symbol):
+            company_ids.add(company_id)
+            companies[name.lower()] = company_id
+            if symbol:
+                companies.setdefault(symbol.lower(), company_id)
+
+        contact_types = {label.lower(): id for id, label in db.query(ContactTypeOption.id, ContactTypeOption.label)}
+        lead_types = {label.lower(): id for id, label in db.query(LeadTypeOption.id, LeadTypeOption.label)}
+
+        return {
+            "company": (companies, company_ids),
+            "contact_type": (contact_types, set(contact_types.values())),
+            "lead_type": (lead_types, set(lead_types.values())),
+        }
+
+    @staticmethod
+    def _validate_row(raw: dict, lookups: dict) -> Tuple[Optional[dict], List[str]]:
+        row = {
+            key.strip(): value.strip() if isinstance(value, str) else value
+            for key, value in raw.items()
+            if key is not None and value not in ("", None)
+        }
+
+        errors = []
+        # Accept a name/label column in place of each *_id column
+        for name, (by_label, known_ids) in lookups.items():
+            id_key = f"{name}_id"
+            if id_key not in row and name in row:
+                resolved = by_label.get(str(row.pop(name)).lower())
+                if resolved is None:
+                    errors.append(f"Unknown {name}")
+                    continue
+                row[id_key] = resolved
+            row.pop(name, None)
+
+        if errors:
+            return None, errors
+
+        try:
+            request = LeadCreateRequest.model_validate(row)
+        except ValidationError as e:
+            return None, [f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()]
+
+        for name, (_, known_ids) in lookups.items():
+            value = getattr(request, f"{name}_id")
+            if value is not None and value not in known_ids:
+                errors.append(f"{name}_id {value} does not exist")
+        if errors:
+            return None, errors
+
+        return {
+            "full_name": request.full_name,
+            "company_id": request.company_id,
+            "role": request.role,
+            "phone": request.phone,
+            "email": request.email if request.email else None,
+            "others_contacts": request.others_contacts if request.others_contacts else None,
+            "contact_type_id": request.contact_type_id,
+            "lead_type_id": request.lead_type_id,
+        }, []
+
+    @staticmethod
+    def _insert_batch(db: Session, rows: List[dict]):
+        connection = db.connection()
+        if connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2":
+            LeadImportController._copy_batch(connection, rows)
+        else:
+            db.execute(insert(Lead), rows)
+
+    @staticmethod
+    def _copy_batch(connection, rows: List[dict]):
+        """
+        PostgreSQL COPY inside the session's transaction. COPY skips
+        client-side column defaults, so those are written explicitly.
+        """
+        defaults = {
+            column.name: column.default.arg
+            for column in Lead.__table__.columns
+            if column.default is not None and column.default.is_scalar and column.name not in _IMPORT_COLUMNS
+        }
+        columns = _IMPORT_COLUMNS + list(defaults)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(
+                [r"\N" if row[c] is None else row[c] for c in _IMPORT_COLUMNS] + list(defaults.values())
+            )
+        buffer.seek(0)
+
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY leads ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buffer,
+            )
+        finally:
+            cursor.close()
@@ -0,0 +1,77 @@
+from datetime import datetime, time
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+
+from database.partitioning import in_range
+from app.models.crm import CallLog, EmailLog, SmsLog
+from app.schemas.touch_event_schema import TouchEventBatch
+from jobs.touch_rollups import queue_rollups, touch_rollups
+
+
+class TouchEventController:
+
+    # =====================================
+    # INGEST
+    # =====================================
+    @staticmethod
+    def ingest(db: Session, batch: TouchEventBatch) -> dict:
+        """
+        Append a batch of call / email / SMS events to their log tables in
+        one transaction, one multi-row INSERT per table, and queue their
+        rollups in that same transaction. The batch is all or nothing: an
+        unknown lead, team, caller or sender, or a value the columns cannot
+        hold, rejects it with ValueError.
+        """
+        tables = (
+            ("call", CallLog, CallLog.call_log_id, [event.model_dump() for event in batch.calls]),
+            ("email", EmailLog, EmailLog.email_log_id, [event.model_dump() for event in batch.emails]),
+            ("sms", SmsLog, SmsLog.sms_log_id, [event.model_dump() for event in batch.sms]),
+        )
+        try:
+            for kind, model, id_column, rows in tables:
+                if rows:
+                    log_ids = db.scalars(insert(model).returning(id_column), rows).all()
+                    queue_rollups(db, kind, log_ids)
+            db.commit()
+        except (IntegrityError, DataError) as e:
+            db.rollback()
+            raise ValueError(f"Batch rejected: {e.orig}")
+
+        touch_rollups.notify(batch.size())
+        return {"calls": len(batch.calls), "emails": len(batch.emails), "sms": len(batch.sms)}
+
+    # =====================================
+    # LEAD HISTORY
+    # =====================================
+    @staticmethod
+    def get_lead_history(db: Session, lead_id: int, since, until, limit: int) -> dict:
+        """
+        Newest `limit` calls, emails and SMS of a lead sent in [since, until).
+        The date bounds go straight onto the partition keys, so only the
+        months in range are read.
+        """
+        start, end = datetime.combine(since, time.min), datetime.combine(until, time.min)
+
+        def recent(model, key, columns):
+            rows = db.execute(
+                select(*columns)
+                .where(model.lead_id == lead_id, in_range(key, start, end))
+                .order_by(key.desc())
+                .limit(limit)
+            ).mappings()
+            return [dict(row) for row in rows]
+
+        return {
+            "calls": recent(CallLog, CallLog.call_date, (
+                CallLog.call_log_id, CallLog.team_id, CallLog.caller_id, CallLog.call_date,
+                CallLog.result_id, CallLog.result_code, CallLog.notes,
+            )),
+            "emails": recent(EmailLog, EmailLog.sent_at, (
+                EmailLog.email_log_id, EmailLog.sender_id, EmailLog.sent_at, EmailLog.status, EmailLog.notes,
+            )),
+            "sms": recent(SmsLog, SmsLog.sent_at, (
+                SmsLog.sms_log_id, SmsLog.team_id, SmsLog.sent_at, SmsLog.status, SmsLog.message,
+            )),
+        }
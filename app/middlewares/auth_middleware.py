@@ -1,15 +1,22 @@
+import uuid
 from datetime import datetime, timedelta
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from database.db import SessionLocal
-from app.models.user import User
+from database.db import AsyncSessionLocal, RoutingSessionLocal
+from database.query_stats import set_user_id
+from database.replicas import use_primary
+from app.models.user import User, slim_user_options
 from app.models.token import UserToken
 from config.settings import settings
+from utils.jwt_helper import hash_token
+from utils.principal_cache import Principal, principal_cache
 
 
 # ============================================================
@@ -17,13 +24,20 @@ from config.settings import settings
 # ============================================================
 
 def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
+    # Reads may go to a replica, see database.replicas
+    db = RoutingSessionLocal()
     try:
         yield db
     finally:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    # Only available when settings.DB_ASYNC is on
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 # ============================================================
 # JWT Token creator
 # ============================================================
@@ -31,6 +45,7 @@ def get_db() -> Generator[Session, None, None]:
 def create_token(data: dict, expires_delta: timedelta) -> str:
     payload = data.copy()
     payload["exp"] = datetime.utcnow() + expires_delta
+    payload["jti"] = uuid.uuid4().hex
     return jwt.encode(
         payload,
         settings.SECRET_KEY,
@@ -48,60 +63,126 @@ security = HTTPBearer()
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
-) -> User:
+) -> Principal:
 
     token = credentials.credentials
 
+    # 0️⃣ Serve recently verified tokens from memory (no DB round trip)
+    principal = principal_cache.get(token)
+    if principal:
+        db.info["user_id"] = principal.id  # read-your-writes routing
+        set_user_id(principal.id)
+        return principal
+
     # 1️⃣ Decode JWT
-    try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM],
-        )
-        email = payload.get("sub")
-        if not email:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token payload",
-            )
-    except JWTError:
+    payload = _decode_access_token(token)
+    email = payload["sub"]
+
+    # 2️⃣ Check token exists in DB (logout / rotation protection)
+    token_query = db.query(UserToken.id).filter(UserToken.access_token_hash == hash_token(token))
+    token_row = token_query.first()
+    if not token_row and use_primary(db):
+        # A replica may not have the token yet right after login / refresh
+        token_row = token_query.first()
+
+    if not token_row:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
+            detail="Token revoked or not found",
         )
 
-    # 2️⃣ Check token exists in DB (logout / rotation protection)
-    token_row = (
-        db.query(UserToken)
-        .filter(UserToken.access_token == token)
+    # 3️⃣ Load user
+    user = (
+        db.query(User)
+        .options(*slim_user_options())
+        .filter(User.email == email)
         .first()
     )
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
 
+    principal = Principal.from_user(user)
+    principal_cache.set(token, principal, token_exp=payload.get("exp"))
+    db.info["user_id"] = principal.id
+    set_user_id(principal.id)
+    return principal
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    """
+    get_current_user for the async routes: same checks, same cache.
+    """
+    token = credentials.credentials
+
+    principal = principal_cache.get(token)
+    if principal:
+        set_user_id(principal.id)
+        return principal
+
+    payload = _decode_access_token(token)
+
+    token_row = await db.scalar(
+        select(UserToken.id).where(UserToken.access_token_hash == hash_token(token)).limit(1)
+    )
     if not token_row:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token revoked or not found",
         )
 
-    # 3️⃣ Load user
-    user = db.query(User).filter(User.email == email).first()
+    user = (
+        await db.scalars(
+            select(User).options(*slim_user_options()).where(User.email == payload["sub"]).limit(1)
+        )
+    ).unique().first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
 
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.set(token, principal, token_exp=payload.get("exp"))
+    set_user_id(principal.id)
+    return principal
+
+
+def _decode_access_token(token: str) -> dict:
+    try:
+        payload = jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
+        )
+        email = payload.get("sub")
+        if not email:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token payload",
+            )
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+        )
+
+    return payload
 
 
 # ============================================================
 # Optional: Role-based authorization helper
 # ============================================================
 
-def require_role(role: str):
-    def role_checker(user: User = Depends(get_current_user)) -> User:
-        if role not in [r.name for r in user.roles]:
+def require_role(role: str, current_user=get_current_user):
+    # async so the check itself never takes a threadpool slot
+    async def role_checker(user: Principal = Depends(current_user)) -> Principal:
+        if role not in user.roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions",
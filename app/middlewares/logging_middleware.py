@@ -1,10 +1,69 @@
+import json
+import random
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
 from fastapi import Request
-from config.logger import logger
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+from config.logger import access_logger, logger
+from config.settings import settings
+from database.query_stats import RequestStats, start_request
+from database.sql_profiler import PROFILE_HEADER, log_profile, profile_report, profiling_requested, summary_header
+from utils.metrics import metrics, record_request
+
+
+def route_template(request: Request) -> Optional[str]:
+    # Set by the router once a route matched, e.g. "/api/lead/{lead_id}"
+    route = request.scope.get("route")
+    return getattr(route, "path", None)
+
+
+def should_log(route: Optional[str], status: int, duration_ms: float) -> bool:
+    if status >= 500 or duration_ms >= settings.ACCESS_LOG_SLOW_MS:
+        return True
+
+    rate = settings.ACCESS_LOG_ROUTE_SAMPLE_RATES.get(route, settings.ACCESS_LOG_SAMPLE_RATE)
+    return rate >= 1 or random.random() < rate
+
+
+def log_access(request: Request, route: Optional[str], status: int, duration_ms: float, stats: RequestStats):
+    if not settings.ACCESS_LOG_ENABLED or not should_log(route, status, duration_ms):
+        return
+
+    access_logger.info(json.dumps({
+        "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "method": request.method,
+        "route": route or request.url.path,
+        "status": status,
+        "duration_ms": round(duration_ms, 2),
+        "db_queries": stats.query_count,
+        "db_ms": round(stats.query_seconds * 1000, 2),
+        "user_id": stats.user_id,
+    }))
+
 
 async def logging_middleware(request: Request, call_next):
+    stats = start_request(profile=profiling_requested(request))
+    metrics.add_gauge("http_requests_in_flight", 1)
+    start = time.perf_counter()
     try:
         response = await call_next(request)
-        return response
-    except Exception as e:
-        logger.error(str(e))
-        return {"error": "Internal Server Error"}
+    except Exception:
+        logger.exception("Unhandled error on %s %s", request.method, request.url.path)
+        response = JSONResponse(status_code=500, content={"detail": "Internal Server Error"})
+    finally:
+        metrics.add_gauge("http_requests_in_flight", -1)
+
+    seconds = time.perf_counter() - start
+    route = route_template(request)
+    record_request(request.method, route, response.status_code, seconds, stats.query_count, stats.query_seconds)
+    log_access(request, route, response.status_code, seconds * 1000, stats)
+
+    if stats.statements is not None:
+        report = profile_report(stats)
+        response.headers[PROFILE_HEADER] = summary_header(report)
+        await run_in_threadpool(log_profile, request.method, route or request.url.path, report, stats)
+    return response
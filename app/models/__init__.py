@@ -1,3 +1,33 @@
 from app.models.user import User
 from app.models.role import Role
 from app.models.token import UserToken
+from app.models.lead_type_option import LeadTypeOption
+from app.models.contact_type_option import ContactTypeOption
+from app.models.timezone import Timezone
+from app.models.company import Company
+from app.models.company_history import CompanyHistory
+from app.models.company_comment import CompanyComment
+from app.models.lead import Lead
+from app.models.crm import (
+    Team,
+    Caller,
+    EmailSender,
+    CallResultOption,
+    LeadTeamTracking,
+    LeadEmailTracking,
+    CallLog,
+    EmailLog,
+    SmsLog,
+    TouchRollupQueue,
+    CompanyAdditionalContact,
+    CompanyChangeHistory,
+    AutomationLog,
+)
+from app.models.analytics import (
+    DailyCallStats,
+    DailyCallerStats,
+    DailyEmailStats,
+    DailyHotConversions,
+    DailyResultCodeStats,
+    RollupWatermark,
+)
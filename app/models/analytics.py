@@ -0,0 +1,96 @@
+from sqlalchemy import BigInteger, Column, Date, DateTime, Index, Integer, String
+from database.db import Base
+
+# Daily aggregates behind the /analytics routes, maintained incrementally by
+# jobs/analytics_rollups.py. No foreign keys: rows outlive the log rows they
+# were computed from. caller_id 0 and an empty result_code / status stand for
+# "none", so they can be part of the primary key.
+
+
+# ============================================================
+# CALLS PER DAY, TEAM, CALLER AND RESULT CODE
+# ============================================================
+
+class DailyCallStats(Base):
+    __tablename__ = "daily_call_stats"
+    __table_args__ = (
+        Index("ix_daily_call_stats_team_id_day", "team_id", "day"),
+    )
+
+    day = Column(Date, primary_key=True)
+    team_id = Column(Integer, primary_key=True)
+    caller_id = Column(Integer, primary_key=True)
+    result_code = Column(String(20), primary_key=True)
+    calls = Column(Integer, nullable=False, default=0)
+
+
+# Coarser cuts of daily_call_stats, filled from the same log rows, so that the
+# per-caller and per-result-code views read a few rows per team and day
+
+class DailyCallerStats(Base):
+    __tablename__ = "daily_caller_stats"
+    __table_args__ = (
+        Index("ix_daily_caller_stats_team_id_day", "team_id", "day"),
+    )
+
+    day = Column(Date, primary_key=True)
+    team_id = Column(Integer, primary_key=True)
+    caller_id = Column(Integer, primary_key=True)
+    calls = Column(Integer, nullable=False, default=0)
+
+
+class DailyResultCodeStats(Base):
+    __tablename__ = "daily_result_code_stats"
+    __table_args__ = (
+        Index("ix_daily_result_code_stats_team_id_day", "team_id", "day"),
+    )
+
+    day = Column(Date, primary_key=True)
+    team_id = Column(Integer, primary_key=True)
+    result_code = Column(String(20), primary_key=True)
+    calls = Column(Integer, nullable=False, default=0)
+
+
+# ============================================================
+# EMAILS PER DAY, TEAM, SENDER AND STATUS
+# ============================================================
+
+class DailyEmailStats(Base):
+    __tablename__ = "daily_email_stats"
+    __table_args__ = (
+        Index("ix_daily_email_stats_team_id_day", "team_id", "day"),
+    )
+
+    day = Column(Date, primary_key=True)
+    team_id = Column(Integer, primary_key=True)
+    sender_id = Column(Integer, primary_key=True)
+    status = Column(String(50), primary_key=True)
+    emails = Column(Integer, nullable=False, default=0)
+
+
+# ============================================================
+# LEADS BECOMING HOT PER DAY AND TEAM
+# ============================================================
+
+class DailyHotConversions(Base):
+    __tablename__ = "daily_hot_conversions"
+
+    day = Column(Date, primary_key=True)
+    team_id = Column(Integer, primary_key=True)
+    conversions = Column(Integer, nullable=False, default=0)
+
+
+# ============================================================
+# REFRESH WATERMARKS
+# ============================================================
+
+class RollupWatermark(Base):
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String(50), primary_key=True)
+    # Highest log id seen by the last refresh and the one before it (log
+    # rollups), or last day recomputed (hot conversions)
+    last_id = Column(BigInteger, nullable=False, default=0)
+    previous_id = Column(BigInteger, nullable=False, default=0)
+    last_day = Column(Date)
+    refreshed_at = Column(DateTime)
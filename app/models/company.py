@@ -52,7 +52,7 @@ class Company(Base):
     last_modified_by_name = Column(String(150))
 
     # Relationships
-    timezone = relationship("Timezone", lazy="joined")
+    timezone = relationship("Timezone")  # label via utils.reference_cache
     leads = relationship("Lead", back_populates="company", cascade="all, delete-orphan")
     histories = relationship(
         "CompanyHistory",
@@ -7,7 +7,6 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
-    Numeric,
     UniqueConstraint,
     Index,
     Table,
@@ -16,6 +15,10 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database.db import Base
 
+# Team-level CRM tables. Leads, companies, lead types and contact types are
+# the models in app/models/lead.py, company.py, lead_type_option.py and
+# contact_type_option.py; the tables here reference them by primary key.
+
 
 # ============================================================
 # REFERENCE TABLES
@@ -57,13 +60,6 @@ class EmailSender(Base):
     team = relationship("Team", back_populates="email_senders")
 
 
-class LeadTypeOption(Base):
-    __tablename__ = "lead_type_options"
-
-    lead_type_id = Column(Integer, primary_key=True, index=True)
-    label = Column(String(50), unique=True, nullable=False)
-
-
 class CallResultOption(Base):
     __tablename__ = "call_result_options"
 
@@ -72,183 +68,6 @@ class CallResultOption(Base):
     description = Column(String(255))
 
 
-class ContactTypeOption(Base):
-    __tablename__ = "contact_type_options"
-
-    contact_type_id = Column(Integer, primary_key=True, index=True)
-    label = Column(String(50), unique=True, nullable=False)
-
-
-# ============================================================
-# COMPANIES
-# ============================================================
-
-class Company(Base):
-    __tablename__ = "companies"
-
-    company_id = Column(Integer, primary_key=True, index=True)
-    record_id = Column(String(50), unique=True)
-
-    company_symbol = Column(String(20), index=True)
-    company_name = Column(String(255), index=True)
-
-    timezone = Column(String(50))
-    country = Column(String(100))
-    cusip = Column(String(20))
-    cik = Column(String(20))
-    primary_venue = Column(String(100))
-    city = Column(String(100))
-    state = Column(String(50))
-    zip = Column(String(20))
-    website = Column(String(500))
-    twitter = Column(String(255))
-    description = Column(Text)
-    estimated_marketcap = Column(Numeric(18, 2))
-    is_otc = Column(Boolean, default=False, index=True)
-
-    # symbol/name change tracking
-    previous_company_symbol = Column(String(20))
-    backup_company_symbol = Column(String(20))
-    last_modified_time_symbol = Column(DateTime(timezone=True))
-    last_modified_by_symbol = Column(String(150))
-
-    previous_company_name = Column(String(255))
-    backup_company_name = Column(String(255))
-    last_modified_time_name = Column(DateTime(timezone=True))
-    last_modified_by_name = Column(String(150))
-
-    # metadata
-    manual_sort = Column(Integer)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    created_by = Column(String(150))
-    history_logs = Column(Text)
-    five_char_company = Column(String(5))
-    only_company_lead = Column(Text)
-
-    # relationships
-    leads = relationship("Lead", back_populates="company", cascade="all, delete-orphan")
-    additional_contacts = relationship(
-        "CompanyAdditionalContact",
-        back_populates="company",
-        cascade="all, delete-orphan",
-    )
-    change_history = relationship(
-        "CompanyChangeHistory",
-        back_populates="company",
-        cascade="all, delete-orphan",
-    )
-
-
-# ============================================================
-# LEADS
-# ============================================================
-
-class Lead(Base):
-    __tablename__ = "leads"
-
-    lead_id = Column(Integer, primary_key=True, index=True)
-    record_id = Column(String(50), unique=True)
-
-    company_id = Column(Integer, ForeignKey("companies.company_id", ondelete="CASCADE"), index=True)
-    company_symbol = Column(String(20), index=True)
-
-    # identity
-    full_name = Column(String(255), index=True)
-    role = Column(String(255))
-    email = Column(String(255), index=True)
-    phone = Column(String(50))
-    phone_extension = Column(String(20))
-    tool_free_phone = Column(String(50))
-    timezone = Column(String(50))
-
-    # classification
-    contact_type_id = Column(Integer, ForeignKey("contact_type_options.contact_type_id"))
-    contact_type_modify_by = Column(String(150))
-    not_work_anymore = Column(Boolean, default=False, index=True)
-    not_work_modify_by = Column(String(150))
-    blocked_email = Column(Boolean, default=False)
-    missing_dead_email = Column(Boolean, default=False)
-
-    # fix tracking
-    old_phones = Column(Text)
-    fix_button = Column(String(50))
-    fix_button_status = Column(String(50))
-    last_fixed_date = Column(Date)
-    set_fix_date = Column(Date)
-
-    # connected contacts
-    connected_contacts = Column(Text)
-    connected_contacts_names = Column(Text)
-    other_contacts = Column(Text)
-    has_other_contacts = Column(Boolean, default=False)
-    additional_contacts = Column(Text)
-    additional_contact_emails = Column(Text)
-
-    # counters
-    counter_b = Column(Integer, default=0)
-    counter_f = Column(Integer, default=0)
-    counter_fixes = Column(Integer, default=0)
-
-    # skip tracking
-    lead_skip_by = Column(String(150))
-    lead_skip_notes = Column(Text)
-
-    # filters & formulas
-    lead_id_end_with = Column(String(10))
-    timezone_priority = Column(Integer)
-    contacts_filter_formula = Column(Text)
-    contacts_filter = Column(Text)
-    exclude_canada_filter = Column(Boolean, default=False)
-    formula_other_contact = Column(Text)
-    filter_value = Column(Text)
-
-    # metadata
-    manual_sort = Column(Integer)
-    manual_update = Column(Text)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    created_by = Column(String(150))
-    last_modified = Column(DateTime(timezone=True))
-    all_leads = Column(Text)
-    old_db_calls_code = Column(String(50))
-    phone_call = Column(Text)
-    test_field = Column(Text)
-
-    # company called today
-    company_called_today = Column(Boolean, default=False)
-    last_modified_company_called = Column(DateTime(timezone=True))
-    last_modified_time_called_today = Column(DateTime(timezone=True))
-
-    # relationships
-    company = relationship("Company", back_populates="leads")
-    contact_type = relationship("ContactTypeOption")
-
-    team_tracking = relationship(
-        "LeadTeamTracking",
-        back_populates="lead",
-        cascade="all, delete-orphan",
-    )
-    email_tracking = relationship(
-        "LeadEmailTracking",
-        back_populates="lead",
-        cascade="all, delete-orphan",
-    )
-    call_logs = relationship(
-        "CallLog",
-        back_populates="lead",
-        cascade="all, delete-orphan",
-    )
-    email_logs = relationship(
-        "EmailLog",
-        back_populates="lead",
-        cascade="all, delete-orphan",
-    )
-    sms_logs = relationship(
-        "SmsLog",
-        back_populates="lead",
-        cascade="all, delete-orphan",
-    )
-
-
 # ============================================================
 # LEAD TEAM TRACKING
 # ============================================================
@@ -262,15 +81,17 @@ class LeadTeamTracking(Base):
         Index("ix_lead_team_tracking_lead_type_id", "lead_type_id"),
         Index("ix_lead_team_tracking_follow_up_date", "follow_up_date"),
         Index("ix_lead_team_tracking_date_became_hot", "date_became_hot"),
+        Index("ix_lead_team_tracking_date_became_ignore", "date_became_ignore"),
+        Index("ix_lead_team_tracking_leased_by", "leased_by"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
-    lead_id = Column(Integer, ForeignKey("leads.lead_id", ondelete="CASCADE"), nullable=False)
+    lead_id = Column(Integer, ForeignKey("leads.id", ondelete="CASCADE"), nullable=False)
     team_id = Column(Integer, ForeignKey("teams.team_id", ondelete="CASCADE"), nullable=False)
 
     # lead classification per team
-    lead_type_id = Column(Integer, ForeignKey("lead_type_options.lead_type_id"))
-    previous_lead_type_id = Column(Integer, ForeignKey("lead_type_options.lead_type_id"))
+    lead_type_id = Column(Integer, ForeignKey("lead_type_options.id"))
+    previous_lead_type_id = Column(Integer, ForeignKey("lead_type_options.id"))
     last_modified_time_type = Column(DateTime(timezone=True))
     last_modified_by_type = Column(String(150))
 
@@ -278,6 +99,10 @@ class LeadTeamTracking(Base):
     to_be_called_by = Column(Integer, ForeignKey("callers.caller_id"))
     last_updated_called_by = Column(DateTime(timezone=True))
 
+    # call queue lease (utils.call_queue): held by a caller until it expires or is released
+    leased_by = Column(Integer, ForeignKey("callers.caller_id"))
+    lease_expires_at = Column(DateTime(timezone=True))
+
     # call tracking
     call_result_id = Column(Integer, ForeignKey("call_result_options.result_id"))
     call_result_code = Column(String(20))
@@ -317,7 +142,7 @@ class LeadTeamTracking(Base):
     last_action_date = Column(Date)
 
     # relationships
-    lead = relationship("Lead", back_populates="team_tracking")
+    lead = relationship("Lead")
     team = relationship("Team")
     lead_type = relationship("LeadTypeOption", foreign_keys=[lead_type_id])
     previous_lead_type = relationship("LeadTypeOption", foreign_keys=[previous_lead_type_id])
@@ -336,13 +161,13 @@ class LeadEmailTracking(Base):
     )
 
     id = Column(Integer, primary_key=True, index=True)
-    lead_id = Column(Integer, ForeignKey("leads.lead_id", ondelete="CASCADE"), nullable=False)
+    lead_id = Column(Integer, ForeignKey("leads.id", ondelete="CASCADE"), nullable=False)
     sender_id = Column(Integer, ForeignKey("email_senders.sender_id", ondelete="CASCADE"), nullable=False)
 
     email_status = Column(String(50))
     history_email = Column(Text)
 
-    lead = relationship("Lead", back_populates="email_tracking")
+    lead = relationship("Lead")
     sender = relationship("EmailSender")
 
 
@@ -353,8 +178,8 @@ class LeadEmailTracking(Base):
 company_leads = Table(
     "company_leads",
     Base.metadata,
-    Column("company_id", Integer, ForeignKey("companies.company_id", ondelete="CASCADE"), primary_key=True),
-    Column("lead_id", Integer, ForeignKey("leads.lead_id", ondelete="CASCADE"), primary_key=True),
+    Column("company_id", Integer, ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True),
+    Column("lead_id", Integer, ForeignKey("leads.id", ondelete="CASCADE"), primary_key=True),
     Column("is_primary", Boolean, default=False),
 )
 
@@ -365,9 +190,14 @@ company_leads = Table(
 
 class CallLog(Base):
     __tablename__ = "call_logs"
+    __table_args__ = (
+        # Per-lead history by date; on PostgreSQL the table is partitioned
+        # by month on call_date (migrations/partition_touch_logs.py)
+        Index("ix_call_logs_lead_id_call_date", "lead_id", "call_date"),
+    )
 
     call_log_id = Column(Integer, primary_key=True, index=True)
-    lead_id = Column(Integer, ForeignKey("leads.lead_id", ondelete="CASCADE"), nullable=False, index=True)
+    lead_id = Column(Integer, ForeignKey("leads.id", ondelete="CASCADE"), nullable=False, index=True)
     team_id = Column(Integer, ForeignKey("teams.team_id", ondelete="CASCADE"), nullable=False, index=True)
     caller_id = Column(Integer, ForeignKey("callers.caller_id"))
     call_date = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -376,7 +206,7 @@ class CallLog(Base):
     notes = Column(Text)
     logged = Column(Boolean, default=False)
 
-    lead = relationship("Lead", back_populates="call_logs")
+    lead = relationship("Lead")
     team = relationship("Team")
     caller = relationship("Caller")
     call_result = relationship("CallResultOption")
@@ -388,15 +218,18 @@ class CallLog(Base):
 
 class EmailLog(Base):
     __tablename__ = "email_logs"
+    __table_args__ = (
+        Index("ix_email_logs_lead_id_sent_at", "lead_id", "sent_at"),
+    )
 
     email_log_id = Column(Integer, primary_key=True, index=True)
-    lead_id = Column(Integer, ForeignKey("leads.lead_id", ondelete="CASCADE"), nullable=False, index=True)
+    lead_id = Column(Integer, ForeignKey("leads.id", ondelete="CASCADE"), nullable=False, index=True)
     sender_id = Column(Integer, ForeignKey("email_senders.sender_id", ondelete="CASCADE"), nullable=False, index=True)
     sent_at = Column(DateTime(timezone=True), nullable=False)
     status = Column(String(50))
     notes = Column(Text)
 
-    lead = relationship("Lead", back_populates="email_logs")
+    lead = relationship("Lead")
     sender = relationship("EmailSender")
 
 
@@ -406,18 +239,46 @@ class EmailLog(Base):
 
 class SmsLog(Base):
     __tablename__ = "sms_logs"
+    __table_args__ = (
+        Index("ix_sms_logs_lead_id_sent_at", "lead_id", "sent_at"),
+    )
 
     sms_log_id = Column(Integer, primary_key=True, index=True)
-    lead_id = Column(Integer, ForeignKey("leads.lead_id", ondelete="CASCADE"), nullable=False, index=True)
+    lead_id = Column(Integer, ForeignKey("leads.id", ondelete="CASCADE"), nullable=False, index=True)
     team_id = Column(Integer, ForeignKey("teams.team_id", ondelete="CASCADE"), nullable=False)
     sent_at = Column(DateTime(timezone=True), nullable=False)
     status = Column(String(50))
     message = Column(Text)
 
-    lead = relationship("Lead", back_populates="sms_logs")
+    lead = relationship("Lead")
     team = relationship("Team")
 
 
+# ============================================================
+# PENDING TRACKING ROLLUPS
+# ============================================================
+
+# One row per call / email / SMS log row whose lead_team_tracking,
+# lead_email_tracking and leads updates are not applied yet. Written in the
+# same transaction as the log row, deleted in the one applying its rollup
+# (jobs/touch_rollups.py). No foreign key, so log partitions can still be
+# retired; a queued row whose log row is gone is just dropped.
+
+class TouchRollupQueue(Base):
+    __tablename__ = "touch_rollup_queue"
+    __table_args__ = (
+        Index("ix_touch_rollup_queue_dead_at_id", "dead_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(10), nullable=False)  # call | email | sms
+    log_id = Column(Integer, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+    # Set after EVENT_ROLLUP_MAX_ATTEMPTS failures; such rows are left for inspection
+    dead_at = Column(DateTime)
+
+
 # ============================================================
 # COMPANY ADDITIONAL CONTACTS
 # ============================================================
@@ -426,7 +287,7 @@ class CompanyAdditionalContact(Base):
     __tablename__ = "company_additional_contacts"
 
     id = Column(Integer, primary_key=True, index=True)
-    company_id = Column(Integer, ForeignKey("companies.company_id", ondelete="CASCADE"), index=True)
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), index=True)
 
     contact_name = Column(String(255))
     email = Column(String(255))
@@ -434,7 +295,7 @@ class CompanyAdditionalContact(Base):
     role = Column(String(255))
     notes = Column(Text)
 
-    company = relationship("Company", back_populates="additional_contacts")
+    company = relationship("Company")
 
 
 # ============================================================
@@ -445,14 +306,14 @@ class CompanyChangeHistory(Base):
     __tablename__ = "company_change_history"
 
     change_id = Column(Integer, primary_key=True, index=True)
-    company_id = Column(Integer, ForeignKey("companies.company_id", ondelete="CASCADE"), nullable=False, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False, index=True)
     field_changed = Column(String(50), nullable=False)
     old_value = Column(String(255))
     new_value = Column(String(255))
     changed_by = Column(String(150))
     changed_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    company = relationship("Company", back_populates="change_history")
+    company = relationship("Company")
 
 
 # ============================================================
@@ -463,7 +324,7 @@ class AutomationLog(Base):
     __tablename__ = "automation_logs"
 
     log_id = Column(Integer, primary_key=True, index=True)
-    lead_id = Column(Integer, ForeignKey("leads.lead_id"))
+    lead_id = Column(Integer, ForeignKey("leads.id"))
     automation_text = Column(Text)
     trigger_type = Column(String(100))
     triggered_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -44,6 +44,7 @@ class Lead(Base):
         Integer,
         ForeignKey("lead_type_options.id", ondelete="SET NULL"),
         nullable=True,
+        index=True,
     )
 
     # ======================
@@ -56,7 +57,7 @@ class Lead(Base):
     phone_extension = Column(String(20))
     tool_free_phone = Column(String(50))
     timezone = Column(String(50))
-    follow_up_date = Column(Date)
+    follow_up_date = Column(Date, index=True)
     assigned_to = Column(String(150))
     date_become_hot = Column(String(50))
     others_contacts = Column(Text)
@@ -137,6 +138,7 @@ class Lead(Base):
     # Relationships
     # ======================
     company = relationship("Company", lazy="joined")
-    contact_type = relationship("ContactTypeOption", lazy="joined")
-    lead_type = relationship("LeadTypeOption", lazy="joined")
+    # Labels are served from utils.reference_cache, no join needed
+    contact_type = relationship("ContactTypeOption")
+    lead_type = relationship("LeadTypeOption")
     agent = relationship("User", lazy="joined")
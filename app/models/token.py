@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database.db import Base
@@ -9,8 +9,13 @@ class UserToken(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
-    access_token = Column(String(1024), nullable=False, index=True)
-    refresh_token = Column(String(1024), nullable=False, unique=True)
+    # SHA-256 digests of the issued JWTs (see utils.jwt_helper.hash_token)
+    access_token_hash = Column(LargeBinary(32), nullable=False, index=True)
+    refresh_token_hash = Column(LargeBinary(32), nullable=False, unique=True, index=True)
+
+    # Legacy raw token columns, emptied by `python -m migrations.token_hashes`
+    access_token = Column(String(1024), nullable=True)
+    refresh_token = Column(String(1024), nullable=True, unique=True)
 
     expires_at = Column(DateTime, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, String, Table, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import joinedload, load_only, raiseload, relationship
 from database.db import Base
+from app.models.role import Role
 
 user_roles = Table(
     "user_roles",
@@ -22,6 +23,16 @@ class User(Base):
         "UserToken",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="selectin"
+    )
+
+
+# Loader profile for hot paths (auth, listings): only the columns needed to
+# describe a user plus role names. Touching any other relationship raises, so
+# a session collection can never be pulled in by accident.
+def slim_user_options(*extra_columns):
+    return (
+        load_only(User.id, User.email, User.username, *extra_columns),
+        joinedload(User.roles).load_only(Role.name),
+        raiseload("*"),
     )
 
@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
+
+
+def naive_utc(value: datetime) -> datetime:
+    # Stored like the rest of the app: naive UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+class CallEvent(BaseModel):
+    lead_id: int
+    team_id: int
+    caller_id: Optional[int] = None
+    call_date: datetime
+    result_id: Optional[int] = None
+    result_code: Optional[str] = Field(None, max_length=20)
+    notes: Optional[str] = None
+
+    _utc = field_validator("call_date")(naive_utc)
+
+class EmailEvent(BaseModel):
+    lead_id: int
+    sender_id: int
+    sent_at: datetime
+    status: Optional[str] = Field(None, max_length=50)
+    notes: Optional[str] = None
+
+    _utc = field_validator("sent_at")(naive_utc)
+
+class SmsEvent(BaseModel):
+    lead_id: int
+    team_id: int
+    sent_at: datetime
+    status: Optional[str] = Field(None, max_length=50)
+    message: Optional[str] = None
+
+    _utc = field_validator("sent_at")(naive_utc)
+
+class TouchEventBatch(BaseModel):
+    calls: List[CallEvent] = []
+    emails: List[EmailEvent] = []
+    sms: List[SmsEvent] = []
+
+    def size(self) -> int:
+        return len(self.calls) + len(self.emails) + len(self.sms)
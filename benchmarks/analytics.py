@@ -0,0 +1,155 @@
+"""
+Analytics rollups over a year of call / email logs: how long the first
+fill and an incremental refresh take, and the latency of each
+/analytics query against the rollup tables.
+
+Seeds --teams teams with --callers-per-team callers and one email sender
+each, spreads --calls call logs and --emails email logs evenly over the
+last 365 days, rolls them up with jobs.analytics_rollups, adds --increment
+more calls and refreshes again, then runs every analytics query over the
+full year --repeat times.
+
+    python -m benchmarks.analytics --calls 500000 --emails 200000
+    python -m benchmarks.analytics --database-url postgresql://... --calls 2000000
+
+The queries should stay well under 100 ms: they read at most
+days x teams x callers x result codes rollup rows, however many logs there are.
+"""
+import argparse
+import json
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from benchmarks.support import percentiles, use_scratch_database
+
+_parser = argparse.ArgumentParser(description="Analytics rollup benchmark")
+_parser.add_argument("--teams", type=int, default=5)
+_parser.add_argument("--callers-per-team", type=int, default=20)
+_parser.add_argument("--calls", type=int, default=500_000)
+_parser.add_argument("--emails", type=int, default=200_000)
+_parser.add_argument("--increment", type=int, default=10_000, help="calls added before the incremental refresh")
+_parser.add_argument("--repeat", type=int, default=50, help="runs of each analytics query")
+_parser.add_argument("--database-url", default=None)
+ARGS = _parser.parse_args()
+
+use_scratch_database(ARGS.database_url)
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from database.db import SessionLocal, engine  # noqa: E402
+from app.controllers.analytics_controller import AnalyticsController  # noqa: E402
+from app.models.crm import Caller, CallLog, EmailLog, EmailSender, Team  # noqa: E402
+from app.models.lead import Lead  # noqa: E402
+from jobs.analytics_rollups import refresh_analytics  # noqa: E402
+from migrations.bootstrap import run_bootstrap  # noqa: E402
+from seeders.synthetic import SCALES, insert_batches, run_synthetic_seeder  # noqa: E402
+
+RESULT_CODES = ["A", "B", "C", "F", "N", "V", None]
+EMAIL_STATUSES = ["sent", "opened", "bounced", "replied"]
+
+
+def seed_teams(teams: int, callers_per_team: int) -> dict:
+    """
+    team_id -> (caller ids, sender id)
+    """
+    staff = {}
+    with SessionLocal() as db:
+        for t in range(teams):
+            team_id = db.execute(
+                insert(Team).values(team_code=f"AN{t}", team_name=f"Analytics {t}")
+            ).inserted_primary_key[0]
+            insert_batches(db, Caller, (
+                {"team_id": team_id, "name": f"an{t}-caller{i}", "email": f"an{t}-caller{i}@example.com"}
+                for i in range(callers_per_team)
+            ))
+            sender_id = db.execute(
+                insert(EmailSender).values(team_id=team_id, sender_name=f"Analytics {t}")
+            ).inserted_primary_key[0]
+            caller_ids = list(db.scalars(select(Caller.caller_id).where(Caller.team_id == team_id)))
+            staff[team_id] = (caller_ids, sender_id)
+        db.commit()
+    return staff
+
+
+def seed_logs(staff: dict, calls: int, emails: int, days: int, rng: random.Random):
+    now = datetime.utcnow()
+    teams = list(staff)
+    with SessionLocal() as db:
+        lead_ids = list(db.scalars(select(Lead.id)))
+
+        def when(i: int, total: int) -> datetime:
+            return now - timedelta(days=days) * (1 - i / total) + timedelta(seconds=rng.randrange(3600))
+
+        def call_rows():
+            for i in range(calls):
+                team_id = rng.choice(teams)
+                yield {
+                    "lead_id": rng.choice(lead_ids), "team_id": team_id,
+                    "caller_id": rng.choice(staff[team_id][0]), "call_date": when(i, calls),
+                    "result_code": rng.choice(RESULT_CODES),
+                }
+
+        def email_rows():
+            for i in range(emails):
+                yield {
+                    "lead_id": rng.choice(lead_ids), "sender_id": staff[rng.choice(teams)][1],
+                    "sent_at": when(i, emails), "status": rng.choice(EMAIL_STATUSES),
+                }
+
+        insert_batches(db, CallLog, call_rows())
+        insert_batches(db, EmailLog, email_rows())
+
+
+def time_queries(team_id: int, repeat: int) -> dict:
+    until = date.today() + timedelta(days=1)
+    since = until - timedelta(days=366)
+    queries = {
+        "calls": lambda db: AnalyticsController.calls_per_caller(db, since, until, team_id=team_id),
+        "result_codes": lambda db: AnalyticsController.result_codes(db, since, until),
+        "hot_conversions": lambda db: AnalyticsController.hot_conversions(db, since, until),
+        "email_status": lambda db: AnalyticsController.email_status(db, since, until),
+    }
+
+    report = {}
+    with SessionLocal() as db:
+        for name, query in queries.items():
+            samples, rows = [], 0
+            for _ in range(repeat):
+                started = time.perf_counter()
+                rows = len(query(db))
+                samples.append((time.perf_counter() - started) * 1000)
+            report[name] = {"rows": rows, "latency_ms": percentiles(samples)}
+    return report
+
+
+def run_benchmark():
+    rng = random.Random(25)
+    run_bootstrap()
+    run_synthetic_seeder(**SCALES["tiny"])
+    staff = seed_teams(ARGS.teams, ARGS.callers_per_team)
+
+    started = time.perf_counter()
+    seed_logs(staff, ARGS.calls, ARGS.emails, 365, rng)
+    seeded = time.perf_counter() - started
+
+    first_fill = refresh_analytics()
+    # Each refresh also recounts what the one before it saw; settle that first
+    refresh_analytics()
+    seed_logs(staff, ARGS.increment, 0, 1, rng)
+    incremental = refresh_analytics()
+
+    report = {
+        "database": engine.dialect.name,
+        "calls": ARGS.calls + ARGS.increment,
+        "emails": ARGS.emails,
+        "seed_seconds": round(seeded, 1),
+        "first_fill": first_fill,
+        "incremental": incremental,
+        "queries": time_queries(next(iter(staff)), ARGS.repeat),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    run_benchmark()
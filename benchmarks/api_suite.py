@@ -0,0 +1,265 @@
+"""
+Reproducible benchmark of the API hot paths.
+
+Seeds a synthetic dataset (seeders.synthetic) into a scratch SQLite file or
+the database given with --database-url, then drives the app in-process
+through an ASGI client (no network, no server) and reports, per scenario,
+throughput, p50/p95/p99 latency and SQL statements per request as JSON.
+Save a run with --output and pass it to a later run with --compare to see
+the change.
+
+    python -m benchmarks.api_suite --scale tiny --requests 200 --output before.json
+    python -m benchmarks.api_suite --scale tiny --requests 200 --compare before.json
+
+Needs httpx (pip install httpx). Use a disposable database: the comment
+and company update scenarios write to it.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from benchmarks.support import percentiles, use_scratch_database
+
+_parser = argparse.ArgumentParser(description="API hot path benchmark suite")
+_parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+_parser.add_argument("--login-requests", type=int, default=20, help="requests for /login (password hashing is slow)")
+_parser.add_argument("--concurrency", type=int, default=8)
+_parser.add_argument("--scenarios", default=None, help="comma-separated subset to run")
+_parser.add_argument("--database-url", default=None)
+_parser.add_argument("--output", default=None, help="write the JSON report here")
+_parser.add_argument("--compare", default=None, help="earlier report to diff against")
+
+# The seeder imports database.db, so point it at the right database first
+use_scratch_database(_parser.parse_known_args(sys.argv[1:])[0].database_url)
+
+from seeders.synthetic import SYNTHETIC_PASSWORD, run_synthetic_seeder, scale_arguments, scale_from_arguments  # noqa: E402,E501
+
+# --scale tiny|small|medium|large plus per-table overrides (--leads, ...)
+scale_arguments(_parser)
+ARGS = _parser.parse_args(sys.argv[1:])
+
+import httpx  # noqa: E402
+from sqlalchemy import event, func, select  # noqa: E402
+
+import main  # noqa: E402
+from database.db import SessionLocal, engine  # noqa: E402
+from app.models.company import Company  # noqa: E402
+from app.models.lead import Lead  # noqa: E402
+from app.models.timezone import Timezone  # noqa: E402
+from migrations.bootstrap import run_bootstrap  # noqa: E402
+
+ADMIN = {"email": "admin1@example.com", "password": "password123"}
+AGENT = {"email": "bench-user0@example.com", "password": SYNTHETIC_PASSWORD}
+
+statements = [0]
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _count_statement(*_):
+    statements[0] += 1
+
+
+# ============================================================
+# Scenarios: each sends one request and returns its status
+# ============================================================
+
+class Suite:
+    def __init__(self, client: httpx.AsyncClient, rng: random.Random):
+        self.client = client
+        self.rng = rng
+        self.admin: Dict[str, str] = {}
+        self.agent: Dict[str, str] = {}
+        self.cursors: Dict[str, Optional[str]] = {}
+        self.comment_ids: List[int] = []
+
+        with SessionLocal() as db:
+            self.lead_ids = db.execute(select(func.min(Lead.id), func.max(Lead.id))).one()
+            self.company_ids = db.execute(select(func.min(Company.id), func.max(Company.id))).one()
+            self.timezone_ids = list(db.scalars(select(Timezone.id)))
+
+    async def login_as(self, credentials: dict) -> Dict[str, str]:
+        response = await self.client.post("/api/login", json=credentials)
+        response.raise_for_status()
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def setup(self):
+        self.admin = await self.login_as(ADMIN)
+        self.agent = await self.login_as(AGENT)
+
+    def _lead_id(self) -> int:
+        return self.rng.randint(*self.lead_ids)
+
+    def _company_id(self) -> int:
+        return self.rng.randint(*self.company_ids)
+
+    async def _page(self, name: str, path: str, headers: dict) -> int:
+        # Walk the keyset pages, starting over after the last one
+        params = {"limit": 50}
+        if self.cursors.get(name):
+            params["cursor"] = self.cursors[name]
+        response = await self.client.get(path, params=params, headers=headers)
+        self.cursors[name] = response.headers.get("x-next-cursor")
+        return response.status_code
+
+    async def login(self) -> int:
+        return (await self.client.post("/api/login", json=AGENT)).status_code
+
+    async def me(self) -> int:
+        return (await self.client.get("/api/me", headers=self.agent)).status_code
+
+    async def leads(self) -> int:
+        return await self._page("leads", "/api/leads", self.agent)
+
+    async def lead_by_id(self) -> int:
+        return (await self.client.get(f"/api/lead/{self._lead_id()}", headers=self.agent)).status_code
+
+    async def companies(self) -> int:
+        return await self._page("companies", "/api/companies", self.admin)
+
+    async def company_update(self) -> int:
+        company_id = self._company_id()
+        body = {
+            "name": f"Bench Company {company_id - self.company_ids[0]}",
+            "city": self.rng.choice(("New York", "Boston", "Chicago", "Denver")),
+            "timezone_id": self.rng.choice(self.timezone_ids),
+        }
+        return (await self.client.put(f"/api/company/{company_id}", json=body, headers=self.admin)).status_code
+
+    async def comment_create(self) -> int:
+        response = await self.client.post(
+            f"/api/company/{self._company_id()}/comments",
+            json={"message": "Benchmark comment"},
+            headers=self.agent,
+        )
+        if response.status_code == 200:
+            self.comment_ids.append(response.json()["id"])
+        return response.status_code
+
+    async def comment_list(self) -> int:
+        return (await self.client.get(f"/api/company/{self._company_id()}/comments", headers=self.agent)).status_code
+
+    async def comment_get(self) -> int:
+        comment_id = self.rng.choice(self.comment_ids)
+        return (await self.client.get(f"/api/comments/{comment_id}", headers=self.agent)).status_code
+
+    async def comment_update(self) -> int:
+        comment_id = self.rng.choice(self.comment_ids)
+        response = await self.client.put(
+            f"/api/comments/{comment_id}", json={"message": "Edited benchmark comment"}, headers=self.agent
+        )
+        return response.status_code
+
+    async def comment_delete(self) -> int:
+        comment_id = self.comment_ids.pop()
+        return (await self.client.delete(f"/api/comments/{comment_id}", headers=self.agent)).status_code
+
+
+# Run order matters: comments are created before they are read, edited and deleted
+SCENARIOS = (
+    "login", "me", "leads", "lead_by_id", "companies", "company_update",
+    "comment_create", "comment_list", "comment_get", "comment_update", "comment_delete",
+)
+
+
+async def run_scenario(send: Callable[[], Awaitable[int]], requests: int, concurrency: int) -> dict:
+    latency_ms: List[float] = []
+    errors = [0]
+    remaining = [requests]
+
+    async def worker():
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            start = time.perf_counter()
+            status = await send()
+            latency_ms.append((time.perf_counter() - start) * 1000)
+            if status >= 400:
+                errors[0] += 1
+
+    statements[0] = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "errors": errors[0],
+        "throughput_rps": round(requests / elapsed, 1),
+        "latency_ms": percentiles(latency_ms),
+        "queries_per_request": round(statements[0] / requests, 2),
+    }
+
+
+def compare(report: dict, baseline: dict) -> dict:
+    """
+    Relative change per scenario: negative latency / positive throughput is better.
+    """
+    changes = {}
+    for name, run in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+
+        def change(new, old):
+            return f"{(new - old) / old * 100:+.1f}%" if old else None
+
+        changes[name] = {
+            "throughput_rps": change(run["throughput_rps"], before["throughput_rps"]),
+            "p50": change(run["latency_ms"]["p50"], before["latency_ms"]["p50"]),
+            "p95": change(run["latency_ms"]["p95"], before["latency_ms"]["p95"]),
+            "p99": change(run["latency_ms"]["p99"], before["latency_ms"]["p99"]),
+            "queries_per_request": round(run["queries_per_request"] - before["queries_per_request"], 2),
+        }
+    return changes
+
+
+async def run_suite(scale: dict) -> dict:
+    selected = ARGS.scenarios.split(",") if ARGS.scenarios else SCENARIOS
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        suite = Suite(client, random.Random(ARGS.seed))
+        await suite.setup()
+
+        scenarios = {}
+        for name in SCENARIOS:
+            if name not in selected:
+                continue
+            requests = ARGS.login_requests if name == "login" else ARGS.requests
+            if name in ("comment_get", "comment_update", "comment_delete"):
+                requests = min(requests, len(suite.comment_ids))
+            if requests:
+                scenarios[name] = await run_scenario(getattr(suite, name), requests, ARGS.concurrency)
+
+    return {
+        "database": engine.dialect.name,
+        "scale": scale,
+        "concurrency": ARGS.concurrency,
+        "scenarios": scenarios,
+    }
+
+
+def run_benchmark():
+    scale = scale_from_arguments(ARGS)
+    run_bootstrap()
+
+    started = time.perf_counter()
+    run_synthetic_seeder(**scale, seed=ARGS.seed)
+    print(f"Seeded in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    report = asyncio.run(run_suite(scale))
+    if ARGS.compare:
+        with open(ARGS.compare) as f:
+            report["compared_to"] = {"file": ARGS.compare, "changes": compare(report, json.load(f))}
+
+    output = json.dumps(report, indent=2)
+    if ARGS.output:
+        with open(ARGS.output, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,119 @@
+"""
+Sync vs async request path: req/s and latency of the read-heavy routes.
+
+Seeds a scratch database, then serves the app in a child process twice,
+once with DB_ASYNC off and once with it on, driving GET /api/leads and
+GET /api/lead/{id} from many concurrent clients. SQLite needs aiosqlite for
+the async run; pass --database-url to compare on PostgreSQL (asyncpg).
+
+    python -m benchmarks.async_mode --clients 200 --seconds 10
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+
+from benchmarks.support import http, percentiles, serve_in_subprocess, use_scratch_database
+
+_parser = argparse.ArgumentParser(description="Sync vs async request path throughput")
+_parser.add_argument("--clients", type=int, default=200)
+_parser.add_argument("--seconds", type=float, default=10)
+_parser.add_argument("--leads", type=int, default=5000)
+_parser.add_argument("--database-url", default=None)
+ARGS = _parser.parse_args(sys.argv[1:])
+
+DATABASE_URL = use_scratch_database(ARGS.database_url)
+
+from sqlalchemy import insert  # noqa: E402
+
+import main  # noqa: E402,F401
+from database.db import SessionLocal  # noqa: E402
+from app.models.company import Company  # noqa: E402
+from app.models.lead import Lead  # noqa: E402
+from migrations.bootstrap import run_bootstrap  # noqa: E402
+from seeders.user import run_seeder  # noqa: E402
+
+EMAIL = "agent1@example.com"
+PASSWORD = "password123"
+
+
+def seed_leads(count: int):
+    db = SessionLocal()
+    try:
+        companies = [Company(name=f"Async Bench {i}", symbol=f"AB{i}") for i in range(50)]
+        db.add_all(companies)
+        db.flush()
+        db.execute(insert(Lead), [
+            {
+                "full_name": f"Lead {i}",
+                "company_id": companies[i % len(companies)].id,
+                "role": "CFO",
+                "phone": f"555-{i:06d}",
+            }
+            for i in range(count)
+        ])
+        db.commit()
+        return [id for (id,) in db.query(Lead.id)]
+    finally:
+        db.close()
+
+
+def load(base_url: str, lead_ids: list, clients: int, seconds: float) -> dict:
+    status, body = http("POST", f"{base_url}/api/login", {"email": EMAIL, "password": PASSWORD})
+    token = body["access_token"]
+
+    stop = threading.Event()
+    latency_ms = {"list": [], "detail": []}
+    errors = []
+    lock = threading.Lock()
+
+    def client_loop():
+        rng = random.Random()
+        while not stop.is_set():
+            if rng.random() < 0.5:
+                kind, url = "list", f"{base_url}/api/leads?limit=50"
+            else:
+                kind, url = "detail", f"{base_url}/api/lead/{rng.choice(lead_ids)}"
+
+            start = time.perf_counter()
+            status, _ = http("GET", url, token=token)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                if status == 200:
+                    latency_ms[kind].append(elapsed)
+                else:
+                    errors.append(status)
+
+    threads = [threading.Thread(target=client_loop) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    completed = sum(len(samples) for samples in latency_ms.values())
+    return {
+        "requests_per_second": round(completed / seconds, 1),
+        "errors": len(errors),
+        "latency_ms": {kind: percentiles(samples) for kind, samples in latency_ms.items()},
+    }
+
+
+def run_benchmark():
+    run_bootstrap()
+    run_seeder()
+    lead_ids = seed_leads(ARGS.leads)
+
+    report = {"clients": ARGS.clients, "seconds": ARGS.seconds, "database": DATABASE_URL.split(":")[0]}
+    for mode, flag in (("sync", "false"), ("async", "true")):
+        with serve_in_subprocess("main:app", {"DB_ASYNC": flag}) as base_url:
+            report[mode] = load(base_url, lead_ids, ARGS.clients, ARGS.seconds)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    run_benchmark()
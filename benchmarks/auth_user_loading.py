@@ -0,0 +1,99 @@
+"""
+Authenticated-request latency as the number of sessions per user grows.
+
+Compares the old loader (every UserToken selectin-loaded with the user)
+against the slim profile used by get_current_user. Runs on an in-memory
+SQLite database and does not touch DATABASE_URL.
+
+    python -m benchmarks.auth_user_loading
+"""
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine
+from sqlalchemy.orm import selectinload, sessionmaker
+
+from database.db import Base
+from app.models.role import Role
+from app.models.token import UserToken
+from app.models.user import User
+from app.middlewares.auth_middleware import create_token, get_current_user
+from utils.jwt_helper import hash_token
+from utils.principal_cache import principal_cache
+
+TOKEN_COUNTS = [1, 10, 100, 1000, 5000]
+ITERATIONS = 200
+
+
+def seed(session, token_count: int) -> str:
+    role = Role(name="agent")
+    user = User(email="agent@example.com", username="agent", password="x", roles=[role])
+    session.add(user)
+    session.flush()
+
+    expires_at = datetime.utcnow() + timedelta(days=7)
+    live_token = None
+    for _ in range(token_count):
+        access = create_token({"sub": user.email}, timedelta(minutes=60))
+        refresh = create_token({"sub": user.email}, timedelta(days=7))
+        session.add(UserToken(
+            user_id=user.id,
+            access_token_hash=hash_token(access),
+            refresh_token_hash=hash_token(refresh),
+            expires_at=expires_at,
+        ))
+        live_token = access
+
+    session.commit()
+    return live_token
+
+
+def time_ms(fn) -> list:
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def run_benchmark():
+    principal_cache.clear()
+    principal_cache.ttl = 0  # measure the DB path, not the cache
+
+    print(f"{'tokens/user':>12} {'selectin p50 ms':>16} {'slim p50 ms':>12}")
+    for token_count in TOKEN_COUNTS:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+
+        with Session() as session:
+            token = seed(session, token_count)
+
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+        def selectin_path():
+            with Session() as session:
+                user = (
+                    session.query(User)
+                    .options(selectinload(User.tokens))
+                    .filter(User.email == "agent@example.com")
+                    .first()
+                )
+                [r.name for r in user.roles]
+
+        def slim_path():
+            with Session() as session:
+                get_current_user(credentials, session)
+
+        old = statistics.median(time_ms(selectin_path))
+        new = statistics.median(time_ms(slim_path))
+        print(f"{token_count:>12} {old:>16.3f} {new:>12.3f}")
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    run_benchmark()
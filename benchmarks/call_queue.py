@@ -0,0 +1,152 @@
+"""
+Call queue under concurrent callers: latency of "next lead" and proof that
+no lead is ever held by two callers at once.
+
+Seeds synthetic leads, puts them all in one team's lead_team_tracking and
+lets --callers threads (one per caller, each with its own session) ask for
+their next lead --rounds times. Asking again releases the previous lead,
+so leads do change hands; a lead counts as double-leased when a caller got
+it before its previous holder had asked for their next one.
+
+    python -m benchmarks.call_queue --callers 200 --rounds 20
+    python -m benchmarks.call_queue --database-url postgresql://... --callers 200
+
+The calling window is opened to the whole day so results do not depend on
+the time the benchmark runs. SQLite serialises writers; use PostgreSQL
+for a representative run.
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+
+from benchmarks.support import percentiles, use_scratch_database
+
+_parser = argparse.ArgumentParser(description="Call queue benchmark")
+_parser.add_argument("--callers", type=int, default=200)
+_parser.add_argument("--rounds", type=int, default=20, help="next-lead requests per caller")
+_parser.add_argument("--leads", type=int, default=10_000)
+_parser.add_argument("--database-url", default=None)
+ARGS = _parser.parse_args()
+
+use_scratch_database(ARGS.database_url)
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from config.settings import settings  # noqa: E402
+from database.db import SessionLocal, engine  # noqa: E402
+from app.models.crm import Caller, LeadTeamTracking, Team  # noqa: E402
+from app.models.lead import Lead  # noqa: E402
+from migrations.bootstrap import run_bootstrap  # noqa: E402
+from seeders.synthetic import SCALES, insert_batches, run_synthetic_seeder  # noqa: E402
+from utils.call_queue import call_queue  # noqa: E402
+
+TEAM_CODE = "BENCH"
+
+
+def seed_team(callers: int) -> tuple:
+    with SessionLocal() as db:
+        team_id = db.scalar(select(Team.team_id).where(Team.team_code == TEAM_CODE))
+        if team_id is None:
+            team_id = db.execute(insert(Team).values(team_code=TEAM_CODE, team_name="Benchmark")).inserted_primary_key[0]
+            insert_batches(db, Caller, (
+                {"team_id": team_id, "name": f"caller{i}", "email": f"bench-caller{i}@example.com"}
+                for i in range(callers)
+            ))
+            leads = db.execute(select(Lead.id, Lead.lead_type_id, Lead.follow_up_date)).all()
+            insert_batches(db, LeadTeamTracking, (
+                {"lead_id": lead.id, "team_id": team_id, "lead_type_id": lead.lead_type_id,
+                 "follow_up_date": lead.follow_up_date}
+                for lead in leads
+            ))
+        caller_ids = list(db.scalars(select(Caller.caller_id).where(Caller.team_id == team_id).limit(callers)))
+    return team_id, caller_ids
+
+
+def run_callers(team_id: int, caller_ids: list, rounds: int) -> dict:
+    latency_ms = []
+    # tracking_id -> [(caller_id, leased_at, released_at)]
+    holds = defaultdict(list)
+    errors = [0]
+    empty = [0]
+    lock = threading.Lock()
+    start_line = threading.Barrier(len(caller_ids))
+
+    def caller_loop(caller_id: int):
+        previous = None
+        start_line.wait()
+        with SessionLocal() as db:
+            for _ in range(rounds):
+                asked_at = time.perf_counter()
+                try:
+                    lead = call_queue.next_lead(db, caller_id, team_id)
+                except Exception:
+                    db.rollback()
+                    with lock:
+                        errors[0] += 1
+                    continue
+                leased_at = time.perf_counter()
+
+                with lock:
+                    latency_ms.append((leased_at - asked_at) * 1000)
+                    if previous:
+                        # Asking for the next lead is what releases the previous one
+                        previous[2] = asked_at
+                    if lead is None:
+                        empty[0] += 1
+                        previous = None
+                        continue
+                    previous = [caller_id, leased_at, float("inf")]
+                    holds[lead["tracking_id"]].append(previous)
+
+    threads = [threading.Thread(target=caller_loop, args=(caller_id,)) for caller_id in caller_ids]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    double_leased = 0
+    for hold_list in holds.values():
+        hold_list.sort(key=lambda hold: hold[1])
+        for before, after in zip(hold_list, hold_list[1:]):
+            if before[2] > after[1]:
+                double_leased += 1
+
+    requests = len(latency_ms)
+    return {
+        "callers": len(caller_ids),
+        "requests": requests,
+        "errors": errors[0],
+        "no_lead": empty[0],
+        "distinct_leads": len(holds),
+        "double_leased": double_leased,
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": percentiles(latency_ms),
+    }
+
+
+def run_benchmark():
+    settings.CALL_QUEUE_WINDOW_START_HOUR, settings.CALL_QUEUE_WINDOW_END_HOUR = 0, 24
+
+    run_bootstrap()
+    scale = dict(SCALES["tiny"], leads=ARGS.leads)
+    run_synthetic_seeder(**scale)
+    team_id, caller_ids = seed_team(ARGS.callers)
+
+    report = {
+        "database": engine.dialect.name,
+        "leads": ARGS.leads,
+        "batch_size": call_queue.batch_size,
+        **run_callers(team_id, caller_ids, ARGS.rounds),
+    }
+    print(json.dumps(report, indent=2))
+    if report["double_leased"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,74 @@
+"""
+Rows/sec of the bulk lead import against the per-row POST /lead path.
+
+Uses a scratch SQLite database unless --database-url is given (point it at a
+disposable PostgreSQL database to measure the COPY path).
+
+    python -m benchmarks.lead_import --rows 5000
+"""
+import argparse
+import json
+import sys
+import time
+
+from benchmarks.support import use_scratch_database
+
+_parser = argparse.ArgumentParser(description="Bulk vs per-row lead import throughput")
+_parser.add_argument("--rows", type=int, default=5000)
+_parser.add_argument("--batch-size", type=int, default=1000)
+_parser.add_argument("--database-url", default=None)
+ARGS = _parser.parse_args(sys.argv[1:])
+
+use_scratch_database(ARGS.database_url)
+
+import app.models  # noqa: E402,F401
+from database.db import Base, SessionLocal, engine  # noqa: E402
+from app.controllers.lead_controller import LeadController  # noqa: E402
+from app.controllers.lead_import_controller import LeadImportController  # noqa: E402
+from app.models.company import Company  # noqa: E402
+from app.models.contact_type_option import ContactTypeOption  # noqa: E402
+from app.schemas.lead_schema import LeadCreateRequest  # noqa: E402
+
+
+def sample_rows(count: int, company_id: int, contact_type_id: int):
+    for i in range(count):
+        yield {
+            "full_name": f"Lead {i}",
+            "company_id": company_id,
+            "role": "CFO",
+            "phone": f"555-{i:06d}",
+            "email": f"lead{i}@example.com",
+            "contact_type_id": contact_type_id,
+        }
+
+
+def run_benchmark():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        company = Company(name=f"Import Bench {time.time()}", symbol="IMP")
+        contact_type = db.query(ContactTypeOption).first() or ContactTypeOption(label="Validated")
+        db.add_all([company, contact_type])
+        db.commit()
+
+        start = time.perf_counter()
+        for row in sample_rows(ARGS.rows, company.id, contact_type.id):
+            LeadController.create_lead_in_db(LeadCreateRequest(**row), db)
+        per_row_elapsed = time.perf_counter() - start
+
+        rows = ((n, row, None) for n, row in enumerate(sample_rows(ARGS.rows, company.id, contact_type.id), start=1))
+        report = LeadImportController.import_leads(db, rows, batch_size=ARGS.batch_size)
+    finally:
+        db.close()
+
+    print(json.dumps({
+        "dialect": engine.dialect.name,
+        "rows": ARGS.rows,
+        "per_row_rows_per_second": round(ARGS.rows / per_row_elapsed, 1),
+        "bulk_rows_per_second": report["rows_per_second"],
+        "bulk_failed": report["failed"],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,95 @@
+"""
+Login storm: does a burst of /login calls slow down the rest of the API?
+
+Runs the app under uvicorn on a scratch SQLite database, hammers /api/login
+from many client threads and meanwhile probes /api/me. The storm is run
+twice: with password checks on a bcrypt pool as large as the request
+threadpool (the old behaviour) and with the bounded pool from settings.
+
+    python -m benchmarks.login_storm --clients 100 --seconds 10
+"""
+import argparse
+import json
+import threading
+import time
+
+from benchmarks.support import http, percentiles, running_server, use_scratch_database
+
+use_scratch_database()
+
+from passlib.context import CryptContext  # noqa: E402
+
+import main  # noqa: E402
+from app.controllers import auth_controller  # noqa: E402
+from config.settings import settings  # noqa: E402
+from migrations.bootstrap import run_bootstrap  # noqa: E402
+from seeders.user import run_seeder  # noqa: E402
+from utils.password_hasher import PasswordHasher, password_hasher  # noqa: E402
+
+EMAIL = "agent1@example.com"
+PASSWORD = "password123"
+
+
+def storm(base_url: str, clients: int, seconds: float) -> dict:
+    status, body = http("POST", f"{base_url}/api/login", {"email": EMAIL, "password": PASSWORD})
+    token = body["access_token"]
+
+    stop = threading.Event()
+    counts = {"ok": 0, "rejected": 0, "other": 0}
+    lock = threading.Lock()
+
+    def login_loop():
+        while not stop.is_set():
+            status, _ = http("POST", f"{base_url}/api/login", {"email": EMAIL, "password": PASSWORD})
+            key = "ok" if status == 200 else "rejected" if status == 503 else "other"
+            with lock:
+                counts[key] += 1
+
+    probe_ms = []
+
+    def probe_loop():
+        while not stop.is_set():
+            start = time.perf_counter()
+            http("GET", f"{base_url}/api/me", token=token)
+            probe_ms.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=login_loop) for _ in range(clients)]
+    threads.append(threading.Thread(target=probe_loop))
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    return {"logins": counts, "me_latency_ms": percentiles(probe_ms)}
+
+
+def run_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    run_bootstrap()
+    run_seeder()
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    scenarios = {
+        "shared_pool": PasswordHasher(context, workers=40, queue_depth=10_000, timeout=60),
+        "bounded_pool": password_hasher,
+    }
+
+    report = {"clients": args.clients, "seconds": args.seconds}
+    with running_server(main.app) as base_url:
+        for name, hasher in scenarios.items():
+            auth_controller.password_hasher = hasher
+            report[name] = storm(base_url, args.clients, args.seconds)
+
+    report["bounded_pool"]["workers"] = settings.PASSWORD_HASH_WORKERS
+    report["bounded_pool"]["queue_depth"] = settings.PASSWORD_HASH_QUEUE_DEPTH
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    run_benchmark()
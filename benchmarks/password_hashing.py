@@ -0,0 +1,55 @@
+"""
+Hashes/sec and verifies/sec for each password hash profile.
+
+Profiles whose backend is not installed (e.g. argon2 without argon2-cffi)
+are reported as skipped.
+
+    python -m benchmarks.password_hashing --seconds 2
+"""
+import argparse
+import json
+import time
+
+from benchmarks.support import use_scratch_database
+
+use_scratch_database()
+
+from utils.password_hasher import HASH_PROFILES, build_crypt_context  # noqa: E402
+
+PASSWORD = "password123"
+
+
+def rate(fn, seconds: float) -> float:
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn()
+        calls += 1
+    return round(calls / (time.perf_counter() - start), 2)
+
+
+def run_benchmark():
+    parser = argparse.ArgumentParser(description="Password hash profile throughput")
+    parser.add_argument("--seconds", type=float, default=2)
+    args = parser.parse_args()
+
+    report = {}
+    for profile in HASH_PROFILES:
+        try:
+            context = build_crypt_context(profile)
+        except RuntimeError as e:
+            report[profile] = {"skipped": str(e)}
+            continue
+
+        hashed = context.hash(PASSWORD)
+        report[profile] = {
+            "scheme": context.default_scheme(),
+            "hashes_per_sec": rate(lambda: context.hash(PASSWORD), args.seconds),
+            "verifies_per_sec": rate(lambda: context.verify(PASSWORD, hashed), args.seconds),
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    run_benchmark()
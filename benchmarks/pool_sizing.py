@@ -0,0 +1,121 @@
+"""
+Connection pool sizing: do requests stall waiting for a DB connection?
+
+Runs the app under uvicorn on a scratch SQLite database and drives GET
+/api/leads from as many client threads as the request threadpool has
+workers. The run is repeated with SQLAlchemy's default pool (5 + 10
+overflow) and with the pool from settings, reporting request latency and
+the checkout wait / stall counts collected by database.pool.
+
+    python -m benchmarks.pool_sizing --clients 40 --seconds 10
+"""
+import argparse
+import json
+import threading
+import time
+
+from benchmarks.support import http, percentiles, running_server, use_scratch_database
+
+use_scratch_database()
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+
+import main  # noqa: E402
+from config.settings import settings  # noqa: E402
+from database.db import RoutingSessionLocal, SessionLocal, engine, engine_options  # noqa: E402
+from database.pool import pool_metrics  # noqa: E402
+from app.models.company import Company  # noqa: E402
+from app.models.lead import Lead  # noqa: E402
+from migrations.bootstrap import run_bootstrap  # noqa: E402
+from seeders.user import run_seeder  # noqa: E402
+
+EMAIL = "admin1@example.com"
+PASSWORD = "password123"
+
+
+def seed_leads(count: int):
+    db = SessionLocal()
+    try:
+        company = Company(name="Pool Bench", symbol="POOL")
+        db.add(company)
+        db.flush()
+        db.execute(insert(Lead), [
+            {"full_name": f"Lead {i}", "company_id": company.id, "role": "CFO", "phone": f"555-{i:06d}"}
+            for i in range(count)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def load(base_url: str, token: str, clients: int, seconds: float) -> dict:
+    stop = threading.Event()
+    latency_ms = []
+    errors = []
+    lock = threading.Lock()
+
+    def client_loop():
+        while not stop.is_set():
+            start = time.perf_counter()
+            status, _ = http("GET", f"{base_url}/api/leads?limit=50", token=token)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                if status == 200:
+                    latency_ms.append(elapsed)
+                else:
+                    errors.append(status)
+
+    threads = [threading.Thread(target=client_loop) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    return {
+        "requests_per_second": round(len(latency_ms) / seconds, 1),
+        "errors": len(errors),
+        "latency_ms": percentiles(latency_ms),
+    }
+
+
+def run_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=40)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--leads", type=int, default=2000)
+    args = parser.parse_args()
+
+    run_bootstrap()
+    run_seeder()
+    seed_leads(args.leads)
+
+    tuned = engine_options(settings.DATABASE_URL)
+    scenarios = {
+        "default_pool": {**tuned, "pool_size": 5, "max_overflow": 10, "pool_pre_ping": False, "pool_recycle": -1},
+        "tuned_pool": tuned,
+    }
+
+    report = {"clients": args.clients, "seconds": args.seconds}
+    with running_server(main.app) as base_url:
+        status, body = http("POST", f"{base_url}/api/login", {"email": EMAIL, "password": PASSWORD})
+        token = body["access_token"]
+
+        for name, options in scenarios.items():
+            scenario_engine = create_engine(settings.DATABASE_URL, **options)
+            RoutingSessionLocal.configure(bind=scenario_engine)
+            pool_metrics.reset()
+
+            result = load(base_url, token, args.clients, args.seconds)
+            result["pool"] = pool_metrics.snapshot(scenario_engine.pool)
+            report[name] = result
+
+            RoutingSessionLocal.configure(bind=engine)
+            scenario_engine.dispose()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    run_benchmark()
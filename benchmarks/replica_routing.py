@@ -0,0 +1,119 @@
+"""
+Replica routing check with two SQLite stand-ins.
+
+Creates a scratch primary plus two replica files (copies of the primary
+taken after seeding, so they lag behind anything written later), serves the
+app with DATABASE_REPLICA_URLS pointing at the copies and counts the
+statements each database receives while it:
+
+  1. logs in and calls /me (the fresh token is only on the primary),
+  2. lets the copies catch up, then pages through GET /leads and
+     GET /companies (should spread over the replicas),
+  3. creates a company and lists companies right away (read-your-writes:
+     primary, new company visible), then again after the window (replica).
+
+    python -m benchmarks.replica_routing --strategy least_connections
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from benchmarks.support import http, running_server, use_scratch_database
+
+_parser = argparse.ArgumentParser(description="Read replica routing check")
+_parser.add_argument("--strategy", default="round_robin", choices=("round_robin", "least_connections"))
+_parser.add_argument("--reads", type=int, default=20)
+_parser.add_argument("--window", type=float, default=1.0, help="read-your-writes seconds")
+ARGS = _parser.parse_args(sys.argv[1:])
+
+PRIMARY_URL = use_scratch_database()
+_directory = os.path.dirname(PRIMARY_URL[len("sqlite:///"):])
+REPLICA_PATHS = [os.path.join(_directory, f"replica{i}.db") for i in (1, 2)]
+os.environ["DATABASE_REPLICA_URLS"] = ",".join(f"sqlite:///{path}" for path in REPLICA_PATHS)
+os.environ["DB_REPLICA_STRATEGY"] = ARGS.strategy
+os.environ["DB_READ_YOUR_WRITES_SECONDS"] = str(ARGS.window)
+os.environ["PRINCIPAL_CACHE_TTL_SECONDS"] = "0"  # make every request authenticate against the database
+
+from sqlalchemy import event  # noqa: E402
+
+import main  # noqa: E402
+from database.db import engine, replica_engines  # noqa: E402
+from migrations.bootstrap import run_bootstrap  # noqa: E402
+from seeders.user import run_seeder  # noqa: E402
+
+EMAIL = "admin1@example.com"
+PASSWORD = "password123"
+
+counts = {}
+
+
+def count_statements(name, target):
+    @event.listens_for(target, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        kind = "read" if statement.lstrip().upper().startswith("SELECT") else "write"
+        counts.setdefault(name, {"read": 0, "write": 0})[kind] += 1
+
+
+def snapshot_and_reset():
+    taken = {name: dict(c) for name, c in sorted(counts.items())}
+    counts.clear()
+    return taken
+
+
+def copy_primary_to_replicas():
+    source = sqlite3.connect(PRIMARY_URL[len("sqlite:///"):])
+    for path in REPLICA_PATHS:
+        target = sqlite3.connect(path)
+        source.backup(target)
+        target.close()
+    source.close()
+
+
+def run_check():
+    run_bootstrap()
+    run_seeder()
+    copy_primary_to_replicas()
+
+    count_statements("primary", engine)
+    for i, replica in enumerate(replica_engines, start=1):
+        count_statements(f"replica{i}", replica)
+
+    report = {"strategy": ARGS.strategy}
+    with running_server(main.app) as base_url:
+        status, body = http("POST", f"{base_url}/api/login", {"email": EMAIL, "password": PASSWORD})
+        token = body["access_token"]
+        status, _ = http("GET", f"{base_url}/api/me", token=token)
+        report["login_then_me"] = {"me_status": status, "statements": snapshot_and_reset()}
+
+        # Let the stand-ins catch up with the login, as real replicas would
+        copy_primary_to_replicas()
+
+        for _ in range(ARGS.reads):
+            http("GET", f"{base_url}/api/leads?limit=10", token=token)
+            http("GET", f"{base_url}/api/companies?limit=10", token=token)
+        report["reads"] = {"requests": ARGS.reads * 2, "statements": snapshot_and_reset()}
+
+        name = f"Replica Check {time.time()}"
+        create_status, _ = http("POST", f"{base_url}/api/company", {"name": name, "timezone_id": 1}, token=token)
+        status, companies = http("GET", f"{base_url}/api/companies?limit=10", token=token)
+        report["read_after_write"] = {
+            "create_status": create_status,
+            "new_company_visible": any(c["name"] == name for c in companies),
+            "statements": snapshot_and_reset(),
+        }
+
+        time.sleep(ARGS.window + 0.1)
+        status, companies = http("GET", f"{base_url}/api/companies?limit=10", token=token)
+        report["read_after_window"] = {
+            "new_company_visible": any(c["name"] == name for c in companies),
+            "statements": snapshot_and_reset(),
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    run_check()
@@ -0,0 +1,85 @@
+"""
+Cold start cost of `import main` with and without import-time DDL.
+
+Bootstraps a scratch database once (`migrations.bootstrap`), then starts a
+fresh interpreter --runs times per mode and times the import of main:
+
+  * legacy:  import main, then Base.metadata.create_all (what main.py used
+             to do on every worker start and reload)
+  * current: import main only (no DDL)
+
+Each child also counts the statements it sent to the database. Point
+--database-url at a copy of the production Postgres to see the catalog
+round trips create_all costs there.
+
+    python -m benchmarks.startup_time --runs 20
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.support import percentiles, use_scratch_database
+
+_parser = argparse.ArgumentParser(description="Worker start time with and without create_all")
+_parser.add_argument("--runs", type=int, default=10)
+_parser.add_argument("--database-url", default=None)
+_parser.add_argument("--child", choices=("legacy", "current"), help=argparse.SUPPRESS)
+ARGS = _parser.parse_args(sys.argv[1:])
+
+
+def child(mode: str):
+    from sqlalchemy import event
+
+    start = time.perf_counter()
+    from database.db import Base, engine
+
+    statements = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(*_):
+        statements[0] += 1
+
+    import main  # noqa: F401
+
+    if mode == "legacy":
+        Base.metadata.create_all(bind=engine)
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(json.dumps({"ms": elapsed_ms, "statements": statements[0]}))
+
+
+def measure(mode: str) -> dict:
+    samples, statements = [], 0
+    for _ in range(ARGS.runs):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup_time", "--child", mode],
+            env=os.environ.copy(), check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        samples.append(result["ms"])
+        statements = result["statements"]
+
+    return {"statements": statements, "import_ms": percentiles(samples)}
+
+
+def run_benchmark():
+    from migrations.bootstrap import run_bootstrap
+
+    run_bootstrap()
+
+    report = {mode: measure(mode) for mode in ("legacy", "current")}
+    legacy, current = report["legacy"]["import_ms"]["p50"], report["current"]["import_ms"]["p50"]
+    report["p50_saved_ms"] = round(legacy - current, 3)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    if ARGS.child:
+        child(ARGS.child)
+    else:
+        use_scratch_database(ARGS.database_url)
+        run_benchmark()
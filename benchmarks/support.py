@@ -0,0 +1,128 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Call `use_scratch_database()` before importing anything from the app so
+config.settings and database.db pick up a throwaway SQLite file instead of
+the developer's DATABASE_URL.
+"""
+import contextlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional
+
+
+def use_scratch_database(url: Optional[str] = None) -> str:
+    if url is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="sidago-bench-"), "bench.db")
+        url = f"sqlite:///{path}"
+
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+    os.environ.setdefault("REFRESH_TOKEN_EXPIRE_DAYS", "7")
+    return url
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"count": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+    ordered = sorted(samples)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+    return {"count": len(ordered), "p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def running_server(app, **uvicorn_options):
+    """
+    Serve `app` with uvicorn on a background thread; yields the base URL.
+    """
+    import uvicorn
+
+    port = _free_port()
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", **uvicorn_options)
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+# Command line (after `python -m`) for each server, given app path and port
+SERVER_COMMANDS = {
+    "uvicorn": lambda app, port: ["uvicorn", app, "--port", str(port), "--log-level", "warning"],
+    "gunicorn": lambda app, port: ["gunicorn", app, "--bind", f"127.0.0.1:{port}", "--log-level", "warning"],
+}
+
+
+@contextlib.contextmanager
+def serve_in_subprocess(app_path: str = "main:app", env: Optional[Dict[str, str]] = None, *extra_args: str,
+                        server: str = "uvicorn", startup_timeout: float = 30):
+    """
+    Run uvicorn (or gunicorn) in a child process with its own settings from
+    `env`; yields the base URL once the port accepts connections.
+    """
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", *SERVER_COMMANDS[server](app_path, port), *extra_args],
+        env={**os.environ, **(env or {})},
+    )
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"{server} exited with code {process.returncode}")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"{server} did not start within {startup_timeout} seconds")
+                time.sleep(0.1)
+
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+
+
+def http(method: str, url: str, body: Optional[dict] = None, token: Optional[str] = None, timeout: float = 30):
+    """
+    Minimal JSON HTTP client; returns (status, parsed body or None).
+    """
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(url, data=data, method=method)
+    request.add_header("Content-Type", "application/json")
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            payload = response.read()
+            return response.status, json.loads(payload) if payload else None
+    except urllib.error.HTTPError as e:
+        return e.code, None
@@ -0,0 +1,132 @@
+"""
+Throughput of the production server profile as the worker count grows.
+
+Seeds a scratch database, then runs `gunicorn main:app` (gunicorn.conf.py)
+with WEB_WORKERS set to each value of --workers and drives GET /api/leads
+from client processes. Run it on the target host type (or against a copy of
+production data with --database-url) to see how close scaling is to linear.
+
+    python -m benchmarks.worker_scaling --workers 1,2,4,8,16 --seconds 15
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+import threading
+import time
+
+from benchmarks.support import http, percentiles, serve_in_subprocess, use_scratch_database
+
+_cpus = multiprocessing.cpu_count()
+_parser = argparse.ArgumentParser(description="Requests/sec per gunicorn worker count")
+_parser.add_argument("--workers", default=",".join(str(2 ** i) for i in range(_cpus.bit_length()) if 2 ** i <= _cpus))
+_parser.add_argument("--seconds", type=float, default=10)
+_parser.add_argument("--client-processes", type=int, default=max(1, _cpus // 2))
+_parser.add_argument("--threads-per-process", type=int, default=32)
+_parser.add_argument("--database-url", default=None)
+ARGS = _parser.parse_args(sys.argv[1:])
+
+use_scratch_database(ARGS.database_url)
+
+from sqlalchemy import insert  # noqa: E402
+
+import main  # noqa: E402,F401
+from database.db import SessionLocal  # noqa: E402
+from app.models.company import Company  # noqa: E402
+from app.models.lead import Lead  # noqa: E402
+from migrations.bootstrap import run_bootstrap  # noqa: E402
+from seeders.user import run_seeder  # noqa: E402
+
+EMAIL = "agent1@example.com"
+PASSWORD = "password123"
+
+
+def seed_leads(count: int = 2000):
+    db = SessionLocal()
+    try:
+        company = Company(name="Scaling Bench", symbol="SCL")
+        db.add(company)
+        db.flush()
+        db.execute(insert(Lead), [
+            {"full_name": f"Lead {i}", "company_id": company.id, "role": "CFO", "phone": f"555-{i:06d}"}
+            for i in range(count)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def client_process(url: str, token: str, threads: int, seconds: float, results):
+    stop = threading.Event()
+    latency_ms = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def loop():
+        while not stop.is_set():
+            start = time.perf_counter()
+            status, _ = http("GET", url, token=token)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                if status == 200:
+                    latency_ms.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    pool = [threading.Thread(target=loop) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in pool:
+        t.join()
+    results.put((latency_ms, errors[0]))
+
+
+def load(base_url: str, seconds: float) -> dict:
+    status, body = http("POST", f"{base_url}/api/login", {"email": EMAIL, "password": PASSWORD})
+    token = body["access_token"]
+    url = f"{base_url}/api/leads?limit=20"
+
+    results = multiprocessing.Queue()
+    clients = [
+        multiprocessing.Process(target=client_process, args=(url, token, ARGS.threads_per_process, seconds, results))
+        for _ in range(ARGS.client_processes)
+    ]
+    for p in clients:
+        p.start()
+
+    latency_ms, errors = [], 0
+    for _ in clients:
+        samples, failed = results.get()
+        latency_ms.extend(samples)
+        errors += failed
+    for p in clients:
+        p.join()
+
+    return {
+        "requests_per_second": round(len(latency_ms) / seconds, 1),
+        "errors": errors,
+        "latency_ms": percentiles(latency_ms),
+    }
+
+
+def run_benchmark():
+    run_bootstrap()
+    run_seeder()
+    seed_leads()
+
+    report = {"cpus": _cpus, "runs": {}}
+    for workers in [int(w) for w in ARGS.workers.split(",")]:
+        with serve_in_subprocess("main:app", {"WEB_WORKERS": str(workers)}, server="gunicorn") as base_url:
+            report["runs"][workers] = load(base_url, ARGS.seconds)
+
+    baseline = report["runs"][min(report["runs"])]["requests_per_second"]
+    for workers, run in report["runs"].items():
+        run["speedup"] = round(run["requests_per_second"] / baseline, 2) if baseline else None
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    run_benchmark()
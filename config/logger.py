@@ -1,12 +1,72 @@
+import atexit
 import logging
+import logging.handlers
+import queue
+
+from config.settings import settings
+
+# Callers only enqueue records; a background listener thread does the
+# file / console I/O, so logging never blocks a request on disk.
+queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+queue_handler.setFormatter(logging.Formatter("%(message)s"))  # layout is applied by the listener
+
+
+# Loggers whose messages are already JSON lines
+JSON_LOGGERS = ("access", "sql_profile")
+
+
+class LogFormatter(logging.Formatter):
+    """
+    Plain text for application logs; access log and SQL profile records
+    are already JSON lines and pass through unchanged.
+    """
+
+    def format(self, record):
+        if record.name in JSON_LOGGERS:
+            return record.getMessage()
+        return super().format(record)
+
+
+def _output_handlers():
+    handlers = [logging.StreamHandler()]
+    if settings.LOG_FILE:
+        handlers.append(logging.FileHandler(settings.LOG_FILE))
+
+    formatter = LogFormatter("%(asctime)s - %(levelname)s - %(message)s")
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+_listener = None
+
+
+def start_log_listener():
+    """
+    Start the thread that writes queued records. Called again in each
+    gunicorn worker after fork, since threads do not survive the fork; the
+    worker gets a fresh queue too, in case the fork caught its lock held.
+    """
+    global _listener
+    queue_handler.queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(queue_handler.queue, *_output_handlers())
+    _listener.start()
+
+
+def stop_log_listener():
+    # Flushes whatever is still queued
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
 
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("app.log"),
-        logging.StreamHandler()
-    ]
+    handlers=[queue_handler],
 )
+start_log_listener()
+atexit.register(stop_log_listener)
 
 logger = logging.getLogger(__name__)
+
+# One JSON line per request, see app.middlewares.logging_middleware
+access_logger = logging.getLogger("access")
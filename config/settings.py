@@ -10,4 +10,146 @@ class Settings:
     ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
     REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS"))
 
+    # Connection pool; size + overflow should cover the 40 AnyIO worker threads
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+    # Read replicas: comma-separated URLs; strategy is round_robin or least_connections.
+    # A user's reads stay on the primary for DB_READ_YOUR_WRITES_SECONDS after they write.
+    DATABASE_REPLICA_URLS = [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+    DB_REPLICA_STRATEGY = os.getenv("DB_REPLICA_STRATEGY", "round_robin")
+    DB_READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+
+    # Async request path for lead/company/comment routes (needs asyncpg or aiosqlite).
+    # ASYNC_DATABASE_URL defaults to DATABASE_URL with the async driver swapped in.
+    DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+    # Production server (gunicorn.conf.py); 0 workers means one per CPU
+    WEB_WORKERS = int(os.getenv("WEB_WORKERS", "0"))
+    WEB_MAX_REQUESTS = int(os.getenv("WEB_MAX_REQUESTS", "10000"))
+    WEB_MAX_REQUESTS_JITTER = int(os.getenv("WEB_MAX_REQUESTS_JITTER", "1000"))
+    WEB_GRACEFUL_TIMEOUT_SECONDS = int(os.getenv("WEB_GRACEFUL_TIMEOUT_SECONDS", "30"))
+
+    # Verified access-token cache (0 disables)
+    PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+    PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+
+    # Expired session cleanup (interval 0 disables the in-process sweeper, which
+    # otherwise also runs once at startup). Partitions always reach past the
+    # longest refresh-token lifetime, whatever TOKEN_PARTITION_MONTHS_AHEAD says.
+    TOKEN_SWEEP_INTERVAL_SECONDS = int(os.getenv("TOKEN_SWEEP_INTERVAL_SECONDS", "3600"))
+    TOKEN_SWEEP_BATCH_SIZE = int(os.getenv("TOKEN_SWEEP_BATCH_SIZE", "1000"))
+    TOKEN_PARTITION_MONTHS_AHEAD = max(
+        int(os.getenv("TOKEN_PARTITION_MONTHS_AHEAD", "2")), REFRESH_TOKEN_EXPIRE_DAYS // 28 + 1
+    )
+
+    # Call / email / SMS log retention (jobs.rotate_touch_logs, interval 0 disables
+    # the in-process job). Months older than LOG_RETENTION_MONTHS (0, the
+    # default, keeps all) are archived to gzipped CSV in LOG_ARCHIVE_DIR and
+    # dropped, or only detached when unset; rows of unpartitioned tables (and
+    # of default partitions) are deleted only after archiving, never without
+    # LOG_ARCHIVE_DIR.
+    # GET /lead/{id}/history covers the last LOG_HISTORY_DAYS unless told otherwise.
+    LOG_ROTATE_INTERVAL_SECONDS = int(os.getenv("LOG_ROTATE_INTERVAL_SECONDS", "86400"))
+    LOG_PARTITION_MONTHS_AHEAD = int(os.getenv("LOG_PARTITION_MONTHS_AHEAD", "3"))
+    LOG_RETENTION_MONTHS = int(os.getenv("LOG_RETENTION_MONTHS", "0"))
+    LOG_ARCHIVE_DIR = os.getenv("LOG_ARCHIVE_DIR", "")
+    LOG_HISTORY_DAYS = int(os.getenv("LOG_HISTORY_DAYS", "90"))
+
+    # Nightly days_hot / days_ignore refresh (python -m jobs.tracking_days): rows
+    # per batch, and the lead type labels a lead must currently have for its
+    # date_became_hot / date_became_ignore to count
+    TRACKING_DAYS_BATCH_SIZE = int(os.getenv("TRACKING_DAYS_BATCH_SIZE", "10000"))
+    TRACKING_HOT_LEAD_TYPE = os.getenv("TRACKING_HOT_LEAD_TYPE", "Hot")
+    TRACKING_IGNORE_LEAD_TYPE = os.getenv("TRACKING_IGNORE_LEAD_TYPE", "Ignore")
+
+    # Daily analytics rollups behind GET /analytics/* (jobs.analytics_rollups,
+    # interval 0 disables the in-process job). Call / email stats recount the
+    # days of new log rows plus the last ANALYTICS_LOG_LOOKBACK_DAYS; hot
+    # conversions recount the last ANALYTICS_HOT_LOOKBACK_DAYS. Queries span
+    # at most ANALYTICS_MAX_DAYS.
+    ANALYTICS_ROLLUP_INTERVAL_SECONDS = float(os.getenv("ANALYTICS_ROLLUP_INTERVAL_SECONDS", "60"))
+    ANALYTICS_LOG_LOOKBACK_DAYS = int(os.getenv("ANALYTICS_LOG_LOOKBACK_DAYS", "1"))
+    ANALYTICS_HOT_LOOKBACK_DAYS = int(os.getenv("ANALYTICS_HOT_LOOKBACK_DAYS", "7"))
+    ANALYTICS_MAX_DAYS = int(os.getenv("ANALYTICS_MAX_DAYS", "366"))
+
+    # Dedicated password hashing pool (excess logins get 503)
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    PASSWORD_HASH_QUEUE_DEPTH = int(os.getenv("PASSWORD_HASH_QUEUE_DEPTH", "16"))
+    PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "10"))
+
+    # Hashing cost: profile is one of utils.password_hasher.HASH_PROFILES
+    PASSWORD_HASH_PROFILE = os.getenv("PASSWORD_HASH_PROFILE", "default")
+    PASSWORD_HASH_SCHEMES = [s for s in os.getenv("PASSWORD_HASH_SCHEMES", "").split(",") if s]
+    PASSWORD_BCRYPT_ROUNDS = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", "0")) or None
+
+    # Lead types / contact types / timezones served from memory
+    REFERENCE_CACHE_TTL_SECONDS = int(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "300"))
+    REFERENCE_DATA_VERSION = os.getenv("REFERENCE_DATA_VERSION", "1")
+
+    # Logging: LOG_FILE empty logs to the console only. Access log lines are
+    # sampled per route template ("/api/me=0.05,/api/leads=0.2", default
+    # ACCESS_LOG_SAMPLE_RATE); errors and requests over ACCESS_LOG_SLOW_MS always log.
+    LOG_FILE = os.getenv("LOG_FILE", "app.log")
+    ACCESS_LOG_ENABLED = os.getenv("ACCESS_LOG_ENABLED", "true").lower() in ("1", "true", "yes")
+    ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1"))
+    ACCESS_LOG_ROUTE_SAMPLE_RATES = {
+        route.strip(): float(rate)
+        for route, rate in (
+            pair.rsplit("=", 1) for pair in os.getenv("ACCESS_LOG_ROUTE_SAMPLE_RATES", "").split(",") if pair.strip()
+        )
+    }
+    ACCESS_LOG_SLOW_MS = float(os.getenv("ACCESS_LOG_SLOW_MS", "1000"))
+
+    # /metrics: with several workers, each shares its numbers through files in
+    # METRICS_DIR (gunicorn.conf.py sets one up). METRICS_TOKEN, if set, must be
+    # sent as a bearer token by the scraper.
+    METRICS_DIR = os.getenv("METRICS_DIR", "")
+    METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+    # SQL profiling: off, header (requests sending "X-SQL-Profile: 1") or all.
+    # A profiled request logs every statement, flags shapes repeated
+    # SQL_PROFILE_REPEAT_THRESHOLD times (likely N+1) and EXPLAINs slow ones.
+    SQL_PROFILE_MODE = os.getenv("SQL_PROFILE_MODE", "off")
+    SQL_PROFILE_REPEAT_THRESHOLD = int(os.getenv("SQL_PROFILE_REPEAT_THRESHOLD", "3"))
+    SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "200"))
+
+    # Call queue (POST /call-queue/next). Leads are handed out while their local
+    # time is inside the calling window; CALL_QUEUE_TIMEZONES maps the labels
+    # used in leads.timezone to IANA zones.
+    CALL_QUEUE_LEASE_SECONDS = int(os.getenv("CALL_QUEUE_LEASE_SECONDS", "900"))
+    CALL_QUEUE_BATCH_SIZE = int(os.getenv("CALL_QUEUE_BATCH_SIZE", "500"))
+    CALL_QUEUE_REFRESH_SECONDS = float(os.getenv("CALL_QUEUE_REFRESH_SECONDS", "30"))
+    CALL_QUEUE_WINDOW_START_HOUR = int(os.getenv("CALL_QUEUE_WINDOW_START_HOUR", "9"))
+    CALL_QUEUE_WINDOW_END_HOUR = int(os.getenv("CALL_QUEUE_WINDOW_END_HOUR", "17"))
+    CALL_QUEUE_TIMEZONES = dict(
+        pair.split("=", 1) for pair in os.getenv(
+            "CALL_QUEUE_TIMEZONES",
+            "EST=America/New_York,CST=America/Chicago,MST=America/Denver,PST=America/Los_Angeles",
+        ).split(",") if pair.strip()
+    )
+    CALL_QUEUE_LEAD_TYPE_ORDER = [t.strip() for t in os.getenv("CALL_QUEUE_LEAD_TYPE_ORDER", "Hot,General").split(",") if t.strip()]
+
+    # Call / email / SMS event ingestion (POST /events). Rollups into
+    # lead_team_tracking and leads are queued in touch_rollup_queue with the
+    # logs, coalesced per lead and applied every EVENT_ROLLUP_INTERVAL_SECONDS
+    # (0 applies them with each batch), EVENT_ROLLUP_MAX_PENDING per
+    # transaction. A lead whose rollup fails EVENT_ROLLUP_MAX_ATTEMPTS times
+    # has its queue rows set aside (dead_at). EVENT_COUNTER_RESULT_CODES maps
+    # call result codes to Lead counter columns.
+    EVENT_BATCH_MAX_SIZE = int(os.getenv("EVENT_BATCH_MAX_SIZE", "5000"))
+    EVENT_ROLLUP_INTERVAL_SECONDS = float(os.getenv("EVENT_ROLLUP_INTERVAL_SECONDS", "30"))
+    EVENT_ROLLUP_MAX_PENDING = int(os.getenv("EVENT_ROLLUP_MAX_PENDING", "10000"))
+    EVENT_ROLLUP_MAX_ATTEMPTS = int(os.getenv("EVENT_ROLLUP_MAX_ATTEMPTS", "5"))
+    EVENT_COUNTER_RESULT_CODES = dict(
+        pair.split("=", 1) for pair in os.getenv(
+            "EVENT_COUNTER_RESULT_CODES", "B=counter_b,F=counter_f"
+        ).split(",") if pair.strip()
+    )
+
 settings = Settings()
@@ -1,7 +1,73 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from config.settings import settings
+from database.pool import TimedAsyncAdaptedQueuePool, TimedQueuePool
+from database.query_stats import track_queries
+from database.replicas import ReplicaSet, RoutingSession
+
+# Async driver used for each backend when ASYNC_DATABASE_URL is not set
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def engine_options(url: str, poolclass=TimedQueuePool) -> dict:
+    """
+    Pool settings for create_engine. In-memory SQLite keeps SQLAlchemy's
+    default pool, since each new connection would be a different database.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver known for {backend}; set ASYNC_DATABASE_URL")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
 
-engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Request sessions may read from replicas; scripts, jobs and caches keep
+# using SessionLocal so their read-then-write logic always sees the primary.
+# With no replicas configured RoutingSession sends everything to `engine`.
+replica_engines = [create_engine(url, **engine_options(url)) for url in settings.DATABASE_REPLICA_URLS]
+replica_set = ReplicaSet(replica_engines, settings.DB_REPLICA_STRATEGY) if replica_engines else None
+
+RoutingSessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    info={"replicas": replica_set} if replica_set else None,
+)
 Base = declarative_base()
+
+# Only built in async mode, so the async driver stays an optional dependency
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    _async_url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(_async_url, **engine_options(_async_url, TimedAsyncAdaptedQueuePool))
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Per-request query counts for the access log
+for _engine in [engine, *replica_engines, *([async_engine.sync_engine] if async_engine else [])]:
+    track_queries(_engine)
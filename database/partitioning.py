@@ -0,0 +1,185 @@
+"""
+Monthly RANGE partition helpers for PostgreSQL.
+
+Partitions are named `<table>_pYYYYMM` and cover [first of month, first of
+next month); `<table>_default` catches rows outside every month so inserts
+never fail for lack of a partition. On other dialects `is_partitioned` is
+always False so callers can fall back to row-by-row maintenance.
+"""
+import re
+from datetime import date, datetime
+from typing import List, Tuple
+
+from sqlalchemy import and_, text
+from sqlalchemy.engine import Connection
+
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year:04d}{month.month:02d}"
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+
+    return bool(conn.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = :table AND pg_table_is_visible(c.oid)"
+        ),
+        {"table": table},
+    ).scalar())
+
+
+def list_partitions(conn: Connection, table: str) -> List[Tuple[str, date]]:
+    """
+    Returns (partition name, month) for every monthly partition, oldest first.
+    """
+    rows = conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = :table AND pg_table_is_visible(parent.oid)"
+        ),
+        {"table": table},
+    ).scalars()
+
+    pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})(\d{{2}})$")
+    partitions = []
+    for name in rows:
+        match = pattern.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def _has_table(conn: Connection, name: str) -> bool:
+    return conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}).scalar()
+
+
+def _partition_key(conn: Connection, table: str) -> str:
+    return conn.execute(
+        text(
+            "SELECT a.attname FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid "
+            "JOIN pg_attribute a ON a.attrelid = pt.partrelid AND a.attnum = pt.partattrs[0] "
+            "WHERE c.relname = :table AND pg_table_is_visible(c.oid)"
+        ),
+        {"table": table},
+    ).scalar_one()
+
+
+def ensure_default_partition(conn: Connection, table: str) -> bool:
+    """
+    Create the catch-all partition unless it exists. Returns True if created.
+    """
+    name = default_partition_name(table)
+    if _has_table(conn, name):
+        return False
+
+    conn.execute(text(f"CREATE TABLE {name} PARTITION OF {table} DEFAULT"))
+    return True
+
+
+def _create_month_partition(conn: Connection, table: str, month: date):
+    name = partition_name(table, month)
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    bounds = f"FOR VALUES FROM ('{start}') TO ('{end}')"
+
+    default = default_partition_name(table)
+    if _has_table(conn, default):
+        key = _partition_key(conn, table)
+        in_month = f"{key} >= '{start}' AND {key} < '{end}'"
+        if conn.execute(text(f"SELECT 1 FROM {default} WHERE {in_month} LIMIT 1")).scalar():
+            # PostgreSQL refuses a partition whose range already has rows in
+            # the default one: move them into the new month first
+            conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+            conn.execute(text(f"CREATE TABLE {name} PARTITION OF {table} {bounds}"))
+            conn.execute(text(f"INSERT INTO {name} SELECT * FROM {default} WHERE {in_month}"))
+            conn.execute(text(f"DELETE FROM {default} WHERE {in_month}"))
+            conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+            return
+
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} {bounds}"))
+
+
+def ensure_monthly_partitions(conn: Connection, table: str, start, months_ahead: int) -> List[str]:
+    """
+    Create missing partitions from the month of `start` through `months_ahead`
+    months after the current month, plus the default partition. Returns the
+    names that were created.
+    """
+    existing = {name for name, _ in list_partitions(conn, table)}
+    last = add_months(month_start(datetime.utcnow()), months_ahead)
+
+    created = []
+    month = month_start(start)
+    while month <= last:
+        name = partition_name(table, month)
+        if name not in existing:
+            _create_month_partition(conn, table, month)
+            created.append(name)
+        month = add_months(month, 1)
+
+    if ensure_default_partition(conn, table):
+        created.append(default_partition_name(table))
+
+    return created
+
+
+def partitions_before(conn: Connection, table: str, cutoff) -> List[Tuple[str, date]]:
+    """
+    Partitions whose whole range ends on or before `cutoff`.
+    """
+    cutoff_day = cutoff.date() if isinstance(cutoff, datetime) else cutoff
+    return [
+        (name, month)
+        for name, month in list_partitions(conn, table)
+        if add_months(month, 1) <= cutoff_day
+    ]
+
+
+def detach_partition(conn: Connection, table: str, name: str):
+    # The partition stays as a standalone table, outside every query on `table`
+    conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+
+
+def attach_partition(conn: Connection, table: str, name: str, month: date):
+    # Takes a lighter lock than DETACH: inserts and reads on `table` go on
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')"))
+
+
+def drop_partitions_before(conn: Connection, table: str, cutoff) -> List[str]:
+    dropped = []
+    for name, _ in partitions_before(conn, table, cutoff):
+        detach_partition(conn, table, name)
+        conn.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+
+    return dropped
+
+
+def in_range(column, start, end):
+    """
+    `start <= column < end` on the bare partition key. PostgreSQL can only
+    skip partitions when the key is compared as is; wrapping it in a
+    function (date(), extract(), ...) scans every partition.
+    """
+    return and_(column >= start, column < end)
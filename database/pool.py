@@ -0,0 +1,121 @@
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (seconds) of the checkout wait histogram
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# A checkout slower than this counts as a stall
+STALL_SECONDS = 0.01
+
+
+# ============================================================
+# Checkout telemetry
+# ============================================================
+
+class PoolMetrics:
+    """
+    Process-wide counters for connection checkouts. Kept outside the pool
+    object so they survive engine.dispose(), which replaces the pool.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.stalls = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.wait_buckets = [0] * len(WAIT_BUCKETS)
+            self.peak_checked_out = 0
+            self.peak_overflow = 0
+
+    def record_checkout(self, waited: float, checked_out: int, overflow: int):
+        with self._lock:
+            self.checkouts += 1
+            self._record_wait(waited)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def record_timeout(self, waited: float):
+        with self._lock:
+            self.timeouts += 1
+            self._record_wait(waited)
+
+    def _record_wait(self, waited: float):
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        if waited >= STALL_SECONDS:
+            self.stalls += 1
+        for i, bound in enumerate(WAIT_BUCKETS):
+            if waited <= bound:
+                self.wait_buckets[i] += 1
+                break
+
+    def snapshot(self, pool: Optional[QueuePool] = None) -> dict:
+        """
+        Counters plus, when `pool` is a QueuePool, its live occupancy.
+        """
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+            data = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "stalls": self.stalls,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_avg": round(self.wait_seconds_total / waits, 6) if waits else 0.0,
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "wait_buckets": {str(bound): count for bound, count in zip(WAIT_BUCKETS, self.wait_buckets)},
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": self.peak_overflow,
+            }
+
+        if isinstance(pool, QueuePool):
+            data.update({
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            })
+        return data
+
+
+pool_metrics = PoolMetrics()
+
+
+# ============================================================
+# QueuePools that time checkouts
+# ============================================================
+
+class _TimedCheckout:
+    """
+    Records how long each checkout waited, including the time to open a new
+    connection when the pool grows.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_timeout(time.perf_counter() - started)
+            raise
+
+        pool_metrics.record_checkout(time.perf_counter() - started, self.checkedout(), max(self.overflow(), 0))
+        return connection
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
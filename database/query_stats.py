@@ -0,0 +1,96 @@
+"""
+Per-request database statistics.
+
+The logging middleware opens a RequestStats for each request and stores it
+in a context variable. Sync dependencies and endpoints run in AnyIO worker
+threads with a copy of that context, so they see the same object and the
+engine hooks below can add to it from any thread.
+
+Statements slower than SQL_SLOW_QUERY_MS are logged. A profiled request
+(see database.sql_profiler) also keeps every statement it ran.
+"""
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config.logger import logger
+from config.settings import settings
+
+
+@dataclass
+class ExecutedStatement:
+    sql: str
+    parameters: Any
+    seconds: float
+    engine: Engine
+    executemany: bool
+
+
+@dataclass
+class RequestStats:
+    query_count: int = 0
+    query_seconds: float = 0.0
+    user_id: Optional[int] = None
+    # Only collected while profiling
+    statements: Optional[List[ExecutedStatement]] = None
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def start_request(profile: bool = False) -> RequestStats:
+    stats = RequestStats(statements=[] if profile else None)
+    _current.set(stats)
+    return stats
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def set_user_id(user_id: int):
+    stats = _current.get()
+    if stats is not None:
+        stats.user_id = user_id
+
+
+# ============================================================
+# Engine hooks
+# ============================================================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.query_count += 1
+        stats.query_seconds += elapsed
+        if stats.statements is not None:
+            stats.statements.append(ExecutedStatement(statement, parameters, elapsed, conn.engine, executemany))
+            return  # the profile report logs slow statements with their plan
+
+    if settings.SQL_SLOW_QUERY_MS and elapsed * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, " ".join(statement.split()))
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute
+    if context.connection is not None and context.connection.info.get("query_started"):
+        context.connection.info["query_started"].pop()
+
+
+def track_queries(engine: Engine):
+    """
+    Count statements and their time against the current request. Pass the
+    sync engine (`async_engine.sync_engine` for the async one).
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,139 @@
+import itertools
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+
+REPLICA_STRATEGIES = ("round_robin", "least_connections")
+
+# Prune expired read-your-writes entries once the map grows past this
+RECENT_WRITERS_PRUNE_SIZE = 10000
+
+
+# ============================================================
+# Replica selection
+# ============================================================
+
+class ReplicaSet:
+    def __init__(self, engines: List[Engine], strategy: str = "round_robin"):
+        if strategy not in REPLICA_STRATEGIES:
+            raise ValueError(f"Unknown replica strategy {strategy!r}; use one of {', '.join(REPLICA_STRATEGIES)}")
+        self.engines = list(engines)
+        self.strategy = strategy
+        self._counter = itertools.count()
+
+    def choose(self) -> Engine:
+        if self.strategy == "least_connections":
+            return min(self.engines, key=_checked_out)
+        return self.engines[next(self._counter) % len(self.engines)]
+
+
+def _checked_out(engine: Engine) -> int:
+    checkedout = getattr(engine.pool, "checkedout", None)
+    return checkedout() if checkedout else 0
+
+
+# ============================================================
+# Read-your-writes window
+# ============================================================
+
+class RecentWriters:
+    """
+    Users who committed a write in the last `window` seconds; their reads go
+    to the primary so they never see a replica that is behind their own
+    change. Per process, so with several workers the window only holds for
+    requests that land on the same worker.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self._until: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, user_id: int):
+        now = time.monotonic()
+        with self._lock:
+            self._until[user_id] = now + self.window
+            if len(self._until) > RECENT_WRITERS_PRUNE_SIZE:
+                self._until = {u: t for u, t in self._until.items() if t > now}
+
+    def is_recent(self, user_id: int) -> bool:
+        until = self._until.get(user_id)
+        return until is not None and until > time.monotonic()
+
+
+recent_writers = RecentWriters(settings.DB_READ_YOUR_WRITES_SECONDS)
+
+
+# ============================================================
+# Session that routes reads to replicas
+# ============================================================
+
+class RoutingSession(Session):
+    """
+    Sends plain SELECTs to a replica and everything else to the primary
+    (the session's bind). Replicas come from `info["replicas"]`, set by the
+    sessionmaker; without them this behaves like a normal Session.
+
+    Once a session has written, it stays on the primary, as do sessions of a
+    user inside the read-your-writes window (`info["user_id"]`, set by
+    get_current_user). A session keeps the same replica for all its reads.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replicas = self.info.get("replicas")
+        if not replicas or self._flushing:
+            return super().get_bind(mapper, clause=clause, **kw)
+
+        if not _is_plain_select(clause):
+            if clause is not None:
+                self.info["wrote"] = True
+            return super().get_bind(mapper, clause=clause, **kw)
+
+        user_id = self.info.get("user_id")
+        if (
+            self.info.get("wrote")
+            or self.info.get("use_primary")
+            or (user_id is not None and recent_writers.is_recent(user_id))
+        ):
+            return super().get_bind(mapper, clause=clause, **kw)
+
+        replica = self.info.get("replica")
+        if replica is None:
+            replica = self.info["replica"] = replicas.choose()
+        return replica
+
+
+def _is_plain_select(clause) -> bool:
+    return bool(getattr(clause, "is_select", False)) and getattr(clause, "_for_update_arg", None) is None
+
+
+def use_primary(session: Session) -> bool:
+    """
+    Route the rest of this session's reads to the primary, e.g. to retry a
+    lookup a lagging replica could not answer. Returns False when the reads
+    already went to the primary, so a retry would be pointless.
+    """
+    if not session.info.get("replicas") or session.info.get("use_primary") or session.info.get("wrote"):
+        return False
+    session.info["use_primary"] = True
+    return True
+
+
+def _mark_wrote(session: Session, flush_context):
+    session.info["wrote"] = True
+
+
+def _remember_writer(session: Session):
+    user_id = session.info.get("user_id")
+    if session.info.get("wrote") and user_id is not None:
+        recent_writers.mark(user_id)
+
+
+event.listen(RoutingSession, "after_flush", _mark_wrote)
+event.listen(RoutingSession, "after_commit", _remember_writer)
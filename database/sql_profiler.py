@@ -0,0 +1,158 @@
+"""
+Per-request SQL profiling and a query-count guard for tests.
+
+With SQL_PROFILE_MODE=header a request sending `X-SQL-Profile: 1` is
+profiled; with SQL_PROFILE_MODE=all every request is. The report is logged
+as one JSON line on the "sql_profile" logger and summed up in the
+X-SQL-Profile response header.
+"""
+import contextlib
+import json
+import logging
+import re
+from collections import defaultdict
+from typing import Iterable, List, Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config.settings import settings
+from database.db import async_engine, engine as primary_engine, replica_engines
+from database.query_stats import ExecutedStatement, RequestStats
+
+PROFILE_HEADER = "X-SQL-Profile"
+
+profile_logger = logging.getLogger("sql_profile")
+
+_IN_LIST = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)\s*,)+\s*(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+def profiling_requested(request: Request) -> bool:
+    if settings.SQL_PROFILE_MODE == "all":
+        return True
+    return settings.SQL_PROFILE_MODE == "header" and request.headers.get(PROFILE_HEADER) == "1"
+
+
+def statement_shape(sql: str) -> str:
+    """
+    Collapse whitespace, literals and expanded IN lists so the same query
+    issued for different rows has the same shape.
+    """
+    shape = " ".join(sql.split())
+    shape = _STRING.sub("?", shape)
+    shape = _NUMBER.sub("N", shape)
+    return _IN_LIST.sub("(...)", shape)
+
+
+def repeated_shapes(statements: Iterable[ExecutedStatement], threshold: int) -> List[dict]:
+    by_shape = defaultdict(list)
+    for statement in statements:
+        by_shape[statement_shape(statement.sql)].append(statement.seconds)
+
+    return sorted(
+        (
+            {"sql": shape, "count": len(times), "total_ms": round(sum(times) * 1000, 2)}
+            for shape, times in by_shape.items()
+            if len(times) >= threshold
+        ),
+        key=lambda entry: -entry["count"],
+    )
+
+
+def explain(statement: ExecutedStatement) -> Optional[List[str]]:
+    """
+    The plan of a statement on the engine that ran it. Skipped for
+    executemany batches and async drivers (their paramstyle differs).
+    """
+    if statement.executemany or statement.engine.dialect.is_async:
+        return None
+
+    prefix = "EXPLAIN QUERY PLAN" if statement.engine.dialect.name == "sqlite" else "EXPLAIN"
+    try:
+        with statement.engine.connect() as conn:
+            rows = conn.exec_driver_sql(f"{prefix} {statement.sql}", statement.parameters).all()
+    except Exception as e:
+        return [f"EXPLAIN failed: {e}"]
+    return [" ".join(str(value) for value in row) for row in rows]
+
+
+def profile_report(stats: RequestStats) -> dict:
+    return {
+        "queries": stats.query_count,
+        "total_ms": round(stats.query_seconds * 1000, 2),
+        "repeated": repeated_shapes(stats.statements, settings.SQL_PROFILE_REPEAT_THRESHOLD),
+        "statements": [
+            {"sql": " ".join(s.sql.split()), "ms": round(s.seconds * 1000, 2)} for s in stats.statements
+        ],
+    }
+
+
+def summary_header(report: dict) -> str:
+    return f"queries={report['queries']}; total_ms={report['total_ms']}; repeated={len(report['repeated'])}"
+
+
+def log_profile(method: str, route: str, report: dict, stats: RequestStats):
+    """
+    Log the report; statements over SQL_SLOW_QUERY_MS get their plan.
+    Runs EXPLAIN, so call it from a worker thread.
+    """
+    slow = [
+        s for s in stats.statements
+        if settings.SQL_SLOW_QUERY_MS and s.seconds * 1000 >= settings.SQL_SLOW_QUERY_MS
+    ]
+    report = {
+        "method": method,
+        "route": route,
+        **report,
+        "slow": [
+            {"sql": " ".join(s.sql.split()), "ms": round(s.seconds * 1000, 2), "plan": explain(s)}
+            for s in slow
+        ],
+    }
+    profile_logger.info(json.dumps(report))
+
+
+# ============================================================
+# Test helper
+# ============================================================
+
+class QueryCountExceeded(AssertionError):
+    pass
+
+
+@contextlib.contextmanager
+def assert_max_queries(max_queries: int, engine: Optional[Engine] = None):
+    """
+    Fail when the block runs more than `max_queries` statements on `engine`
+    (default: the primary, every replica and the async engine together), e.g.
+
+        with assert_max_queries(3):
+            client.get("/api/companies", headers=auth)
+
+    Counts on the engines rather than the request, so it also works with
+    TestClient, which serves requests on another thread.
+    """
+    engines = [engine] if engine else _all_engines()
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(" ".join(statement.split()))
+
+    for counted in engines:
+        event.listen(counted, "after_cursor_execute", record)
+    try:
+        yield executed
+    finally:
+        for counted in engines:
+            event.remove(counted, "after_cursor_execute", record)
+
+    if len(executed) > max_queries:
+        listing = "\n".join(f"  {i + 1}. {sql}" for i, sql in enumerate(executed))
+        raise QueryCountExceeded(f"Expected at most {max_queries} queries, ran {len(executed)}:\n{listing}")
+
+
+def _all_engines() -> List[Engine]:
+    return [primary_engine, *replica_engines, *([async_engine.sync_engine] if async_engine else [])]
@@ -0,0 +1,76 @@
+# gunicorn.conf.py
+#
+# Production server profile, picked up automatically by `gunicorn main:app`.
+# Runs one UvicornWorker per CPU (WEB_WORKERS overrides), imports the app
+# once in the master and forks workers from it.
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+# Workers share /metrics numbers through this directory (see utils.metrics);
+# set before config.settings is imported so every worker inherits it
+os.environ.setdefault("METRICS_DIR", os.path.join(
+    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), f"sidago-metrics-{os.getpid()}"
+))
+
+from config.settings import settings  # noqa: E402
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = settings.WEB_WORKERS or multiprocessing.cpu_count()
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import main (and its models/settings) once, before forking
+preload_app = True
+
+# Recycle workers to cap slow memory growth; jitter avoids all restarting at once
+max_requests = settings.WEB_MAX_REQUESTS
+max_requests_jitter = settings.WEB_MAX_REQUESTS_JITTER
+
+# SIGTERM: stop accepting, let in-flight requests finish for up to this long
+graceful_timeout = settings.WEB_GRACEFUL_TIMEOUT_SECONDS
+timeout = 60
+keepalive = 5
+
+# Worker heartbeat files on tmpfs (a disk-backed /tmp can stall workers in containers)
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+accesslog = None
+errorlog = "-"
+
+
+def _database_engines():
+    from database.db import async_engine, engine, replica_engines
+
+    engines = [engine, *replica_engines]
+    if async_engine is not None:
+        engines.append(async_engine.sync_engine)
+    return engines
+
+
+def on_starting(server):
+    # Start every deployment's counters from zero
+    shutil.rmtree(settings.METRICS_DIR, ignore_errors=True)
+
+
+def on_exit(server):
+    shutil.rmtree(settings.METRICS_DIR, ignore_errors=True)
+
+
+def when_ready(server):
+    # Preloading runs no DDL; close anything the master connected regardless
+    for engine in _database_engines():
+        engine.dispose()
+
+
+def post_fork(server, worker):
+    # Never reuse a connection inherited from the master; leave it open for its owner
+    for engine in _database_engines():
+        engine.dispose(close=False)
+
+    # The master's log writer thread did not survive the fork
+    from config.logger import start_log_listener
+
+    start_log_listener()
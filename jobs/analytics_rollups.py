@@ -0,0 +1,286 @@
+import argparse
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Date, cast, delete, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config.logger import logger
+from config.settings import settings
+from database.db import SessionLocal
+from database.partitioning import in_range
+from app.models.analytics import (
+    DailyCallerStats,
+    DailyCallStats,
+    DailyEmailStats,
+    DailyHotConversions,
+    DailyResultCodeStats,
+    RollupWatermark,
+)
+from app.models.crm import CallLog, EmailLog, EmailSender, LeadTeamTracking
+
+# ============================================================
+# Helpers
+# ============================================================
+
+def day_of(column, dialect: str):
+    # SQLite stores datetimes as text, where CAST(... AS DATE) yields the year
+    return func.date(column) if dialect == "sqlite" else cast(column, Date)
+
+
+def _as_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def _watermark(db: Session, name: str) -> RollupWatermark:
+    """
+    The watermark row, locked for the rest of the transaction so two
+    workers never rewrite the same rollup at once.
+    """
+    mark = db.scalars(select(RollupWatermark).where(RollupWatermark.name == name).with_for_update()).first()
+    if mark is None:
+        try:
+            with db.begin_nested():
+                db.add(RollupWatermark(name=name, last_id=0))
+        except IntegrityError:
+            pass
+        mark = db.scalars(select(RollupWatermark).where(RollupWatermark.name == name).with_for_update()).one()
+    return mark
+
+
+# ============================================================
+# Refresh: recount whole days of the logs into daily counts
+# ============================================================
+
+def _project(rows: List[dict], model, counter: str) -> List[dict]:
+    # Sum `counter` over the rows sharing the model's key (a coarser rollup)
+    keys = [column.name for column in model.__table__.primary_key.columns]
+    totals = Counter()
+    for row in rows:
+        totals[tuple(row[key] for key in keys)] += row[counter]
+    return [{**dict(zip(keys, key)), counter: total} for key, total in totals.items()]
+
+
+def _day_spans(days) -> List[Tuple[date, date]]:
+    """
+    [start, end) runs of consecutive days, cut at month boundaries so each
+    recount reads a single log partition.
+    """
+    spans = []
+    for day in sorted(days):
+        if spans and spans[-1][1] == day and day.day != 1:
+            spans[-1][1] = day + timedelta(days=1)
+        else:
+            spans.append([day, day + timedelta(days=1)])
+    return [(start, end) for start, end in spans]
+
+
+def _recount_logs(db: Session, name: str, id_column, key, aggregate, models, counter: str,
+                  lookback_days: int, today: Optional[date] = None) -> int:
+    """
+    Recount from the logs every day that can have changed and replace those
+    days in each rollup of `models`: the days of log rows with ids past the
+    previous refresh's watermark, plus the last `lookback_days`. Going back
+    one refresh catches rows whose transaction committed after a higher id
+    was already seen. `aggregate(start, end)` returns the grouped select at
+    the grain of the first model for [start, end); the others are coarser
+    and summed from it. One run of days (within a month) per transaction;
+    returns the number of log rows counted.
+    """
+    started = datetime.utcnow()
+    today = today or started.date()
+    mark = _watermark(db, name)
+    if mark.refreshed_at and mark.refreshed_at >= started:
+        # Another worker refreshed while this one waited for the lock
+        db.commit()
+        return 0
+
+    upper = db.scalar(select(func.max(id_column))) or 0
+    day = day_of(key, db.get_bind().dialect.name)
+    days = {today - timedelta(days=offset) for offset in range(lookback_days + 1)}
+    days.update(_as_date(value) for value in db.scalars(
+        select(day).where(id_column > mark.previous_id, id_column <= upper).distinct()
+    ))
+
+    counted = 0
+    for start, end in _day_spans(days):
+        mark = _watermark(db, name)
+        mark.refreshed_at = datetime.utcnow()
+        rows = [dict(row) for row in db.execute(
+            aggregate(datetime.combine(start, datetime.min.time()), datetime.combine(end, datetime.min.time()))
+        ).mappings()]
+        for row in rows:
+            row["day"] = _as_date(row["day"])
+        for model in models:
+            db.execute(delete(model).where(model.day >= start, model.day < end))
+            projected = _project(rows, model, counter)
+            if projected:
+                db.execute(insert(model), projected)
+        db.commit()
+        counted += sum(row[counter] for row in rows)
+
+    mark = _watermark(db, name)
+    mark.previous_id, mark.last_id = mark.last_id, upper
+    mark.refreshed_at = datetime.utcnow()
+    db.commit()
+    return counted
+
+
+def refresh_call_stats(db: Session, lookback_days: int, today: Optional[date] = None) -> int:
+    dialect = db.get_bind().dialect.name
+    day = day_of(CallLog.call_date, dialect).label("day")
+    caller = func.coalesce(CallLog.caller_id, 0).label("caller_id")
+    code = func.coalesce(CallLog.result_code, "").label("result_code")
+
+    def aggregate(start: datetime, end: datetime):
+        return (
+            select(day, CallLog.team_id, caller, code, func.count().label("calls"))
+            .where(in_range(CallLog.call_date, start, end))
+            .group_by(day, CallLog.team_id, caller, code)
+        )
+
+    return _recount_logs(db, "call_stats", CallLog.call_log_id, CallLog.call_date, aggregate,
+                         (DailyCallStats, DailyCallerStats, DailyResultCodeStats), "calls", lookback_days, today)
+
+
+def refresh_email_stats(db: Session, lookback_days: int, today: Optional[date] = None) -> int:
+    dialect = db.get_bind().dialect.name
+    day = day_of(EmailLog.sent_at, dialect).label("day")
+    status = func.coalesce(EmailLog.status, "").label("status")
+
+    def aggregate(start: datetime, end: datetime):
+        return (
+            select(day, EmailSender.team_id, EmailLog.sender_id, status, func.count().label("emails"))
+            .join(EmailSender, EmailSender.sender_id == EmailLog.sender_id)
+            .where(in_range(EmailLog.sent_at, start, end))
+            .group_by(day, EmailSender.team_id, EmailLog.sender_id, status)
+        )
+
+    return _recount_logs(db, "email_stats", EmailLog.email_log_id, EmailLog.sent_at, aggregate,
+                         (DailyEmailStats,), "emails", lookback_days, today)
+
+
+def refresh_hot_conversions(db: Session, lookback_days: int, today: Optional[date] = None) -> int:
+    """
+    Hot conversions come from lead_team_tracking, which has no log ids:
+    recount the days since the last refresh, plus `lookback_days` for
+    dates set after the fact. Returns the number of days recounted.
+    """
+    today = today or datetime.utcnow().date()
+    mark = _watermark(db, "hot_conversions")
+    if mark.last_day:
+        start = mark.last_day - timedelta(days=lookback_days)
+    else:
+        start = db.scalar(select(func.min(LeadTeamTracking.date_became_hot))) or today
+
+    tracking = LeadTeamTracking
+    rows = db.execute(
+        select(tracking.date_became_hot, tracking.team_id, func.count())
+        .where(tracking.date_became_hot >= start, tracking.date_became_hot <= today)
+        .group_by(tracking.date_became_hot, tracking.team_id)
+    ).all()
+
+    db.execute(delete(DailyHotConversions).where(DailyHotConversions.day >= start, DailyHotConversions.day <= today))
+    if rows:
+        db.execute(insert(DailyHotConversions), [
+            {"day": _as_date(day), "team_id": team_id, "conversions": count} for day, team_id, count in rows
+        ])
+
+    mark.last_day = today
+    mark.refreshed_at = datetime.utcnow()
+    db.commit()
+    return (today - start).days + 1
+
+
+def refresh_analytics(
+    log_lookback_days: int = settings.ANALYTICS_LOG_LOOKBACK_DAYS,
+    hot_lookback_days: int = settings.ANALYTICS_HOT_LOOKBACK_DAYS,
+) -> dict:
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        report = {
+            "calls": refresh_call_stats(db, log_lookback_days),
+            "emails": refresh_email_stats(db, log_lookback_days),
+            "hot_days": refresh_hot_conversions(db, hot_lookback_days),
+        }
+    finally:
+        db.close()
+    return {**report, "elapsed_seconds": round(time.perf_counter() - started, 3)}
+
+
+def rebuild_analytics():
+    # Forget everything; the next refresh recounts every day of the logs
+    db = SessionLocal()
+    try:
+        for model in (DailyCallStats, DailyCallerStats, DailyResultCodeStats,
+                      DailyEmailStats, DailyHotConversions, RollupWatermark):
+            db.execute(delete(model))
+        db.commit()
+    finally:
+        db.close()
+
+
+# ============================================================
+# In-process refresher (started from main.py)
+# ============================================================
+
+class AnalyticsRollupWorker:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.interval <= 0 or self._thread:
+            return
+
+        self._thread = threading.Thread(target=self._run, name="analytics-rollups", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        # Refresh right away, then every interval: workers recycled by
+        # max_requests may never live through a whole interval
+        while not self._stop.is_set():
+            try:
+                refresh_analytics()
+            except Exception as e:
+                logger.error(f"Analytics rollup failed: {e}")
+            self._stop.wait(self.interval)
+
+
+analytics_rollups = AnalyticsRollupWorker(interval=settings.ANALYTICS_ROLLUP_INTERVAL_SECONDS)
+
+
+def run_analytics_refresh():
+    parser = argparse.ArgumentParser(description="Recount changed days of the call / email logs into the daily analytics tables")
+    parser.add_argument("--lookback-days", type=int, default=settings.ANALYTICS_LOG_LOOKBACK_DAYS,
+                        help="always recount this many days before today")
+    parser.add_argument("--rebuild", action="store_true", help="drop the aggregates and recompute them from the logs")
+    args = parser.parse_args()
+
+    try:
+        if args.rebuild:
+            rebuild_analytics()
+        report = refresh_analytics(log_lookback_days=args.lookback_days)
+        print(
+            f"✅ Analytics refreshed: {report['calls']} calls, {report['emails']} emails recounted, "
+            f"{report['hot_days']} days of hot conversions recounted in {report['elapsed_seconds']}s"
+        )
+
+    except Exception as e:
+        print("❌ Analytics refresh failed:", e)
+
+
+if __name__ == "__main__":
+    run_analytics_refresh()
@@ -0,0 +1,48 @@
+import argparse
+import json
+import os
+
+from database.db import SessionLocal
+from app.controllers.lead_import_controller import (
+    IMPORT_BATCH_SIZE,
+    IMPORT_FORMATS,
+    LeadImportController,
+)
+
+
+def run_lead_import():
+    parser = argparse.ArgumentParser(description="Bulk import leads from a CSV or NDJSON file")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, default=None, help="Defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument("--errors-out", help="Write the per-row error report to this JSON file")
+    args = parser.parse_args()
+
+    import_format = args.format or ("ndjson" if os.path.splitext(args.path)[1] in (".ndjson", ".jsonl") else "csv")
+
+    db = SessionLocal()
+    try:
+        with open(args.path, encoding="utf-8-sig") as f:
+            rows = LeadImportController.parse_rows(f.read(), import_format)
+            report = LeadImportController.import_leads(db, rows, batch_size=args.batch_size)
+
+        print(
+            f"✅ Lead import finished: {report['inserted']} inserted, {report['failed']} rejected "
+            f"in {report['elapsed_seconds']}s ({report['rows_per_second']} rows/sec)"
+        )
+        if args.errors_out:
+            with open(args.errors_out, "w") as f:
+                json.dump(report["errors"], f, indent=2)
+        else:
+            for error in report["errors"][:20]:
+                print(f"   row {error['row']}: {'; '.join(error['errors'])}")
+
+    except Exception as e:
+        print("❌ Lead import failed:", e)
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    run_lead_import()
@@ -0,0 +1,162 @@
+import argparse
+import threading
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import Session
+
+from config.logger import logger
+from config.settings import settings
+from database.db import SessionLocal
+from database.partitioning import (
+    drop_partitions_before,
+    ensure_monthly_partitions,
+    is_partitioned,
+)
+from app.models.token import UserToken
+
+# Only one worker maintains user_tokens partitions at a time (PostgreSQL advisory lock key)
+PARTITION_LOCK_KEY = 7264002
+
+
+# ============================================================
+# Purge: delete expired sessions in bounded batches
+# ============================================================
+
+def purge_expired_tokens(
+    db: Session,
+    batch_size: int = settings.TOKEN_SWEEP_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> int:
+    """
+    Delete user_tokens rows past expires_at, committing after every batch so
+    locks stay short. Returns the number of rows removed.
+    """
+    now = now or datetime.utcnow()
+    removed = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        expired_ids = (
+            select(UserToken.id)
+            .where(UserToken.expires_at < now)
+            .order_by(UserToken.id)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = db.execute(
+            delete(UserToken).where(UserToken.id.in_(expired_ids)),
+            execution_options={"synchronize_session": False},
+        )
+        db.commit()
+
+        removed += result.rowcount
+        batches += 1
+        if result.rowcount < batch_size:
+            break
+
+    return removed
+
+
+def rotate_token_partitions(db: Session, now: Optional[datetime] = None) -> dict:
+    """
+    On a partitioned user_tokens table, drop whole months that have expired
+    and pre-create upcoming ones (and the default partition). No-op on an
+    unpartitioned table or while another worker holds the lock.
+    """
+    now = now or datetime.utcnow()
+    conn = db.connection()
+    if not is_partitioned(conn, UserToken.__tablename__):
+        return {"dropped": [], "created": []}
+
+    # Every worker sweeps at startup; one of them maintaining partitions is enough
+    if not conn.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY}).scalar():
+        db.rollback()
+        return {"dropped": [], "created": []}
+
+    dropped = drop_partitions_before(conn, UserToken.__tablename__, now)
+    created = ensure_monthly_partitions(
+        conn, UserToken.__tablename__, now, settings.TOKEN_PARTITION_MONTHS_AHEAD
+    )
+    db.commit()
+
+    return {"dropped": dropped, "created": created}
+
+
+def sweep_tokens(
+    batch_size: int = settings.TOKEN_SWEEP_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+) -> dict:
+    db = SessionLocal()
+    try:
+        partitions = rotate_token_partitions(db)
+        removed = purge_expired_tokens(db, batch_size=batch_size, max_batches=max_batches)
+        return {"removed": removed, **partitions}
+    finally:
+        db.close()
+
+
+# ============================================================
+# In-process sweeper (started from main.py)
+# ============================================================
+
+class TokenSweeper:
+    def __init__(self, interval: int):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.interval <= 0 or self._thread:
+            return
+
+        self._thread = threading.Thread(target=self._run, name="token-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        # Sweep right away, then every interval: workers recycled by
+        # max_requests may never live through a whole interval
+        while not self._stop.is_set():
+            try:
+                report = sweep_tokens()
+                logger.info(
+                    "Token sweep removed %s expired rows (partitions dropped: %s)",
+                    report["removed"],
+                    len(report["dropped"]),
+                )
+            except Exception as e:
+                logger.error(f"Token sweep failed: {e}")
+            self._stop.wait(self.interval)
+
+
+token_sweeper = TokenSweeper(interval=settings.TOKEN_SWEEP_INTERVAL_SECONDS)
+
+
+def run_token_purge():
+    parser = argparse.ArgumentParser(description="Delete expired user_tokens rows")
+    parser.add_argument("--batch-size", type=int, default=settings.TOKEN_SWEEP_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args()
+
+    try:
+        report = sweep_tokens(batch_size=args.batch_size, max_batches=args.max_batches)
+        print(f"✅ Token purge removed {report['removed']} expired rows")
+        if report["dropped"]:
+            print(f"   Dropped partitions: {', '.join(report['dropped'])}")
+        if report["created"]:
+            print(f"   Created partitions: {', '.join(report['created'])}")
+
+    except Exception as e:
+        print("❌ Token purge failed:", e)
+
+
+if __name__ == "__main__":
+    run_token_purge()
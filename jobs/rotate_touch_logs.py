@@ -0,0 +1,251 @@
+import argparse
+import csv
+import gzip
+import os
+import threading
+from datetime import datetime, time
+from typing import Optional
+
+from sqlalchemy import and_, column, delete, func, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+
+from config.logger import logger
+from config.settings import settings
+from database.db import engine
+from database.partitioning import (
+    add_months,
+    attach_partition,
+    default_partition_name,
+    detach_partition,
+    ensure_monthly_partitions,
+    is_partitioned,
+    month_start,
+    partitions_before,
+)
+from app.models.crm import CallLog, EmailLog, SmsLog
+from migrations.partition_touch_logs import LOG_TABLES
+
+DELETE_BATCH_SIZE = 5000
+# Longest a partition detach waits for queries on the parent table
+DETACH_LOCK_TIMEOUT = "5s"
+# Only one worker rotates at a time (PostgreSQL advisory lock key)
+ROTATE_LOCK_KEY = 7264001
+
+_MODELS = {model.__tablename__: model for model in (CallLog, EmailLog, SmsLog)}
+
+
+# ============================================================
+# Archive: stream rows into a gzipped CSV on local disk
+# ============================================================
+
+def archive_rows(conn: Connection, query, path: str) -> int:
+    """
+    Write the rows of `query` to `path` (gzipped CSV with a header row).
+    The file only appears under its final name once complete.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    partial = f"{path}.partial"
+    written = 0
+
+    result = conn.execution_options(yield_per=DELETE_BATCH_SIZE).execute(query)
+    with gzip.open(partial, "wt", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(result.keys())
+        for rows in result.partitions():
+            writer.writerows(rows)
+            written += len(rows)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(partial, path)
+    return written
+
+
+# ============================================================
+# Rotation: partitions ahead, retention behind
+# ============================================================
+
+def rotate_partitions(conn: Connection, name: str, now: datetime, cutoff, archive_dir: str) -> dict:
+    created = ensure_monthly_partitions(conn, name, now, settings.LOG_PARTITION_MONTHS_AHEAD)
+    conn.commit()
+
+    retired = []
+    expired = partitions_before(conn, name, cutoff) if cutoff else []
+    for partition, month in expired:
+        # DETACH locks the parent against every insert and read: do it in a
+        # transaction of its own, giving up rather than queueing behind long
+        # queries, and archive the partition once it is a standalone table
+        try:
+            conn.execute(text(f"SET LOCAL lock_timeout = '{DETACH_LOCK_TIMEOUT}'"))
+            detach_partition(conn, name, partition)
+            conn.commit()
+        except OperationalError as e:
+            conn.rollback()
+            logger.warning(f"Log rotation could not detach {partition}, will retry: {e}")
+            continue
+
+        if archive_dir:
+            try:
+                archive_rows(conn, select(text("*")).select_from(table(partition)),
+                             os.path.join(archive_dir, f"{partition}.csv.gz"))
+            except Exception:
+                # Attach it back so the next rotation retries the archive
+                conn.rollback()
+                attach_partition(conn, name, partition, month)
+                conn.commit()
+                raise
+            conn.execute(text(f"DROP TABLE {partition}"))
+        retired.append(partition)
+        conn.commit()
+
+    # Backfilled or far-future rows land in the default partition; expired
+    # ones are purged from it like from an unpartitioned table
+    rows = 0
+    if cutoff:
+        default = default_partition_name(name)
+        rows = purge_rows(conn, name, cutoff, archive_dir, now, source=default)["rows"]
+
+    return {"created": created, "retired": retired, "rows": rows}
+
+
+def purge_rows(conn: Connection, name: str, cutoff, archive_dir: str, now: datetime, source: Optional[str] = None) -> dict:
+    """
+    Unpartitioned fallback: archive, then delete, rows older than `cutoff`
+    in bounded batches. `source` reads and deletes from that table (a
+    partition of `name`) instead of `name` itself. Rows are only ever
+    deleted once archived: without `archive_dir` nothing is removed.
+    """
+    model = _MODELS[name]
+    (id_name,) = (c.name for c in model.__table__.primary_key.columns)
+    target = table(source, column(id_name), column(LOG_TABLES[name])) if source else model.__table__
+    key, id_column = target.c[LOG_TABLES[name]], target.c[id_name]
+    cutoff = datetime.combine(cutoff, time.min)
+
+    # Only rows present when the archive is written get deleted
+    upper = conn.execute(select(func.max(id_column)).where(key < cutoff)).scalar()
+    if upper is None:
+        return {"created": [], "retired": [], "rows": 0}
+    if not archive_dir:
+        logger.warning(f"Log rotation keeps expired rows of {source or name}: set LOG_ARCHIVE_DIR to purge them")
+        return {"created": [], "retired": [], "rows": 0}
+
+    expired = and_(key < cutoff, id_column <= upper)
+    everything = select(text("*")).select_from(target) if source else select(target)
+    archive_rows(conn, everything.where(expired).order_by(id_column),
+                 os.path.join(archive_dir, f"{source or name}_before{cutoff:%Y%m}_{now:%Y%m%d%H%M%S}.csv.gz"))
+
+    removed = 0
+    while True:
+        batch = select(id_column).where(expired).limit(DELETE_BATCH_SIZE).scalar_subquery()
+        deleted = conn.execute(delete(target).where(id_column.in_(batch))).rowcount
+        conn.commit()
+        removed += deleted
+        if deleted < DELETE_BATCH_SIZE:
+            break
+
+    return {"created": [], "retired": [], "rows": removed}
+
+
+def rotate_touch_logs(
+    retention_months: int = settings.LOG_RETENTION_MONTHS,
+    archive_dir: str = settings.LOG_ARCHIVE_DIR,
+    now: Optional[datetime] = None,
+) -> dict:
+    """
+    For each log table: pre-create upcoming monthly partitions (and the
+    default one, so no insert fails for lack of a partition), then retire
+    months older than `retention_months` (0 keeps everything): detached, and
+    archived then dropped when `archive_dir` is set. Rows outside partitions
+    are only deleted once archived. Returns what was done per table, or {}
+    when another worker holds the rotation lock.
+    """
+    now = now or datetime.utcnow()
+    cutoff = add_months(month_start(now), -retention_months) if retention_months > 0 else None
+
+    report = {}
+    with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            if not conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": ROTATE_LOCK_KEY}).scalar():
+                return report
+        try:
+            for name in LOG_TABLES:
+                if is_partitioned(conn, name):
+                    report[name] = rotate_partitions(conn, name, now, cutoff, archive_dir)
+                elif cutoff:
+                    report[name] = purge_rows(conn, name, cutoff, archive_dir, now)
+                conn.commit()
+        finally:
+            if conn.dialect.name == "postgresql":
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ROTATE_LOCK_KEY})
+                conn.commit()
+
+    return report
+
+
+# ============================================================
+# In-process rotation (started from main.py)
+# ============================================================
+
+class TouchLogRotator:
+    def __init__(self, interval: int):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.interval <= 0 or self._thread:
+            return
+
+        self._thread = threading.Thread(target=self._run, name="touch-log-rotator", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        # Rotate right away, then every interval: workers recycled by
+        # max_requests may never live through a whole interval
+        while not self._stop.is_set():
+            try:
+                for name, done in rotate_touch_logs().items():
+                    if done["created"] or done["retired"] or done["rows"]:
+                        logger.info(
+                            "Log rotation on %s: %s partitions created, %s retired, %s rows purged",
+                            name, len(done["created"]), len(done["retired"]), done["rows"],
+                        )
+            except Exception as e:
+                logger.error(f"Log rotation failed: {e}")
+            self._stop.wait(self.interval)
+
+
+touch_log_rotator = TouchLogRotator(interval=settings.LOG_ROTATE_INTERVAL_SECONDS)
+
+
+def run_log_rotation():
+    parser = argparse.ArgumentParser(description="Create upcoming log partitions and retire old ones")
+    parser.add_argument("--retention-months", type=int, default=settings.LOG_RETENTION_MONTHS)
+    parser.add_argument("--archive-dir", default=settings.LOG_ARCHIVE_DIR)
+    args = parser.parse_args()
+
+    try:
+        report = rotate_touch_logs(retention_months=args.retention_months, archive_dir=args.archive_dir)
+        if not report:
+            print("✅ Log rotation skipped: nothing to do or another worker is rotating")
+        for name, done in report.items():
+            print(
+                f"✅ {name}: {len(done['created'])} partitions created, "
+                f"{len(done['retired'])} retired, {done['rows']} rows purged"
+            )
+            if done["retired"]:
+                print(f"   {'Archived' if args.archive_dir else 'Detached'}: {', '.join(done['retired'])}")
+
+    except Exception as e:
+        print("❌ Log rotation failed:", e)
+
+
+if __name__ == "__main__":
+    run_log_rotation()
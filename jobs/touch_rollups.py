@@ -0,0 +1,480 @@
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Date, DateTime, Integer, String, Text, bindparam, case, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from config.logger import logger
+from config.settings import settings
+from database.db import SessionLocal
+from app.models.crm import CallLog, Caller, EmailLog, LeadEmailTracking, LeadTeamTracking, SmsLog, TouchRollupQueue
+from app.models.lead import Lead
+
+LOOKUP_CHUNK = 1000
+
+
+# ============================================================
+# Pending rollups, coalesced per lead
+# ============================================================
+
+@dataclass
+class Touch:
+    """
+    Every event for one (lead, team) or (lead, sender) since the last
+    flush: the values of the latest event plus one history line per event.
+    """
+    at: datetime
+    values: dict
+    lines: List[Tuple[datetime, str]] = field(default_factory=list)
+
+    def add(self, at: datetime, values: dict, lines: Iterable[Tuple[datetime, str]]):
+        if at >= self.at:
+            self.at, self.values = at, values
+        self.lines.extend(lines)
+
+    def history(self) -> str:
+        return "".join(f"{line}\n" for _, line in sorted(self.lines, key=lambda entry: entry[0]))
+
+
+@dataclass
+class LeadTouch:
+    last_call: datetime
+    counters: Counter = field(default_factory=Counter)
+
+
+class PendingRollups:
+    def __init__(self):
+        self.calls: Dict[Tuple[int, int], Touch] = {}
+        self.sms: Dict[Tuple[int, int], Touch] = {}
+        self.emails: Dict[Tuple[int, int], Touch] = {}
+        self.leads: Dict[int, LeadTouch] = {}
+        self.events = 0
+
+    def __len__(self) -> int:
+        return len(self.calls) + len(self.sms) + len(self.emails) + len(self.leads)
+
+    @staticmethod
+    def _touch(touches: Dict[Tuple[int, int], Touch], key, at: datetime, values: dict, lines):
+        if key in touches:
+            touches[key].add(at, values, lines)
+        else:
+            touches[key] = Touch(at, values, list(lines))
+
+    def add_call(self, event):
+        line = f"{event.call_date:%Y-%m-%d %H:%M} - {event.result_code or 'call'}"
+        values = {"result_id": event.result_id, "result_code": event.result_code, "caller_id": event.caller_id}
+        self._touch(self.calls, (event.lead_id, event.team_id), event.call_date, values, [(event.call_date, line)])
+
+        counter = settings.EVENT_COUNTER_RESULT_CODES.get(event.result_code)
+        lead = self.leads.setdefault(event.lead_id, LeadTouch(event.call_date))
+        lead.last_call = max(lead.last_call, event.call_date)
+        if counter:
+            lead.counters[counter] += 1
+        self.events += 1
+
+    def add_sms(self, event):
+        line = f"{event.sent_at:%Y-%m-%d %H:%M} - {event.status or 'sent'}"
+        self._touch(self.sms, (event.lead_id, event.team_id), event.sent_at, {"status": event.status},
+                    [(event.sent_at, line)])
+        self.events += 1
+
+    def add_email(self, event):
+        line = f"{event.sent_at:%Y-%m-%d %H:%M} - {event.status or 'sent'}"
+        self._touch(self.emails, (event.lead_id, event.sender_id), event.sent_at, {"status": event.status},
+                    [(event.sent_at, line)])
+        self.events += 1
+
+
+# Queue kind -> (log id column, columns PendingRollups reads, method adding one row)
+EVENT_KINDS = {
+    "call": (
+        CallLog.call_log_id,
+        (CallLog.lead_id, CallLog.team_id, CallLog.caller_id, CallLog.call_date, CallLog.result_id, CallLog.result_code),
+        PendingRollups.add_call,
+    ),
+    "email": (
+        EmailLog.email_log_id,
+        (EmailLog.lead_id, EmailLog.sender_id, EmailLog.sent_at, EmailLog.status),
+        PendingRollups.add_email,
+    ),
+    "sms": (
+        SmsLog.sms_log_id,
+        (SmsLog.lead_id, SmsLog.team_id, SmsLog.sent_at, SmsLog.status),
+        PendingRollups.add_sms,
+    ),
+}
+
+
+# ============================================================
+# Apply: one executemany UPDATE per target table
+# ============================================================
+
+def _chunks(items: list, size: int = LOOKUP_CHUNK):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _insert_missing(db: Session, model, second_key: str, keys: Iterable[Tuple[int, int]]):
+    """
+    Create the tracking rows events refer to but that do not exist yet.
+    """
+    keys = set(keys)
+    lead_ids = sorted({lead_id for lead_id, _ in keys})
+    column = getattr(model, second_key)
+    existing = set()
+    for chunk in _chunks(lead_ids):
+        existing.update(db.execute(select(model.lead_id, column).where(model.lead_id.in_(chunk))).all())
+
+    missing = sorted(keys - existing)
+    if missing:
+        db.execute(model.__table__.insert(), [{"lead_id": lead_id, second_key: other} for lead_id, other in missing])
+
+
+def _caller_names(db: Session, caller_ids: set) -> Dict[int, str]:
+    names = {}
+    for chunk in _chunks(sorted(caller_ids)):
+        rows = db.execute(select(Caller.caller_id, Caller.name, Caller.full_name).where(Caller.caller_id.in_(chunk)))
+        names.update((row.caller_id, row.name or row.full_name) for row in rows)
+    return names
+
+
+def _later(column, value):
+    # Newest wins, so a late batch does not move a date backwards
+    return or_(column.is_(None), column <= value)
+
+
+def _track_calls(db: Session, calls: Dict[Tuple[int, int], Touch]):
+    t = LeadTeamTracking.__table__
+    called_on = bindparam("b_called_on", type_=Date)
+    newer = _later(t.c.last_called_date, called_on)
+    statement = (
+        update(t)
+        .where(t.c.lead_id == bindparam("b_lead_id"), t.c.team_id == bindparam("b_team_id"))
+        .values(
+            last_called_date=case((newer, called_on), else_=t.c.last_called_date),
+            call_result_id=case((newer, bindparam("b_result_id", type_=Integer)), else_=t.c.call_result_id),
+            call_result_code=case((newer, bindparam("b_result_code", type_=String)), else_=t.c.call_result_code),
+            last_called_by=case((newer, bindparam("b_called_by", type_=String)), else_=t.c.last_called_by),
+            history_calls=func.coalesce(t.c.history_calls, "") + bindparam("b_history", type_=Text),
+            last_action_date=case((_later(t.c.last_action_date, called_on), called_on), else_=t.c.last_action_date),
+            # The lead was dialed: end its call queue lease (a backfilled older call leaves it)
+            leased_by=case((newer, None), else_=t.c.leased_by),
+            lease_expires_at=case((newer, None), else_=t.c.lease_expires_at),
+        )
+    )
+
+    names = _caller_names(db, {touch.values["caller_id"] for touch in calls.values()} - {None})
+    db.execute(statement, [
+        {
+            "b_lead_id": lead_id,
+            "b_team_id": team_id,
+            "b_called_on": touch.at.date(),
+            "b_result_id": touch.values["result_id"],
+            "b_result_code": touch.values["result_code"],
+            "b_called_by": names.get(touch.values["caller_id"]),
+            "b_history": touch.history(),
+        }
+        for (lead_id, team_id), touch in calls.items()
+    ])
+
+
+def _track_sms(db: Session, sms: Dict[Tuple[int, int], Touch]):
+    t = LeadTeamTracking.__table__
+    sent_on = bindparam("b_sent_on", type_=Date)
+    statement = (
+        update(t)
+        .where(t.c.lead_id == bindparam("b_lead_id"), t.c.team_id == bindparam("b_team_id"))
+        .values(
+            sms_status=bindparam("b_status", type_=String),
+            sms_log=func.coalesce(t.c.sms_log, "") + bindparam("b_history", type_=Text),
+            last_action_date=case((_later(t.c.last_action_date, sent_on), sent_on), else_=t.c.last_action_date),
+        )
+    )
+    db.execute(statement, [
+        {
+            "b_lead_id": lead_id,
+            "b_team_id": team_id,
+            "b_sent_on": touch.at.date(),
+            "b_status": touch.values["status"],
+            "b_history": touch.history(),
+        }
+        for (lead_id, team_id), touch in sms.items()
+    ])
+
+
+def _track_emails(db: Session, emails: Dict[Tuple[int, int], Touch]):
+    t = LeadEmailTracking.__table__
+    statement = (
+        update(t)
+        .where(t.c.lead_id == bindparam("b_lead_id"), t.c.sender_id == bindparam("b_sender_id"))
+        .values(
+            email_status=bindparam("b_status", type_=String),
+            history_email=func.coalesce(t.c.history_email, "") + bindparam("b_history", type_=Text),
+        )
+    )
+    db.execute(statement, [
+        {
+            "b_lead_id": lead_id,
+            "b_sender_id": sender_id,
+            "b_status": touch.values["status"],
+            "b_history": touch.history(),
+        }
+        for (lead_id, sender_id), touch in emails.items()
+    ])
+
+
+def _track_leads(db: Session, leads: Dict[int, LeadTouch]):
+    t = Lead.__table__
+    counters = sorted(set(settings.EVENT_COUNTER_RESULT_CODES.values()))
+    called_at = bindparam("b_called_at", type_=DateTime)
+    statement = (
+        update(t)
+        .where(t.c.id == bindparam("b_lead_id"))
+        .values(
+            company_called_today=True,
+            last_modified_time_called_today=case(
+                (_later(t.c.last_modified_time_called_today, called_at), called_at),
+                else_=t.c.last_modified_time_called_today,
+            ),
+            **{
+                name: func.coalesce(t.c[name], 0) + bindparam(f"b_{name}", type_=Integer)
+                for name in counters
+            },
+        )
+    )
+    db.execute(statement, [
+        {
+            "b_lead_id": lead_id,
+            "b_called_at": touch.last_call,
+            **{f"b_{name}": touch.counters[name] for name in counters},
+        }
+        for lead_id, touch in leads.items()
+    ])
+
+
+def apply_rollups(db: Session, pending: PendingRollups):
+    """
+    Write coalesced rollups in the caller's transaction: counters are
+    incremented and history appended in SQL, so concurrent workers do not
+    lose updates.
+    """
+    if pending.calls or pending.sms:
+        _insert_missing(db, LeadTeamTracking, "team_id", [*pending.calls, *pending.sms])
+    if pending.emails:
+        _insert_missing(db, LeadEmailTracking, "sender_id", pending.emails)
+
+    if pending.calls:
+        _track_calls(db, pending.calls)
+    if pending.sms:
+        _track_sms(db, pending.sms)
+    if pending.emails:
+        _track_emails(db, pending.emails)
+    if pending.leads:
+        _track_leads(db, pending.leads)
+
+
+# ============================================================
+# Queue: rollups to apply, stored with the log rows they come from
+# ============================================================
+
+def queue_rollups(db: Session, kind: str, log_ids: List[int]):
+    """
+    Called in the transaction inserting the log rows, so a rollup is queued
+    exactly when its event is stored.
+    """
+    if log_ids:
+        db.execute(insert(TouchRollupQueue), [{"kind": kind, "log_id": log_id} for log_id in log_ids])
+
+
+def _claim(db: Session, limit: int) -> list:
+    # SKIP LOCKED: workers flushing at the same time take different rows
+    return db.execute(
+        select(TouchRollupQueue.id, TouchRollupQueue.kind, TouchRollupQueue.log_id, TouchRollupQueue.attempts)
+        .where(TouchRollupQueue.dead_at.is_(None))
+        .order_by(TouchRollupQueue.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+
+def _load_events(db: Session, entries: list) -> Dict[int, tuple]:
+    """
+    queue id -> (kind, log row) for the entries whose log row still exists.
+    """
+    wanted = defaultdict(dict)
+    for entry in entries:
+        wanted[entry.kind][entry.log_id] = entry.id
+
+    events = {}
+    for kind, queue_ids in wanted.items():
+        id_column, columns, _ = EVENT_KINDS[kind]
+        for chunk in _chunks(sorted(queue_ids)):
+            for row in db.execute(select(id_column.label("log_id"), *columns).where(id_column.in_(chunk))):
+                events[queue_ids[row.log_id]] = (kind, row)
+    return events
+
+
+def _pending_for(events: Iterable[tuple]) -> PendingRollups:
+    pending = PendingRollups()
+    for kind, row in events:
+        EVENT_KINDS[kind][2](pending, row)
+    return pending
+
+
+def _record_failure(db: Session, entries: list, error: Exception, max_attempts: int):
+    now = datetime.utcnow()
+    for entry in entries:
+        dead = entry.attempts + 1 >= max_attempts
+        db.execute(
+            update(TouchRollupQueue)
+            .where(TouchRollupQueue.id == entry.id)
+            .values(attempts=entry.attempts + 1, last_error=str(error)[:1000], dead_at=now if dead else None)
+        )
+        if dead:
+            logger.error(f"Touch rollup of {entry.kind} {entry.log_id} dropped after {max_attempts} attempts: {error}")
+
+
+def apply_queued(db: Session, limit: int, max_attempts: int) -> dict:
+    """
+    Claim up to `limit` queued rollups, apply them and delete them from the
+    queue, all in one transaction. When the batch fails it is retried lead
+    by lead, so one failing lead only holds back (and eventually
+    dead-letters) its own rows.
+    """
+    entries = _claim(db, limit)
+    if not entries:
+        db.commit()
+        return {"claimed": 0, "events": 0, "rows": 0, "failed": 0}
+
+    events = _load_events(db, entries)
+    failed = set()
+    try:
+        with db.begin_nested():
+            pending = _pending_for(events.values())
+            apply_rollups(db, pending)
+        rows = len(pending)
+    except Exception:
+        rows = 0
+        by_lead = defaultdict(list)
+        for entry in entries:
+            if entry.id in events:
+                by_lead[events[entry.id][1].lead_id].append(entry)
+        for lead_entries in by_lead.values():
+            try:
+                with db.begin_nested():
+                    pending = _pending_for(events[entry.id] for entry in lead_entries)
+                    apply_rollups(db, pending)
+                rows += len(pending)
+            except Exception as e:
+                failed.update(entry.id for entry in lead_entries)
+                _record_failure(db, lead_entries, e, max_attempts)
+
+    done = [entry.id for entry in entries if entry.id not in failed]
+    for chunk in _chunks(done):
+        db.execute(delete(TouchRollupQueue).where(TouchRollupQueue.id.in_(chunk)))
+    db.commit()
+    return {"claimed": len(entries), "events": len(events) - len(failed), "rows": rows, "failed": len(failed)}
+
+
+# ============================================================
+# In-process worker (started from main.py)
+# ============================================================
+
+class TouchRollupWorker:
+    """
+    Applies queued rollups every `interval` seconds, or sooner once
+    `batch_size` events were ingested by this worker. A lead touched ten
+    times in between gets one UPDATE. With interval 0, or when the worker
+    is not running, rollups are applied right after each batch.
+
+    The queue lives in the database: rollups left by a worker that crashed
+    or was recycled are applied by whichever worker flushes next.
+    """
+
+    def __init__(self, interval: float, batch_size: int, max_attempts: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self._ingested = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def notify(self, events: int):
+        """
+        Called once a batch of `events` and their queued rollups committed.
+        """
+        if self._thread is None:
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Touch rollup flush failed, will retry: {e}")
+            return
+
+        with self._lock:
+            self._ingested += events
+            full = self._ingested >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def flush(self) -> dict:
+        """
+        Apply queued rollups, `batch_size` per transaction, until the queue
+        is drained or a batch had failures. Returns totals.
+        """
+        totals = {"events": 0, "rows": 0, "failed": 0}
+        with self._flush_lock:
+            with self._lock:
+                self._ingested = 0
+
+            while True:
+                db = SessionLocal()
+                try:
+                    done = apply_queued(db, self.batch_size, self.max_attempts)
+                except Exception:
+                    db.rollback()
+                    raise
+                finally:
+                    db.close()
+
+                for key in totals:
+                    totals[key] += done[key]
+                if done["claimed"] < self.batch_size or done["failed"]:
+                    return totals
+
+    def start(self):
+        if self.interval <= 0 or self._thread:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="touch-rollups", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        # Flush right away too: picks up what a previous worker left queued
+        while not self._stop.is_set():
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Touch rollup flush failed, will retry: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+touch_rollups = TouchRollupWorker(
+    interval=settings.EVENT_ROLLUP_INTERVAL_SECONDS,
+    batch_size=settings.EVENT_ROLLUP_MAX_PENDING,
+    max_attempts=settings.EVENT_ROLLUP_MAX_ATTEMPTS,
+)
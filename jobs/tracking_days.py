@@ -0,0 +1,180 @@
+import argparse
+import time
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import Integer, and_, bindparam, case, func, or_, select, update
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+
+from config.logger import logger
+from config.settings import settings
+from database.db import SessionLocal
+from app.models.crm import LeadTeamTracking
+from utils.reference_cache import reference_cache
+
+
+# ============================================================
+# days_hot / days_ignore from the date columns
+# ============================================================
+
+class days_between(FunctionElement):
+    """
+    Whole days from date `start` to date `end`.
+    """
+    type = Integer()
+    name = "days_between"
+    inherit_cache = True
+
+
+@compiles(days_between)
+def _days_between(element, compiler, **kw):
+    start, end = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"({end} - {start})"
+
+
+@compiles(days_between, "sqlite")
+def _days_between_sqlite(element, compiler, **kw):
+    start, end = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"CAST(julianday({end}) - julianday({start}) AS INTEGER)"
+
+
+@compiles(days_between, "mysql")
+def _days_between_mysql(element, compiler, **kw):
+    start, end = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"DATEDIFF({end}, {start})"
+
+
+def days_in_state(since_column, today, lead_type: str):
+    """
+    SQL for the day count of a state entered on `since_column`: 0 unless the
+    lead's current type is the `lead_type` label, since nothing clears the
+    date when a lead moves on. Select this to read up-to-date values
+    without relying on the nightly refresh. Raises LookupError for a label
+    missing from lead_type_options.
+    """
+    labels = {item["label"]: item["id"] for item in reference_cache.get("lead_types")[0]}
+    if lead_type not in labels:
+        raise LookupError(f"Lead type '{lead_type}' not found in lead_type_options")
+
+    in_state = and_(LeadTeamTracking.lead_type_id == labels[lead_type], since_column.is_not(None))
+    return case((in_state, days_between(since_column, today)), else_=0)
+
+
+# ============================================================
+# Refresh: rewrite only rows whose stored count is out of date
+# ============================================================
+
+def refresh_tracking_days(
+    db: Session,
+    today: Optional[date] = None,
+    batch_size: int = settings.TRACKING_DAYS_BATCH_SIZE,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Bring days_hot / days_ignore in line with date_became_hot /
+    date_became_ignore and the lead's current type. Only rows with a state
+    date or a non-zero count can be out of date; those are walked by id,
+    `batch_size` at a time, committing after each batch, and only rows
+    whose stored value differs are written. With dry_run nothing is written
+    and the rows that would change are counted instead. A count whose lead
+    type label is not found is left alone (and listed under "skipped")
+    rather than reset to 0 everywhere.
+    """
+    started = time.perf_counter()
+    today = today or datetime.utcnow().date()
+    tracking = LeadTeamTracking
+    on = bindparam("today", today)
+
+    expected, skipped = {}, []
+    for name, since_column, lead_type in (
+        ("days_hot", tracking.date_became_hot, settings.TRACKING_HOT_LEAD_TYPE),
+        ("days_ignore", tracking.date_became_ignore, settings.TRACKING_IGNORE_LEAD_TYPE),
+    ):
+        try:
+            expected[name] = (since_column, days_in_state(since_column, on, lead_type))
+        except LookupError as e:
+            logger.warning(f"Tracking days refresh skips {name}: {e}")
+            skipped.append(name)
+
+    counts = {"scanned": 0, "touched": 0, "days_hot": 0, "days_ignore": 0}
+    if not expected:
+        db.rollback()
+        return {**counts, "skipped": skipped, "dry_run": dry_run,
+                "elapsed_seconds": round(time.perf_counter() - started, 3)}
+
+    stale = {name: getattr(tracking, name).is_distinct_from(value) for name, (_, value) in expected.items()}
+    any_stale = or_(*stale.values())
+    # Every other row already holds 0 (or NULL) and stays that way
+    candidates = or_(*(
+        condition
+        for name, (since_column, _) in expected.items()
+        for condition in (since_column.is_not(None), getattr(tracking, name) != 0)
+    ))
+    last_id = 0
+
+    while True:
+        ids = db.scalars(
+            select(tracking.id).where(candidates, tracking.id > last_id).order_by(tracking.id).limit(batch_size)
+        ).all()
+        if not ids:
+            break
+
+        in_range = and_(candidates, tracking.id >= ids[0], tracking.id <= ids[-1])
+        scanned, either, *per_column = db.execute(
+            select(
+                func.count(),
+                func.count(case((any_stale, 1))),
+                *(func.count(case((condition, 1))) for condition in stale.values()),
+            ).where(in_range)
+        ).one()
+        counts["scanned"] += scanned
+        for name, changed in zip(stale, per_column):
+            counts[name] += changed
+
+        if either and not dry_run:
+            either = db.execute(
+                update(tracking)
+                .where(in_range, any_stale)
+                .values({name: value for name, (_, value) in expected.items()}),
+                execution_options={"synchronize_session": False},
+            ).rowcount
+            db.commit()
+        counts["touched"] += either
+        last_id = ids[-1]
+        if len(ids) < batch_size:
+            break
+
+    db.rollback()
+    return {**counts, "skipped": skipped, "dry_run": dry_run, "elapsed_seconds": round(time.perf_counter() - started, 3)}
+
+
+def run_tracking_days_refresh():
+    parser = argparse.ArgumentParser(description="Refresh lead_team_tracking days_hot / days_ignore")
+    parser.add_argument("--batch-size", type=int, default=settings.TRACKING_DAYS_BATCH_SIZE)
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="count days up to this date")
+    parser.add_argument("--dry-run", action="store_true", help="report what would change, write nothing")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        report = refresh_tracking_days(db, today=args.date, batch_size=args.batch_size, dry_run=args.dry_run)
+        verb = "would update" if report["dry_run"] else "updated"
+        print(
+            f"✅ Tracking days refresh {verb} {report['touched']} of {report['scanned']} rows "
+            f"(days_hot {report['days_hot']}, days_ignore {report['days_ignore']}) "
+            f"in {report['elapsed_seconds']}s"
+        )
+        if report["skipped"]:
+            print(f"⚠️  Skipped (lead type not found): {', '.join(report['skipped'])}")
+
+    except Exception as e:
+        print("❌ Tracking days refresh failed:", e)
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    run_tracking_days_refresh()
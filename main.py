@@ -1,25 +1,48 @@
 # main.py
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routes.api import router
+from config.settings import settings
 from app.middlewares.logging_middleware import logging_middleware
-from database.db import Base, engine
+from database.db import async_engine, engine, replica_engines
+from jobs.analytics_rollups import analytics_rollups
+from jobs.purge_tokens import token_sweeper
+from jobs.rotate_touch_logs import touch_log_rotator
+from jobs.touch_rollups import touch_rollups
+from routes.metrics import router as metrics_router
+from utils.metrics import metrics_flusher
 
-# 👇 Import models to create tables
-from app.models.user import User
-from app.models.role import Role
-from app.models.token import UserToken
-from app.models.lead_type_option import LeadTypeOption
-from app.models.contact_type_option import ContactTypeOption
-from app.models.timezone import Timezone
-from app.models.company import Company
-from app.models.lead import Lead
+# Register every model; the schema itself is created by `python -m migrations.bootstrap`
+from app import models as _models  # noqa: F401
 
 
 app = FastAPI(title="Sidago CRM API")
 
-# ------------------- Create tables -------------------
-Base.metadata.create_all(bind=engine)
+# ------------------- Background jobs -------------------
+@app.on_event("startup")
+def start_background_jobs():
+    token_sweeper.start()
+    touch_rollups.start()
+    touch_log_rotator.start()
+    analytics_rollups.start()
+    metrics_flusher.start()
+
+
+@app.on_event("shutdown")
+def stop_background_jobs():
+    token_sweeper.stop()
+    touch_rollups.stop()
+    touch_log_rotator.stop()
+    analytics_rollups.stop()
+    metrics_flusher.stop()
+
+
+@app.on_event("shutdown")
+async def close_database_pools():
+    # Runs on graceful worker exit (SIGTERM / max_requests), after in-flight requests
+    if async_engine is not None:
+        await async_engine.dispose()
+    for pool_engine in [engine, *replica_engines]:
+        pool_engine.dispose()
 
 # ------------------- Add Logging Middleware -------------------
 app.middleware("http")(logging_middleware)
@@ -38,7 +61,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-SQL-Profile"],
 )
 
 # ------------------- Include API router -------------------
+# DB_ASYNC swaps the lead/company/comment routes for their AsyncSession versions
+if settings.DB_ASYNC:
+    from routes.async_api import router
+else:
+    from routes.api import router
+
 app.include_router(router, prefix="/api")
+app.include_router(metrics_router)
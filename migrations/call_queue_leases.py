@@ -0,0 +1,40 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+from database.db import engine
+from app.models.crm import LeadTeamTracking
+
+
+# ============================================================
+# Schema: lease columns used by utils.call_queue
+# ============================================================
+
+def add_lease_columns(conn: Connection):
+    existing = {c["name"] for c in inspect(conn).get_columns(LeadTeamTracking.__tablename__)}
+    table = LeadTeamTracking.__table__
+    for column in (table.c.leased_by, table.c.lease_expires_at):
+        if column.name not in existing:
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE lead_team_tracking ADD COLUMN {column.name} {column_type}"))
+
+
+def create_lease_indexes(conn: Connection):
+    for index in LeadTeamTracking.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+
+def run_call_queue_migration():
+    try:
+        with engine.connect() as conn:
+            add_lease_columns(conn)
+            create_lease_indexes(conn)
+            conn.commit()
+
+        print("✅ Call queue migration executed successfully")
+
+    except Exception as e:
+        print("❌ Call queue migration failed:", e)
+
+
+if __name__ == "__main__":
+    run_call_queue_migration()
@@ -0,0 +1,111 @@
+"""
+Convert call_logs, email_logs and sms_logs into tables RANGE-partitioned by
+month on call_date / sent_at.
+
+Once partitioned, `python -m jobs.rotate_touch_logs` creates upcoming months
+ahead of time and archives or detaches months past LOG_RETENTION_MONTHS
+instead of deleting row by row. PostgreSQL only; every row is copied across.
+Fresh databases get partitioned tables from migrations.bootstrap directly.
+
+    python -m migrations.partition_touch_logs
+"""
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Connection
+
+from config.settings import settings
+from database.db import engine
+from database.partitioning import ensure_monthly_partitions, is_partitioned
+from app.models.crm import CallLog, EmailLog, SmsLog
+
+# Log table -> partition key column
+LOG_TABLES: Dict[str, str] = {
+    CallLog.__tablename__: "call_date",
+    EmailLog.__tablename__: "sent_at",
+    SmsLog.__tablename__: "sent_at",
+}
+
+_MODELS = {model.__tablename__: model for model in (CallLog, EmailLog, SmsLog)}
+
+
+def partition_log_table(conn: Connection, table: str) -> int:
+    """
+    Rebuild `table` as a partitioned table with the same columns, keys and
+    indexes, and copy its rows over. Returns the number of rows copied.
+    """
+    key = LOG_TABLES[table]
+    model_table = _MODELS[table].__table__
+    (id_column,) = model_table.primary_key.columns
+    legacy = f"{table}_legacy"
+
+    first = conn.execute(select(func.min(model_table.c[key]))).scalar()
+
+    conn.execute(text(f"ALTER TABLE {table} RENAME TO {legacy}"))
+    conn.execute(text(
+        f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY RANGE ({key})"
+    ))
+    # Unique constraints on a partitioned table must include the partition key
+    conn.execute(text(f"ALTER TABLE {table} ADD PRIMARY KEY ({id_column.name}, {key})"))
+    for fk in model_table.foreign_keys:
+        on_delete = f" ON DELETE {fk.ondelete}" if fk.ondelete else ""
+        conn.execute(text(
+            f"ALTER TABLE {table} ADD FOREIGN KEY ({fk.parent.name}) "
+            f"REFERENCES {fk.column.table.name} ({fk.column.name}){on_delete}"
+        ))
+    conn.execute(text(f"ALTER SEQUENCE IF EXISTS {table}_{id_column.name}_seq OWNED BY {table}.{id_column.name}"))
+
+    ensure_monthly_partitions(conn, table, first or datetime.utcnow(), settings.LOG_PARTITION_MONTHS_AHEAD)
+
+    copied = conn.execute(text(f"INSERT INTO {table} SELECT * FROM {legacy}")).rowcount
+    conn.execute(text(f"DROP TABLE {legacy}"))
+
+    # Created on the parent, so every partition (present and future) gets them
+    for index in model_table.indexes:
+        index.create(conn)
+
+    return copied
+
+
+def partition_new_log_tables(conn: Connection, new_tables: List[str]) -> List[str]:
+    """
+    Called by migrations.bootstrap: log tables it just created are still
+    empty, so partition them right away on PostgreSQL.
+    """
+    if conn.dialect.name != "postgresql":
+        return []
+
+    partitioned = []
+    for table in LOG_TABLES:
+        if table in new_tables:
+            partition_log_table(conn, table)
+            partitioned.append(table)
+    return partitioned
+
+
+def run_partition_migration():
+    try:
+        with engine.begin() as conn:
+            if conn.dialect.name != "postgresql":
+                print(f"⚠️  Partitioning requires PostgreSQL (got {conn.dialect.name}); nothing to do")
+                return
+
+            copied = {
+                table: partition_log_table(conn, table)
+                for table in LOG_TABLES
+                if not is_partitioned(conn, table)
+            }
+
+        if not copied:
+            print("✅ Log tables are already partitioned")
+            return
+        summary = ", ".join(f"{table}: {rows} rows" for table, rows in copied.items())
+        print(f"✅ Log tables partitioned by month ({summary})")
+
+    except Exception as e:
+        print("❌ Log table partition migration failed:", e)
+
+
+if __name__ == "__main__":
+    run_partition_migration()
@@ -0,0 +1,72 @@
+"""
+Convert user_tokens into a table RANGE-partitioned by month on expires_at.
+
+Once partitioned, `python -m jobs.purge_tokens` drops whole expired months
+instead of deleting row by row. PostgreSQL only; only live sessions are
+copied across.
+
+    python -m migrations.partition_user_tokens
+"""
+from datetime import datetime
+
+from sqlalchemy import text
+
+from config.settings import settings
+from database.db import engine
+from database.partitioning import ensure_monthly_partitions, is_partitioned
+from app.models.token import UserToken
+
+
+def partition_user_tokens(conn):
+    now = datetime.utcnow()
+
+    conn.execute(text("ALTER TABLE user_tokens RENAME TO user_tokens_legacy"))
+    conn.execute(text(
+        "CREATE TABLE user_tokens (LIKE user_tokens_legacy INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (expires_at)"
+    ))
+    # Unique constraints on a partitioned table must include the partition key
+    conn.execute(text("ALTER TABLE user_tokens ADD PRIMARY KEY (id, expires_at)"))
+    conn.execute(text(
+        "ALTER TABLE user_tokens ADD FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE"
+    ))
+    conn.execute(text("ALTER SEQUENCE IF EXISTS user_tokens_id_seq OWNED BY user_tokens.id"))
+
+    ensure_monthly_partitions(conn, "user_tokens", now, settings.TOKEN_PARTITION_MONTHS_AHEAD)
+
+    copied = conn.execute(
+        text("INSERT INTO user_tokens SELECT * FROM user_tokens_legacy WHERE expires_at >= :now"),
+        {"now": now},
+    ).rowcount
+    conn.execute(text("DROP TABLE user_tokens_legacy"))
+
+    # Digest lookups stay indexed per partition; refresh_token_hash can no
+    # longer be globally unique, but every token carries a random jti.
+    conn.execute(text("CREATE INDEX ix_user_tokens_access_token_hash ON user_tokens (access_token_hash)"))
+    conn.execute(text("CREATE INDEX ix_user_tokens_refresh_token_hash ON user_tokens (refresh_token_hash)"))
+    conn.execute(text("CREATE INDEX ix_user_tokens_user_id ON user_tokens (user_id)"))
+
+    return copied
+
+
+def run_partition_migration():
+    try:
+        with engine.begin() as conn:
+            if conn.dialect.name != "postgresql":
+                print(f"⚠️  Partitioning requires PostgreSQL (got {conn.dialect.name}); nothing to do")
+                return
+
+            if is_partitioned(conn, UserToken.__tablename__):
+                print("✅ user_tokens is already partitioned")
+                return
+
+            copied = partition_user_tokens(conn)
+
+        print(f"✅ user_tokens partitioned by month ({copied} live sessions copied)")
+
+    except Exception as e:
+        print("❌ user_tokens partition migration failed:", e)
+
+
+if __name__ == "__main__":
+    run_partition_migration()
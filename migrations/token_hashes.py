@@ -0,0 +1,140 @@
+from sqlalchemy import inspect, select, text, update
+from sqlalchemy.engine import Connection
+
+from database.db import engine
+from app.models.token import UserToken
+from utils.jwt_helper import hash_token
+
+BATCH_SIZE = 1000
+
+
+# ============================================================
+# Schema: add digest columns, relax legacy raw-token columns
+# ============================================================
+
+def add_hash_columns(conn: Connection):
+    existing = {c["name"] for c in inspect(conn).get_columns(UserToken.__tablename__)}
+    for column in (UserToken.__table__.c.access_token_hash, UserToken.__table__.c.refresh_token_hash):
+        if column.name not in existing:
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE user_tokens ADD COLUMN {column.name} {column_type}"))
+
+
+def _legacy_columns_nullable(conn: Connection) -> bool:
+    columns = {c["name"]: c["nullable"] for c in inspect(conn).get_columns(UserToken.__tablename__)}
+    return columns.get("access_token", True) and columns.get("refresh_token", True)
+
+
+def relax_legacy_columns(conn: Connection):
+    """
+    Let access_token / refresh_token be NULL, as login no longer writes them.
+    SQLite cannot alter a column in place; its table is rebuilt by
+    finish_schema once every row has its digests.
+    """
+    if _legacy_columns_nullable(conn):
+        return
+
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("ALTER TABLE user_tokens ALTER COLUMN access_token DROP NOT NULL"))
+        conn.execute(text("ALTER TABLE user_tokens ALTER COLUMN refresh_token DROP NOT NULL"))
+        conn.execute(text("DROP INDEX IF EXISTS ix_user_tokens_access_token"))
+    elif conn.dialect.name == "mysql":
+        conn.execute(text("ALTER TABLE user_tokens MODIFY access_token VARCHAR(1024) NULL"))
+        conn.execute(text("ALTER TABLE user_tokens MODIFY refresh_token VARCHAR(1024) NULL"))
+    elif conn.dialect.name != "sqlite":
+        raise RuntimeError(f"Cannot make the legacy token columns nullable on {conn.dialect.name}")
+
+
+def rebuild_sqlite_table(conn: Connection):
+    """
+    Copy user_tokens into a fresh table built from the model: digests NOT
+    NULL, raw token columns nullable and left empty.
+    """
+    for index in inspect(conn).get_indexes(UserToken.__tablename__):
+        conn.execute(text(f"DROP INDEX IF EXISTS {index['name']}"))
+    conn.execute(text("ALTER TABLE user_tokens RENAME TO user_tokens_legacy"))
+    UserToken.__table__.create(conn)
+
+    kept = "id, user_id, access_token_hash, refresh_token_hash, expires_at, created_at"
+    conn.execute(text(f"INSERT INTO user_tokens ({kept}) SELECT {kept} FROM user_tokens_legacy"))
+    conn.execute(text("DROP TABLE user_tokens_legacy"))
+
+
+def create_hash_indexes(conn: Connection):
+    for index in UserToken.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+
+def enforce_not_null(conn: Connection):
+    if conn.dialect.name != "postgresql":
+        return
+
+    conn.execute(text("ALTER TABLE user_tokens ALTER COLUMN access_token_hash SET NOT NULL"))
+    conn.execute(text("ALTER TABLE user_tokens ALTER COLUMN refresh_token_hash SET NOT NULL"))
+
+
+def finish_schema(conn: Connection):
+    if conn.dialect.name == "sqlite" and not _legacy_columns_nullable(conn):
+        rebuild_sqlite_table(conn)
+
+    create_hash_indexes(conn)
+    enforce_not_null(conn)
+
+
+# ============================================================
+# Data: hash legacy tokens in bounded batches
+# ============================================================
+
+def backfill_hashes(conn: Connection, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Replace raw tokens with their digests. Returns the number of rows migrated.
+    Raw values are only cleared where the schema allows NULL; on SQLite
+    the rebuild in finish_schema drops them.
+    """
+    clear_raw = _legacy_columns_nullable(conn)
+    migrated = 0
+
+    while True:
+        rows = conn.execute(
+            select(UserToken.id, UserToken.access_token, UserToken.refresh_token)
+            .where(UserToken.access_token_hash.is_(None))
+            .order_by(UserToken.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return migrated
+
+        for row in rows:
+            values = {
+                "access_token_hash": hash_token(row.access_token),
+                "refresh_token_hash": hash_token(row.refresh_token),
+            }
+            if clear_raw:
+                values.update(access_token=None, refresh_token=None)
+
+            conn.execute(update(UserToken).where(UserToken.id == row.id).values(**values))
+
+        conn.commit()
+        migrated += len(rows)
+
+
+def run_token_hash_migration():
+    try:
+        with engine.connect() as conn:
+            add_hash_columns(conn)
+            relax_legacy_columns(conn)
+            conn.commit()
+
+            migrated = backfill_hashes(conn)
+
+            finish_schema(conn)
+            conn.commit()
+
+        print(f"✅ Token hash migration executed successfully ({migrated} rows migrated)")
+
+    except Exception as e:
+        print("❌ Token hash migration failed:", e)
+
+
+if __name__ == "__main__":
+    run_token_hash_migration()
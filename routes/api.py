@@ -1,60 +1,72 @@
 # app/routes/api.py
 
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+from datetime import date, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
+from app.controllers.analytics_controller import AnalyticsController
 from app.controllers.company_comment_controller import CompanyCommentController
-from app.controllers.company_controller import CompanyController
-from app.controllers.contact_type_controller import ContactTypeOptionController
-from app.controllers.lead_type_controller import LeadTypeOptionController
-from app.controllers.timezone_controller import TimezoneController
-from app.controllers.lead_controller import LeadController
+from app.controllers.company_controller import (
+    COMPANY_EXPORT_COLUMNS,
+    DEFAULT_HISTORY_LIMIT,
+    MAX_HISTORY_LIMIT,
+    CompanyController,
+)
+from app.controllers.lead_import_controller import LeadImportController
+from app.controllers.lead_controller import LEAD_EXPORT_COLUMNS, LEAD_LIST_FIELDS, LeadController
+from app.controllers.touch_event_controller import TouchEventController
 from app.schemas.company_comment_schema import CommentRequest
 from app.schemas.company_schema import CompanyCreateRequest
-from database.db import SessionLocal
-from app.models.user import User
+from app.schemas.touch_event_schema import TouchEventBatch
+from config.settings import settings
+from database.db import RoutingSessionLocal, engine
+from database.pool import pool_metrics
+from app.models.user import User, slim_user_options
 from app.models.role import Role
-from app.models.token import UserToken
 from app.controllers.auth_controller import login, logout, refresh_tokens
 from app.schemas.auth_schema import LoginRequest
 from app.schemas.lead_schema import LeadCreateRequest,LeadUpdateRequest
-from app.middlewares.auth_middleware import get_current_user, require_role
+from app.middlewares.auth_middleware import get_current_user, get_db, require_role, security
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, parse_fields
+from utils.call_queue import call_queue
+from utils.principal_cache import Principal
+from utils.reference_cache import reference_cache
+from utils.streaming import EXPORT_MEDIA_TYPES, export_stream
 
 router = APIRouter()
 
 # ---------------- Database dependency ----------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# get_db comes from auth_middleware so a route and its get_current_user share
+# one session, which replica routing uses to know the caller.
 
 
 # ---------------- LOGIN ----------------
 @router.post("/login", summary="Login user")
-def user_login(request: LoginRequest, db: Session = Depends(get_db)):
+async def user_login(request: LoginRequest, db: Session = Depends(get_db)):
     """
     Login user with email & password
     Returns access token, refresh token, and user info
     """
-    return login(request.email, request.password, db)
+    return await login(request.email, request.password, db)
 
 
 # ---------------- LOGOUT ----------------
 @router.post("/logout", summary="Logout user")
 def user_logout(
-    user: User = Depends(get_current_user),  # Access token validated
+    user: Principal = Depends(get_current_user),  # Access token validated
+    credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
     """
     Logout user by invalidating their access token
     """
-    token_record = db.query(UserToken).filter(UserToken.user_id == user.id).first()
-    if token_record:
-        db.delete(token_record)
-        db.commit()
+    logout(credentials.credentials, db)
 
     return {"message": "Logged out successfully"}
 
@@ -75,7 +87,7 @@ def refresh(request: RefreshRequest, db: Session = Depends(get_db)):
 
 # ---------------- GET CURRENT USER ----------------
 @router.get("/me", summary="Get current user info")
-def get_me(user: User = Depends(get_current_user)):
+def get_me(user: Principal = Depends(get_current_user)):
     """
     Get details of the currently logged-in user
     """
@@ -83,14 +95,14 @@ def get_me(user: User = Depends(get_current_user)):
         "id": user.id,
         "email": user.email,
         "username": user.username,
-        "roles": [r.name for r in user.roles],
+        "roles": list(user.roles),
     }
 
 
 # ---------------- GET AGENT LIST ----------------
 @router.get("/agents", summary="Get all agents (admin only)")
 def get_agents(
-    admin_user: User = Depends(require_role("admin")),  # Only admin can access
+    admin_user: Principal = Depends(require_role("admin")),  # Only admin can access
     db: Session = Depends(get_db)
 ):
     """
@@ -99,6 +111,7 @@ def get_agents(
     """
     agents = (
         db.query(User)
+        .options(*slim_user_options())
         .join(User.roles)
         .filter(Role.name == "agent")
         .all()
@@ -114,44 +127,67 @@ def get_agents(
         for agent in agents
     ]
 
+# ---------------- DATABASE POOL METRICS ----------------
+@router.get("/db-pool", summary="Connection pool metrics (admin only)")
+def get_db_pool_metrics(admin_user: Principal = Depends(require_role("admin"))):
+    """
+    Checkout wait times, stalls and timeouts since start, plus the pool's
+    current and peak in-use and overflow connections.
+    """
+    return pool_metrics.snapshot(engine.pool)
+
+# ---------------- REFERENCE DATA ----------------
+def _reference_data_response(request: Request, name: str):
+    """
+    Serve a cached reference table; answers 304 when the client's
+    If-None-Match already holds the current ETag.
+    """
+    items, etag = reference_cache.get(name)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(items, headers=headers)
+
 # ---------------- GET ALL LEAD TYPES ----------------
 @router.get("/lead-types", summary="Get all lead types (admin only)")
 def get_lead_types(
-    admin_user: User = Depends(require_role("admin")),
-    db: Session = Depends(get_db)
+    request: Request,
+    admin_user: Principal = Depends(require_role("admin")),
 ):
     """
     Returns all lead type options.
     """
-    return LeadTypeOptionController.get_all_lead_type_options(db)
+    return _reference_data_response(request, "lead_types")
 
 # ---------------- GET ALL CONTACT TYPES ----------------
 @router.get("/contact-types", summary="Get all contact types (admin only)")
 def get_contact_types(
-    admin_user: User = Depends(require_role("admin")),
-    db: Session = Depends(get_db)
+    request: Request,
+    admin_user: Principal = Depends(require_role("admin")),
 ):
     """
     Returns all contact type options.
     """
-    return ContactTypeOptionController.get_all_contact_type_options(db)
+    return _reference_data_response(request, "contact_types")
 
 # ---------------- GET ALL TIMEZONES ----------------
 @router.get("/timezones", summary="Get all timezones (admin only)")
 def get_timezones(
-    admin_user: User = Depends(require_role("admin")),
-    db: Session = Depends(get_db)
+    request: Request,
+    admin_user: Principal = Depends(require_role("admin")),
 ):
     """
     Returns all timezone options.
     """
-    return TimezoneController.get_all_timezones(db)
+    return _reference_data_response(request, "timezones")
 
 # ---------------- LEADS ----------------
 @router.post("/lead", summary="Create a new lead (admin only)")
 def create_lead(
     request: LeadCreateRequest,
-    admin_user: User = Depends(require_role("admin")),  # Only admin can create
+    admin_user: Principal = Depends(require_role("admin")),  # Only admin can create
     db: Session = Depends(get_db)
 ):
     """
@@ -160,22 +196,92 @@ def create_lead(
     """
     return LeadController.create_lead_in_db(request, db)
 
-@router.get("/leads", summary="Get all leads (any role)")
+@router.get("/leads", summary="Get leads, one page at a time (any role)")
 def get_leads(
-    user: User = Depends(get_current_user),  # Any authenticated user
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of lead fields"),
+    company_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    contact_type_id: Optional[int] = None,
+    lead_type_id: Optional[int] = None,
+    not_work_anymore: Optional[bool] = None,
+    follow_up_from: Optional[date] = None,
+    follow_up_to: Optional[date] = None,
+    user: Principal = Depends(get_current_user),  # Any authenticated user
     db: Session = Depends(get_db)
 ):
     """
-    Fetch all leads from the database and return them as a list of dictionaries.
+    Fetch one page of leads ordered by id, as a list of dictionaries.
+    Pass the `X-Next-Cursor` response header back as `cursor` to get the
+    next page; the header is absent on the last page.
     Accessible by any authenticated user.
     """
-    return LeadController.get_all_leads(db)
+    try:
+        items, next_cursor = LeadController.get_leads_page(
+            db,
+            fields=parse_fields(fields, LEAD_LIST_FIELDS),
+            cursor=cursor,
+            limit=limit,
+            company_id=company_id,
+            user_id=user_id,
+            contact_type_id=contact_type_id,
+            lead_type_id=lead_type_id,
+            not_work_anymore=not_work_anymore,
+            follow_up_from=follow_up_from,
+            follow_up_to=follow_up_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+# ---------------- BULK IMPORT LEADS ----------------
+@router.post("/leads/import", summary="Bulk import leads from CSV or NDJSON (admin only)")
+async def import_leads(
+    request: Request,
+    import_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    admin_user: Principal = Depends(require_role("admin")),  # Only admin can import
+    db: Session = Depends(get_db)
+):
+    """
+    Send the file as the raw request body. CSV needs a header row with the
+    LeadCreateRequest fields; `company`, `contact_type` and `lead_type` may be
+    given by name instead of id. Valid rows are inserted in batches and the
+    response lists every rejected row with its errors.
+    """
+    try:
+        text = (await request.body()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Upload must be UTF-8 encoded")
+
+    rows = LeadImportController.parse_rows(text, import_format)
+    return await run_in_threadpool(LeadImportController.import_leads, db, rows)
+
+# ---------------- EXPORT LEADS ----------------
+@router.get("/leads/export", summary="Stream every lead as NDJSON or CSV (any role)")
+def export_leads(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    user: Principal = Depends(get_current_user),  # Any authenticated user
+):
+    """
+    Stream all leads in the same shape as GET /leads, with constant memory.
+    """
+    rows = LeadController.stream_leads(RoutingSessionLocal)
+    return StreamingResponse(
+        export_stream(rows, export_format, LEAD_EXPORT_COLUMNS),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="leads.{export_format}"'},
+    )
 
 # ---------------- GET LEAD BY ID ----------------
 @router.get("/lead/{lead_id}", summary="Get a lead by ID (any role)")
 def get_lead_by_id(
     lead_id: int,
-    user: User = Depends(get_current_user),  # Any authenticated user
+    user: Principal = Depends(get_current_user),  # Any authenticated user
     db: Session = Depends(get_db)
 ):
     """
@@ -191,7 +297,7 @@ def get_lead_by_id(
 @router.get("/lead/agent/{agent_id}", summary="Get a lead by agent ID (any role)")
 def get_lead_by_agent_id(
     agent_id: int,
-    user: User = Depends(get_current_user),  # Any authenticated user
+    user: Principal = Depends(get_current_user),  # Any authenticated user
     db: Session = Depends(get_db)
 ):
     """
@@ -204,12 +310,30 @@ def get_lead_by_agent_id(
     return lead
 
 
+# ---------------- LEAD HISTORY ----------------
+@router.get("/lead/{lead_id}/history", summary="Calls, emails and SMS of a lead (any role)")
+def get_lead_history(
+    lead_id: int,
+    since: Optional[date] = Query(None, description="first day (default LOG_HISTORY_DAYS ago)"),
+    until: Optional[date] = Query(None, description="day after the last one (default tomorrow)"),
+    limit: int = Query(100, ge=1, le=1000),
+    user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Newest touches first. The window is always bounded so that on
+    partitioned log tables only the months it covers are read.
+    """
+    until = until or date.today() + timedelta(days=1)
+    since = since or until - timedelta(days=settings.LOG_HISTORY_DAYS + 1)
+    return TouchEventController.get_lead_history(db, lead_id, since, until, limit)
+
 # ---------------- UPDATE LEAD ----------------
 @router.put("/lead/{lead_id}", summary="Update a lead by ID (any role)")
 def update_lead(
     lead_id: int,
     updates: LeadUpdateRequest,  # Use the Pydantic schema
-    user: User = Depends(get_current_user),  # Any authenticated user
+    user: Principal = Depends(get_current_user),  # Any authenticated user
     db: Session = Depends(get_db)
 ):
     """
@@ -223,20 +347,56 @@ def update_lead(
     return lead
 
 # ---------------- COMPANY ----------------
-@router.get("/companies", summary="Get all companies (admin only)")
+@router.get("/companies", summary="Get companies, one page at a time (admin only)")
 def get_companies(
-    admin_user: User = Depends(require_role("admin")),
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    include_histories: bool = True,
+    history_limit: int = Query(DEFAULT_HISTORY_LIMIT, ge=1, le=MAX_HISTORY_LIMIT),
+    admin_user: Principal = Depends(require_role("admin")),
     db: Session = Depends(get_db)
 ):
     """
-    Returns all companies.
+    Returns one page of companies, newest first, each with its latest
+    `history_limit` history entries (omitted when include_histories=false).
+    Pass the `X-Next-Cursor` response header back as `cursor` for the next page.
     """
-    return CompanyController.get_all_companies(db)
+    try:
+        items, next_cursor = CompanyController.get_companies_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            include_histories=include_histories,
+            history_limit=history_limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+# ---------------- EXPORT COMPANIES ----------------
+@router.get("/companies/export", summary="Stream every company as NDJSON or CSV (admin only)")
+def export_companies(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    admin_user: Principal = Depends(require_role("admin")),
+):
+    """
+    Stream all companies in the same shape as GET /companies, with constant memory.
+    """
+    rows = CompanyController.stream_companies(RoutingSessionLocal)
+    return StreamingResponse(
+        export_stream(rows, export_format, COMPANY_EXPORT_COLUMNS),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="companies.{export_format}"'},
+    )
 
 @router.post("/company", summary="Create a new company (admin only)")
 def create_company(
     request: CompanyCreateRequest,
-    admin_user: User = Depends(require_role("admin")),  # Only admin can create
+    admin_user: Principal = Depends(require_role("admin")),  # Only admin can create
     db: Session = Depends(get_db)
 ):
     """
@@ -250,7 +410,7 @@ def create_company(
 def update_company(
     company_id: int,
     request: CompanyCreateRequest,
-    admin_user: User = Depends(require_role("admin")),  # Only admin
+    admin_user: Principal = Depends(require_role("admin")),  # Only admin
     db: Session = Depends(get_db)
 ):
     """
@@ -266,7 +426,7 @@ def update_company(
 @router.delete("/company/{company_id}", summary="Delete a company (admin only)")
 def delete_company(
     company_id: int,
-    admin_user: User = Depends(require_role("admin")),  # Only admin
+    admin_user: Principal = Depends(require_role("admin")),  # Only admin
     db: Session = Depends(get_db)
 ):
     """
@@ -283,7 +443,7 @@ def delete_company(
 def create_comment(
     company_id: int,
     request: CommentRequest,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -300,7 +460,7 @@ def create_comment(
 @router.get("/company/{company_id}/comments", summary="Get comments by company (authenticated)")
 def get_comments_by_company(
     company_id: int,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     return CompanyCommentController.get_comments_by_company_id(company_id, db)
@@ -309,7 +469,7 @@ def get_comments_by_company(
 @router.get("/comments/{comment_id}", summary="Get single comment")
 def get_comment(
     comment_id: int,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -322,7 +482,7 @@ def get_comment(
 def update_comment(
     comment_id: int,
     request: CommentRequest,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -342,7 +502,7 @@ def update_comment(
 @router.delete("/comments/{comment_id}", summary="Delete comment")
 def delete_comment(
     comment_id: int,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -354,4 +514,119 @@ def delete_comment(
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except PermissionError as e:
-        raise HTTPException(status_code=403, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=403, detail=str(e))
+
+# ---------------- CALL QUEUE ----------------
+@router.post("/call-queue/next", summary="Lease the next lead to dial (callers)")
+def next_lead_to_call(
+    user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Hand the calling caller the best lead of their team and lease it to
+    them until its call is logged, it is released, or
+    CALL_QUEUE_LEASE_SECONDS pass. 204 when nothing is dialable right now.
+    """
+    caller_id, team_id = call_queue.caller_for(db, user.email)
+    if caller_id is None:
+        raise HTTPException(status_code=403, detail="Not a caller")
+
+    lead = call_queue.next_lead(db, caller_id, team_id)
+    if lead is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return lead
+
+@router.post("/call-queue/{tracking_id}/release", summary="Give a leased lead back (callers)")
+def release_lead(
+    tracking_id: int,
+    user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    caller_id, _ = call_queue.caller_for(db, user.email)
+    if caller_id is None:
+        raise HTTPException(status_code=403, detail="Not a caller")
+
+    if not call_queue.release(db, caller_id, tracking_id):
+        raise HTTPException(status_code=404, detail="Lease not found")
+    return {"message": "Lead released"}
+
+
+# ---------------- CALL / EMAIL / SMS EVENTS ----------------
+@router.post("/events", summary="Ingest a batch of call, email and SMS events (any role)")
+def ingest_touch_events(
+    batch: TouchEventBatch,
+    user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Append the events to call_logs, email_logs and sms_logs. The derived
+    lead_team_tracking / lead_email_tracking / leads updates are applied
+    in the background, coalesced per lead.
+    """
+    if batch.size() > settings.EVENT_BATCH_MAX_SIZE:
+        raise HTTPException(status_code=413, detail=f"At most {settings.EVENT_BATCH_MAX_SIZE} events per batch")
+
+    try:
+        return TouchEventController.ingest(db, batch)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+# ---------------- ANALYTICS ----------------
+def analytics_window(
+    since: Optional[date] = Query(None, description="first day (default 30 days before until)"),
+    until: Optional[date] = Query(None, description="day after the last one (default tomorrow)"),
+):
+    until = until or date.today() + timedelta(days=1)
+    since = since or until - timedelta(days=30)
+    if since >= until:
+        raise HTTPException(status_code=400, detail="since must be before until")
+    if (until - since).days > settings.ANALYTICS_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.ANALYTICS_MAX_DAYS} days per query")
+    return since, until
+
+
+@router.get("/analytics/calls", summary="Calls per caller per day (Admin only)")
+def get_call_analytics(
+    admin_user: Principal = Depends(require_role("admin")),
+    window: tuple = Depends(analytics_window),
+    team_id: Optional[int] = None,
+    caller_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Served from the daily rollups, which trail the call log by up to
+    ANALYTICS_ROLLUP_INTERVAL_SECONDS.
+    """
+    return AnalyticsController.calls_per_caller(db, *window, team_id=team_id, caller_id=caller_id)
+
+
+@router.get("/analytics/result-codes", summary="Call result code distribution per team (Admin only)")
+def get_result_code_analytics(
+    admin_user: Principal = Depends(require_role("admin")),
+    window: tuple = Depends(analytics_window),
+    team_id: Optional[int] = None,
+    caller_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    return AnalyticsController.result_codes(db, *window, team_id=team_id, caller_id=caller_id)
+
+
+@router.get("/analytics/hot-conversions", summary="Leads turned hot per team per day (Admin only)")
+def get_hot_conversion_analytics(
+    admin_user: Principal = Depends(require_role("admin")),
+    window: tuple = Depends(analytics_window),
+    team_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    return AnalyticsController.hot_conversions(db, *window, team_id=team_id)
+
+
+@router.get("/analytics/email-status", summary="Emails per sender and status (Admin only)")
+def get_email_status_analytics(
+    admin_user: Principal = Depends(require_role("admin")),
+    window: tuple = Depends(analytics_window),
+    team_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    return AnalyticsController.email_status(db, *window, team_id=team_id)
@@ -0,0 +1,272 @@
+# routes/async_api.py
+#
+# Async versions of the lead, company and comment routes, used instead of
+# the ones in routes/api.py when settings.DB_ASYNC is on. They run on the
+# event loop with an AsyncSession, so a slow query no longer holds one of
+# the threadpool's worker threads. Every other route is taken unchanged
+# from routes/api.py.
+
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.controllers.async_company_comment_controller import AsyncCompanyCommentController
+from app.controllers.async_company_controller import AsyncCompanyController
+from app.controllers.async_lead_controller import AsyncLeadController
+from app.controllers.company_controller import DEFAULT_HISTORY_LIMIT, MAX_HISTORY_LIMIT
+from app.controllers.lead_controller import LEAD_LIST_FIELDS
+from app.middlewares.auth_middleware import get_async_db, get_current_user_async, require_role
+from app.schemas.company_comment_schema import CommentRequest
+from app.schemas.company_schema import CompanyCreateRequest
+from app.schemas.lead_schema import LeadCreateRequest, LeadUpdateRequest
+from routes import api
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, parse_fields
+from utils.principal_cache import Principal
+
+router = APIRouter()
+
+require_admin = require_role("admin", current_user=get_current_user_async)
+
+
+# ---------------- LEADS ----------------
+@router.post("/lead", summary="Create a new lead (admin only)")
+async def create_lead(
+    request: LeadCreateRequest,
+    admin_user: Principal = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create a new lead with the provided details.
+    Accessible only by users with 'admin' role.
+    """
+    return await AsyncLeadController.create_lead_in_db(request, db)
+
+@router.get("/leads", summary="Get leads, one page at a time (any role)")
+async def get_leads(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of lead fields"),
+    company_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    contact_type_id: Optional[int] = None,
+    lead_type_id: Optional[int] = None,
+    not_work_anymore: Optional[bool] = None,
+    follow_up_from: Optional[date] = None,
+    follow_up_to: Optional[date] = None,
+    user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Fetch one page of leads ordered by id. Pass the `X-Next-Cursor` response
+    header back as `cursor` to get the next page.
+    """
+    try:
+        items, next_cursor = await AsyncLeadController.get_leads_page(
+            db,
+            fields=parse_fields(fields, LEAD_LIST_FIELDS),
+            cursor=cursor,
+            limit=limit,
+            company_id=company_id,
+            user_id=user_id,
+            contact_type_id=contact_type_id,
+            lead_type_id=lead_type_id,
+            not_work_anymore=not_work_anymore,
+            follow_up_from=follow_up_from,
+            follow_up_to=follow_up_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+# ---------------- GET LEAD BY ID ----------------
+@router.get("/lead/{lead_id}", summary="Get a lead by ID (any role)")
+async def get_lead_by_id(
+    lead_id: int,
+    user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Fetch a single lead by its ID.
+    """
+    lead = await AsyncLeadController.get_lead_by_id(lead_id, db)
+    if not lead:
+        raise HTTPException(status_code=404, detail="Lead not found")
+    return lead
+
+# ---------------- GET LEAD BY AGENT ID ----------------
+@router.get("/lead/agent/{agent_id}", summary="Get a lead by agent ID (any role)")
+async def get_lead_by_agent_id(
+    agent_id: int,
+    user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Fetch the leads assigned to an agent.
+    """
+    lead = await AsyncLeadController.get_leads_for_user(agent_id, db)
+    if not lead:
+        raise HTTPException(status_code=404, detail="Lead not found")
+    return lead
+
+# ---------------- UPDATE LEAD ----------------
+@router.put("/lead/{lead_id}", summary="Update a lead by ID (any role)")
+async def update_lead(
+    lead_id: int,
+    updates: LeadUpdateRequest,
+    user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update an existing lead by ID. Only fields provided are updated.
+    """
+    return await AsyncLeadController.update_lead(lead_id, updates, db)
+
+# ---------------- COMPANY ----------------
+@router.get("/companies", summary="Get companies, one page at a time (admin only)")
+async def get_companies(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    include_histories: bool = True,
+    history_limit: int = Query(DEFAULT_HISTORY_LIMIT, ge=1, le=MAX_HISTORY_LIMIT),
+    admin_user: Principal = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Returns one page of companies, newest first, each with its latest
+    `history_limit` history entries (omitted when include_histories=false).
+    """
+    try:
+        items, next_cursor = await AsyncCompanyController.get_companies_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            include_histories=include_histories,
+            history_limit=history_limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+@router.post("/company", summary="Create a new company (admin only)")
+async def create_company(
+    request: CompanyCreateRequest,
+    admin_user: Principal = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create a new company with the provided details.
+    """
+    return await AsyncCompanyController.create_company_in_db(request, db)
+
+# ---------------- UPDATE COMPANY ----------------
+@router.put("/company/{company_id}", summary="Update a company (admin only)")
+async def update_company(
+    company_id: int,
+    request: CompanyCreateRequest,
+    admin_user: Principal = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update an existing company by ID.
+    """
+    try:
+        return await AsyncCompanyController.update_company(company_id, request, db, current_user=admin_user)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# ---------------- DELETE COMPANY ----------------
+@router.delete("/company/{company_id}", summary="Delete a company (admin only)")
+async def delete_company(
+    company_id: int,
+    admin_user: Principal = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete a company by ID.
+    """
+    try:
+        return await AsyncCompanyController.delete_company(company_id, db)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+# ---------------- CREATE COMMENT ----------------
+@router.post("/company/{company_id}/comments", summary="Create comment (authenticated)")
+async def create_comment(
+    company_id: int,
+    request: CommentRequest,
+    user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        return await AsyncCompanyCommentController.create_comment(company_id, request.message, db, current_user=user)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# ---------------- GET COMMENTS BY COMPANY ----------------
+@router.get("/company/{company_id}/comments", summary="Get comments by company (authenticated)")
+async def get_comments_by_company(
+    company_id: int,
+    user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await AsyncCompanyCommentController.get_comments_by_company_id(company_id, db)
+
+# ---------------- GET SINGLE COMMENT ----------------
+@router.get("/comments/{comment_id}", summary="Get single comment")
+async def get_comment(
+    comment_id: int,
+    user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        return await AsyncCompanyCommentController.get_comment(comment_id, db)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+# ---------------- UPDATE COMMENT ----------------
+@router.put("/comments/{comment_id}", summary="Update comment")
+async def update_comment(
+    comment_id: int,
+    request: CommentRequest,
+    user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        return await AsyncCompanyCommentController.update_comment(comment_id, request.message, db, current_user=user)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+# ---------------- DELETE COMMENT ----------------
+@router.delete("/comments/{comment_id}", summary="Delete comment")
+async def delete_comment(
+    comment_id: int,
+    user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        return await AsyncCompanyCommentController.delete_comment(comment_id, db, current_user=user)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+
+# ---------------- EVERYTHING ELSE ----------------
+# Keep routes/api.py's order so e.g. /leads/export still precedes /lead/{lead_id}
+_async_routes = {(route.path, frozenset(route.methods)): route for route in router.routes}
+router.routes[:] = [
+    _async_routes.get((route.path, frozenset(route.methods)), route)
+    for route in api.router.routes
+]
@@ -0,0 +1,28 @@
+# routes/metrics.py
+#
+# Prometheus scrape endpoint, mounted at the root (not under /api).
+
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from config.settings import settings
+from utils.metrics import collect, render
+
+router = APIRouter()
+
+
+# ---------------- METRICS ----------------
+@router.get("/metrics", summary="Prometheus metrics", include_in_schema=False)
+def get_metrics(request: Request):
+    """
+    Request counts and latency per route, in-flight requests, SQL per
+    request, cache hit rates and auth failures, summed over all workers.
+    """
+    if settings.METRICS_TOKEN:
+        supplied = request.headers.get("authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(supplied, settings.METRICS_TOKEN):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+    return PlainTextResponse(render(collect()), media_type="text/plain; version=0.0.4")
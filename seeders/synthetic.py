@@ -0,0 +1,224 @@
+"""
+Synthetic data at benchmark scale, on top of the regular seeders.
+
+Adds `bench-user<N>@example.com` users (password123) with sessions,
+companies with histories and comments, and leads spread over them. Rows
+are bulk inserted in batches, so 1M leads take minutes, not hours. Skipped
+if the synthetic data is already there.
+
+    python -m seeders.synthetic --scale medium
+    python -m seeders.synthetic --leads 250000 --companies 5000
+"""
+import argparse
+import random
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterator, List, Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from database.db import SessionLocal
+from app.models.company import Company
+from app.models.company_comment import CompanyComment
+from app.models.company_history import CompanyHistory
+from app.models.contact_type_option import ContactTypeOption
+from app.models.lead import Lead
+from app.models.lead_type_option import LeadTypeOption
+from app.models.role import Role
+from app.models.timezone import Timezone
+from app.models.token import UserToken
+from app.models.user import User, user_roles
+from seeders.contact_type import run_contact_type_option_seeder
+from seeders.lead_type import run_lead_type_option_seeder
+from seeders.timezone import run_timezone_seeder
+from seeders.user import hash_password, run_seeder
+from utils.jwt_helper import hash_token
+
+SCALES = {
+    "tiny": dict(users=20, tokens_per_user=3, companies=200, histories_per_company=3, comments_per_company=2, leads=10_000),
+    "small": dict(users=100, tokens_per_user=5, companies=2_000, histories_per_company=5, comments_per_company=3, leads=100_000),
+    "medium": dict(users=500, tokens_per_user=5, companies=10_000, histories_per_company=10, comments_per_company=5, leads=300_000),
+    "large": dict(users=2_000, tokens_per_user=10, companies=50_000, histories_per_company=10, comments_per_company=5, leads=1_000_000),
+}
+
+BATCH_SIZE = 5000
+SYNTHETIC_PASSWORD = "password123"
+
+
+def insert_batches(db: Session, model, rows: Iterator[dict], batch_size: int = BATCH_SIZE) -> int:
+    inserted = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            db.execute(insert(model), batch)
+            db.commit()
+            inserted += len(batch)
+            batch = []
+    if batch:
+        db.execute(insert(model), batch)
+        db.commit()
+        inserted += len(batch)
+    return inserted
+
+
+def _ids(db: Session, column) -> List[int]:
+    return list(db.scalars(select(column).order_by(column)))
+
+
+def seed_users(db: Session, count: int, tokens_per_user: int, rng: random.Random) -> List[int]:
+    # One bcrypt hash shared by every synthetic user keeps seeding fast
+    password = hash_password(SYNTHETIC_PASSWORD)
+    insert_batches(db, User, (
+        {"email": f"bench-user{i}@example.com", "username": f"bench-user{i}", "password": password}
+        for i in range(count)
+    ))
+    user_ids = list(db.scalars(select(User.id).where(User.email.like("bench-user%")).order_by(User.id)))
+
+    role_ids = _ids(db, Role.id)
+    insert_batches(db, user_roles, ({"user_id": uid, "role_id": rng.choice(role_ids)} for uid in user_ids))
+
+    now = datetime.utcnow()
+
+    def tokens():
+        for user_id in user_ids:
+            for _ in range(tokens_per_user):
+                raw = f"{rng.getrandbits(128):032x}"
+                # A mix of live and expired sessions, like a real user_tokens table
+                expires_at = now + timedelta(hours=rng.randint(-24 * 14, 24 * 7))
+                yield {
+                    "user_id": user_id,
+                    "access_token_hash": hash_token(f"access-{raw}"),
+                    "refresh_token_hash": hash_token(f"refresh-{raw}"),
+                    "expires_at": expires_at,
+                    "created_at": expires_at - timedelta(days=7),
+                }
+
+    insert_batches(db, UserToken, tokens())
+    return user_ids
+
+
+def seed_companies(db: Session, count: int, histories: int, comments: int,
+                   user_ids: List[int], rng: random.Random) -> List[int]:
+    timezone_ids = _ids(db, Timezone.id)
+    insert_batches(db, Company, (
+        {
+            "name": f"Bench Company {i}",
+            "symbol": f"B{i}",
+            "timezone_id": rng.choice(timezone_ids),
+            "country": "US",
+            "city": "New York",
+            "is_otc": i % 7 == 0,
+        }
+        for i in range(count)
+    ))
+    company_ids = list(db.scalars(
+        select(Company.id).where(Company.name.like("Bench Company %")).order_by(Company.id)
+    ))
+
+    start = datetime.utcnow() - timedelta(days=365)
+
+    def per_company(n: int, make: Callable[[int, int, datetime], dict]):
+        for company_id in company_ids:
+            for j in range(n):
+                yield make(company_id, j, start + timedelta(minutes=rng.randint(0, 525_600)))
+
+    insert_batches(db, CompanyHistory, per_company(histories, lambda cid, j, at: {
+        "company_id": cid,
+        "user_id": rng.choice(user_ids),
+        "history": f"{at:%Y-%m-%d %H:%M:%S} - Modified by bench - Company city change {j}",
+        "changed_at": at,
+    }))
+    insert_batches(db, CompanyComment, per_company(comments, lambda cid, j, at: {
+        "company_id": cid,
+        "user_id": rng.choice(user_ids),
+        "comment": f"Synthetic comment {j}",
+        "created_at": at,
+    }))
+    return company_ids
+
+
+def seed_leads(db: Session, count: int, company_ids: List[int], user_ids: List[int], rng: random.Random) -> int:
+    contact_type_ids = _ids(db, ContactTypeOption.id)
+    lead_type_ids = _ids(db, LeadTypeOption.id)
+    today = date.today()
+
+    return insert_batches(db, Lead, (
+        {
+            "full_name": f"Bench Lead {i}",
+            "company_id": rng.choice(company_ids),
+            "user_id": rng.choice(user_ids),
+            "contact_type_id": rng.choice(contact_type_ids),
+            "lead_type_id": rng.choice(lead_type_ids),
+            "role": rng.choice(("CEO", "CFO", "IR", "COO")),
+            "email": f"bench-lead{i}@example.com",
+            "phone": f"555-{i:07d}",
+            "timezone": rng.choice(("EST", "CST", "MST", "PST")),
+            "timezone_priority": rng.randint(1, 4),
+            "follow_up_date": today + timedelta(days=rng.randint(-30, 60)),
+            "not_work_anymore": rng.random() < 0.05,
+        }
+        for i in range(count)
+    ))
+
+
+def run_synthetic_seeder(
+    users: int,
+    tokens_per_user: int,
+    companies: int,
+    histories_per_company: int,
+    comments_per_company: int,
+    leads: int,
+    seed: Optional[int] = 42,
+):
+    run_seeder()
+    run_timezone_seeder()
+    run_contact_type_option_seeder()
+    run_lead_type_option_seeder()
+
+    rng = random.Random(seed)
+    db = SessionLocal()
+    try:
+        if db.scalar(select(func.count()).select_from(User).where(User.email.like("bench-user%"))):
+            print("✅ Synthetic data already present, nothing to do")
+            return
+
+        user_ids = seed_users(db, users, tokens_per_user, rng)
+        company_ids = seed_companies(db, companies, histories_per_company, comments_per_company, user_ids, rng)
+        lead_count = seed_leads(db, leads, company_ids, user_ids, rng)
+
+        print(
+            f"✅ Synthetic seeder executed successfully ({len(user_ids)} users, "
+            f"{len(company_ids)} companies, {lead_count} leads)"
+        )
+
+    except Exception as e:
+        print("❌ Synthetic seeder failed:", e)
+
+    finally:
+        db.close()
+
+
+def scale_arguments(parser: argparse.ArgumentParser):
+    """
+    --scale plus per-table overrides; shared with the benchmark suite.
+    """
+    parser.add_argument("--scale", default="small", choices=sorted(SCALES))
+    for name in SCALES["small"]:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def scale_from_arguments(args: argparse.Namespace) -> dict:
+    scale = dict(SCALES[args.scale])
+    for name in scale:
+        if getattr(args, name) is not None:
+            scale[name] = getattr(args, name)
+    return scale
+
+
+if __name__ == "__main__":
+    _parser = argparse.ArgumentParser(description="Seed synthetic benchmark data")
+    scale_arguments(_parser)
+    _args = _parser.parse_args()
+    run_synthetic_seeder(**scale_from_arguments(_args), seed=_args.seed)
@@ -1,16 +1,14 @@
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 
 from database.db import SessionLocal
 from app.models.user import User
 from app.models.role import Role
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from utils.password_hasher import password_hasher
 
 
 def hash_password(password: str) -> str:
     truncated = password.encode("utf-8")[:72].decode("utf-8", "ignore")
-    return pwd_context.hash(truncated)
+    return password_hasher.hash(truncated)
 
 
 def get_or_create_role(db: Session, role_name: str) -> Role:
@@ -0,0 +1,126 @@
+"""
+Query budgets for the hottest read routes: a change that adds a query per
+row (or per request) fails here instead of in production.
+
+Runs against a throwaway SQLite file registered as both the primary and a
+read replica, so routed reads are counted too:
+
+    python -m pytest tests
+    python -m unittest discover tests
+"""
+import os
+import unittest
+
+from benchmarks.support import use_scratch_database
+
+_url = use_scratch_database()
+os.environ["DATABASE_REPLICA_URLS"] = _url
+os.environ["LOG_FILE"] = ""
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+import main  # noqa: E402
+from database.db import SessionLocal, engine as primary_engine  # noqa: E402
+from database.sql_profiler import QueryCountExceeded, assert_max_queries  # noqa: E402
+from app.models.role import Role  # noqa: E402
+from app.models.user import User, user_roles  # noqa: E402
+from migrations.bootstrap import run_bootstrap  # noqa: E402
+from seeders.synthetic import run_synthetic_seeder  # noqa: E402
+from utils.principal_cache import principal_cache  # noqa: E402
+from utils.reference_cache import reference_cache  # noqa: E402
+
+PASSWORD = "password123"
+
+
+class QueryBudgetTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        run_bootstrap()
+        run_synthetic_seeder(
+            users=6, tokens_per_user=0, companies=30, histories_per_company=3, comments_per_company=0, leads=60,
+        )
+        with SessionLocal() as db:
+            cls.admin_email = db.scalar(
+                select(User.email)
+                .join(user_roles, user_roles.c.user_id == User.id)
+                .join(Role, Role.id == user_roles.c.role_id)
+                .where(Role.name == "admin")
+                .limit(1)
+            )
+        cls.client = TestClient(main.app)
+
+    def login(self) -> dict:
+        response = self.client.post("/api/login", json={"email": self.admin_email, "password": PASSWORD})
+        self.assertEqual(response.status_code, 200)
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    def get_within(self, max_queries: int, path: str, headers: dict):
+        with assert_max_queries(max_queries):
+            response = self.client.get(path, headers=headers)
+        self.assertEqual(response.status_code, 200, response.text)
+        return response
+
+    def warm(self, path: str, headers: dict):
+        # Principal and reference-data caches filled, as on a busy worker
+        self.client.get(path, headers=headers)
+
+    # =====================================
+    # WARM BUDGETS
+    # =====================================
+    def test_companies_page(self):
+        auth = self.login()
+        self.warm("/api/companies", auth)
+        # companies page + history summaries for the whole page
+        response = self.get_within(2, "/api/companies", auth)
+        self.assertTrue(response.json())
+
+    def test_companies_page_without_histories(self):
+        auth = self.login()
+        self.warm("/api/companies?include_histories=false", auth)
+        self.get_within(1, "/api/companies?include_histories=false", auth)
+
+    def test_leads_page(self):
+        auth = self.login()
+        self.warm("/api/leads", auth)
+        # one joined page query; labels come from the reference cache
+        response = self.get_within(1, "/api/leads", auth)
+        self.assertTrue(response.json())
+
+    def test_me(self):
+        auth = self.login()
+        self.warm("/api/me", auth)
+        self.get_within(0, "/api/me", auth)
+
+    # =====================================
+    # COLD BUDGETS
+    # =====================================
+    def test_me_with_unverified_token(self):
+        auth = self.login()
+        principal_cache.clear()
+        # session row + user with roles
+        self.get_within(2, "/api/me", auth)
+
+    def test_leads_page_after_reference_reload(self):
+        auth = self.login()
+        self.warm("/api/me", auth)
+        reference_cache.invalidate()
+        # page query + lead types, contact types and timezones, once each
+        self.get_within(4, "/api/leads", auth)
+
+    # =====================================
+    # REPLICA READS ARE COUNTED
+    # =====================================
+    def test_counts_replica_reads(self):
+        auth = self.login()
+        self.warm("/api/companies", auth)
+        with assert_max_queries(0, engine=primary_engine):
+            self.client.get("/api/companies", headers=auth)
+        with self.assertRaises(QueryCountExceeded):
+            with assert_max_queries(0):
+                self.client.get("/api/companies", headers=auth)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,285 @@
+"""
+Next-lead dispatch for callers.
+
+Each worker keeps, per team, an ordered batch of dialable leads loaded from
+lead_team_tracking: inside the calling window, follow-up date due, not
+leased, not called yet today, ordered by Lead.timezone_priority, follow-up
+date and lead type.
+A caller takes the best few entries they may dial and claims one in the
+database with SELECT ... FOR UPDATE SKIP LOCKED plus a conditional UPDATE
+of its lease, so two callers, in this worker or another, never get the
+same lead. The batch is reloaded when it runs dry or gets stale.
+
+A lease lasts until it expires, the caller releases it, or a call on that
+row is logged (jobs.touch_rollups clears it and sets last_called_date, which
+keeps the lead out of the queue for the rest of the day).
+"""
+import bisect
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import and_, case, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from app.models.company import Company
+from app.models.crm import Caller, LeadTeamTracking
+from app.models.lead import Lead
+from utils.reference_cache import reference_cache
+
+# Entries taken from the batch per claim attempt
+CLAIM_CANDIDATES = 8
+# Claim attempts before giving up when other callers keep winning
+CLAIM_ROUNDS = 3
+
+
+@dataclass(order=True)
+class QueuedLead:
+    position: int
+    tracking_id: int = field(compare=False)
+    lead_id: int = field(compare=False)
+    assigned_to: Optional[int] = field(compare=False)
+    payload: dict = field(compare=False)
+
+    def dialable_by(self, caller_id: int) -> bool:
+        return self.assigned_to is None or self.assigned_to == caller_id
+
+
+@dataclass
+class TeamQueue:
+    entries: List[QueuedLead] = field(default_factory=list)
+    loaded_at: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def lease_free(now: datetime):
+    return or_(LeadTeamTracking.lease_expires_at.is_(None), LeadTeamTracking.lease_expires_at <= now)
+
+
+def not_called_today(now: datetime):
+    return or_(LeadTeamTracking.last_called_date.is_(None), LeadTeamTracking.last_called_date < now.date())
+
+
+def calling_window_timezones(now: Optional[datetime] = None) -> Tuple[List[str], List[str]]:
+    """
+    (labels of zones inside the calling window now, every known label).
+    A zone is known by its key in CALL_QUEUE_TIMEZONES ("EST") and by
+    timezone table labels ending with it ("1 - EST").
+    """
+    now = now or datetime.now(timezone.utc)
+    timezone_labels = [item["label"] for item in reference_cache.get("timezones")[0]]
+
+    open_labels, known_labels = [], []
+    for abbreviation, zone in settings.CALL_QUEUE_TIMEZONES.items():
+        labels = [abbreviation] + [label for label in timezone_labels if (label or "").split()[-1:] == [abbreviation]]
+        known_labels += labels
+        local_hour = now.astimezone(ZoneInfo(zone)).hour
+        if settings.CALL_QUEUE_WINDOW_START_HOUR <= local_hour < settings.CALL_QUEUE_WINDOW_END_HOUR:
+            open_labels += labels
+    return open_labels, known_labels
+
+
+def lead_type_rank():
+    labels = {item["label"]: item["id"] for item in reference_cache.get("lead_types")[0]}
+    ranks = {labels[label]: rank for rank, label in enumerate(settings.CALL_QUEUE_LEAD_TYPE_ORDER) if label in labels}
+    if not ranks:
+        return literal(0)
+    return case(ranks, value=LeadTeamTracking.lead_type_id, else_=len(ranks))
+
+
+class CallQueue:
+    def __init__(self, lease_seconds: int, batch_size: int, refresh_seconds: float):
+        self.lease_seconds = lease_seconds
+        self.batch_size = batch_size
+        self.refresh_seconds = refresh_seconds
+        self._teams: Dict[int, TeamQueue] = {}
+        self._callers: Dict[str, Tuple[float, Optional[int], Optional[int]]] = {}
+        self._lock = threading.Lock()
+
+    def caller_for(self, db: Session, email: str) -> Tuple[Optional[int], Optional[int]]:
+        """
+        (caller_id, team_id) of the caller with this email, or (None, None).
+        Callers are matched to logged-in users by email; cached like the batch.
+        """
+        cached = self._callers.get(email)
+        if cached and cached[0] + self.refresh_seconds > time.monotonic():
+            return cached[1], cached[2]
+
+        caller = db.execute(
+            select(Caller.caller_id, Caller.team_id).where(Caller.email == email).limit(1)
+        ).first()
+        caller_id, team_id = caller if caller else (None, None)
+        self._callers[email] = (time.monotonic(), caller_id, team_id)
+        return caller_id, team_id
+
+    # ------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------
+
+    def _team(self, team_id: int) -> TeamQueue:
+        queue = self._teams.get(team_id)
+        if queue is None:
+            with self._lock:
+                queue = self._teams.setdefault(team_id, TeamQueue())
+        return queue
+
+    def load_batch(self, db: Session, team_id: int, now: datetime) -> List[QueuedLead]:
+        open_labels, known_labels = calling_window_timezones()
+        tracking = LeadTeamTracking
+        rows = db.execute(
+            select(
+                tracking.id, tracking.lead_id, tracking.to_be_called_by, tracking.follow_up_date,
+                tracking.lead_type_id, Lead.full_name, Lead.phone, Lead.phone_extension,
+                Lead.timezone, Company.name.label("company_name"),
+            )
+            .join(Lead, Lead.id == tracking.lead_id)
+            .outerjoin(Company, Company.id == Lead.company_id)
+            .where(
+                tracking.team_id == team_id,
+                lease_free(now),
+                not_called_today(now),
+                or_(tracking.follow_up_date.is_(None), tracking.follow_up_date <= now.date()),
+                Lead.not_work_anymore.isnot(True),
+                or_(Lead.timezone.is_(None), Lead.timezone.in_(open_labels), Lead.timezone.notin_(known_labels)),
+            )
+            .order_by(
+                Lead.timezone_priority.asc().nulls_last(),
+                tracking.follow_up_date.asc().nulls_last(),
+                lead_type_rank(),
+                tracking.id,
+            )
+            .limit(self.batch_size)
+        ).all()
+
+        return [
+            QueuedLead(
+                position=position,
+                tracking_id=row.id,
+                lead_id=row.lead_id,
+                assigned_to=row.to_be_called_by,
+                payload={
+                    "tracking_id": row.id,
+                    "lead_id": row.lead_id,
+                    "full_name": row.full_name,
+                    "phone": row.phone,
+                    "phone_extension": row.phone_extension,
+                    "timezone": row.timezone,
+                    "company_name": row.company_name,
+                    "follow_up_date": row.follow_up_date,
+                    "lead_type": reference_cache.label("lead_types", row.lead_type_id),
+                },
+            )
+            for position, row in enumerate(rows)
+        ]
+
+    def _take_candidates(self, db: Session, team_id: int, caller_id: int, now: datetime) -> List[QueuedLead]:
+        queue = self._team(team_id)
+        with queue.lock:
+            stale = queue.loaded_at + self.refresh_seconds < time.monotonic()
+            if stale or not any(entry.dialable_by(caller_id) for entry in queue.entries):
+                queue.entries = self.load_batch(db, team_id, now)
+                queue.loaded_at = time.monotonic()
+
+            taken = [entry for entry in queue.entries if entry.dialable_by(caller_id)][:CLAIM_CANDIDATES]
+            for entry in taken:
+                queue.entries.remove(entry)
+            return taken
+
+    def _put_back(self, team_id: int, entries: List[QueuedLead]):
+        queue = self._team(team_id)
+        with queue.lock:
+            for entry in entries:
+                bisect.insort(queue.entries, entry)
+
+    # ------------------------------------------------------------
+    # Leasing
+    # ------------------------------------------------------------
+
+    def next_lead(self, db: Session, caller_id: int, team_id: int) -> Optional[dict]:
+        """
+        Lease the best lead `caller_id` may dial and return it, or None when
+        the team has nothing dialable. Earlier leases of the caller are kept:
+        the lead they just dialed must not come back before its call is
+        logged.
+        """
+        now = datetime.now(timezone.utc)
+        tracking = LeadTeamTracking
+
+        # The batch is picked from before anything is written, so no caller
+        # waits on the team lock while holding row locks
+        for _ in range(CLAIM_ROUNDS):
+            candidates = self._take_candidates(db, team_id, caller_id, now)
+            if not candidates:
+                break
+
+            # Rows another caller holds (lease or row lock) are skipped, not waited for
+            free_ids = set(db.scalars(
+                select(tracking.id)
+                .where(tracking.id.in_([c.tracking_id for c in candidates]), lease_free(now), not_called_today(now))
+                .with_for_update(skip_locked=True)
+            ))
+
+            for position, candidate in enumerate(candidates):
+                if candidate.tracking_id not in free_ids:
+                    continue
+
+                lease_expires_at = now + timedelta(seconds=self.lease_seconds)
+                claimed = db.execute(
+                    update(tracking)
+                    .where(
+                        tracking.id == candidate.tracking_id,
+                        lease_free(now),
+                        not_called_today(now),
+                        or_(tracking.to_be_called_by.is_(None), tracking.to_be_called_by == caller_id),
+                    )
+                    .values(leased_by=caller_id, lease_expires_at=lease_expires_at)
+                ).rowcount
+                if claimed:
+                    db.commit()
+                    self._put_back(team_id, [c for c in candidates[position + 1:] if c.tracking_id in free_ids])
+                    return {**candidate.payload, "lease_expires_at": lease_expires_at}
+
+            # Every candidate was taken elsewhere; they are dropped from the batch
+            db.rollback()
+
+        db.rollback()
+        return None
+
+    def release(self, db: Session, caller_id: int, tracking_id: int) -> bool:
+        """
+        Give a leased lead back to the queue. False when `caller_id` does
+        not hold it.
+        """
+        released = db.execute(
+            update(LeadTeamTracking)
+            .where(and_(LeadTeamTracking.id == tracking_id, LeadTeamTracking.leased_by == caller_id))
+            .values(leased_by=None, lease_expires_at=None)
+        ).rowcount
+        db.commit()
+
+        if released:
+            # Reload on the next request so the lead is back in line
+            queue = self._teams.get(self._team_of(db, tracking_id))
+            if queue:
+                queue.loaded_at = 0.0
+        return bool(released)
+
+    @staticmethod
+    def _team_of(db: Session, tracking_id: int) -> Optional[int]:
+        return db.scalar(select(LeadTeamTracking.team_id).where(LeadTeamTracking.id == tracking_id))
+
+    def clear(self):
+        with self._lock:
+            self._teams.clear()
+            self._callers.clear()
+
+
+call_queue = CallQueue(
+    lease_seconds=settings.CALL_QUEUE_LEASE_SECONDS,
+    batch_size=settings.CALL_QUEUE_BATCH_SIZE,
+    refresh_seconds=settings.CALL_QUEUE_REFRESH_SECONDS,
+)
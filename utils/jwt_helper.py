@@ -1,3 +1,5 @@
+import hashlib
+import uuid
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
 from config.settings import settings
@@ -12,12 +14,14 @@ REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
 def create_access_token(data: dict):
     payload = data.copy()
     payload["exp"] = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    payload["jti"] = uuid.uuid4().hex
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
 def create_refresh_token(data: dict):
     payload = data.copy()
     payload["exp"] = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    payload["jti"] = uuid.uuid4().hex
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
@@ -26,3 +30,10 @@ def decode_token(token: str):
         return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         return None
+
+
+def hash_token(token: str) -> bytes:
+    """
+    Fixed-length SHA-256 digest of a token, used as a lookup key.
+    """
+    return hashlib.sha256(token.encode("utf-8")).digest()
@@ -0,0 +1,282 @@
+"""
+Prometheus-style metrics, served as text on GET /metrics.
+
+Every observation takes one short lock on the process registry. With
+several gunicorn workers, each worker also writes its registry to
+METRICS_DIR/<pid>.json every METRICS_FLUSH_SECONDS; /metrics adds the files
+of the other workers to its own numbers, so any worker can answer a scrape.
+A worker that has exited leaves its file behind and the next live worker
+folds those counts into its own, so totals never go backwards.
+"""
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.settings import settings
+
+# Upper bounds of the histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# name -> (type, help, histogram buckets)
+METRICS = {
+    "http_requests_total": ("counter", "HTTP requests by route template, method and status", None),
+    "http_request_duration_seconds": ("histogram", "HTTP request latency", LATENCY_BUCKETS),
+    "http_requests_in_flight": ("gauge", "HTTP requests being served", None),
+    "http_request_db_queries": ("histogram", "SQL statements per HTTP request", QUERY_COUNT_BUCKETS),
+    "http_request_db_duration_seconds": ("histogram", "Time spent in SQL per HTTP request", LATENCY_BUCKETS),
+    "cache_requests_total": ("counter", "In-process cache lookups by cache and result", None),
+    "auth_failures_total": ("counter", "Requests rejected with 401 or 403", None),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: dict) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+# ============================================================
+# Per-process registry
+# ============================================================
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters: Dict[Tuple[str, Labels], float] = {}
+            self.gauges: Dict[Tuple[str, Labels], float] = {}
+            # (name, labels) -> [count per bucket..., +Inf count, sum]
+            self.histograms: Dict[Tuple[str, Labels], List[float]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def add_gauge(self, name: str, value: float, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            self.gauges[key] = self.gauges.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        buckets = METRICS[name][2]
+        key = (name, _labels(labels))
+        index = next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))
+        with self._lock:
+            series = self.histograms.get(key)
+            if series is None:
+                series = self.histograms[key] = [0] * (len(buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": [[n, list(l), v] for (n, l), v in self.counters.items()],
+                "gauges": [[n, list(l), v] for (n, l), v in self.gauges.items()],
+                "histograms": [[n, list(l), list(s)] for (n, l), s in self.histograms.items()],
+            }
+
+    def absorb(self, snapshot: dict):
+        """
+        Add the counters and histograms of an exited worker to this one.
+        Gauges describe a live process and are dropped.
+        """
+        with self._lock:
+            for name, labels, value in snapshot["counters"]:
+                key = (name, tuple(map(tuple, labels)))
+                self.counters[key] = self.counters.get(key, 0) + value
+            for name, labels, series in snapshot["histograms"]:
+                key = (name, tuple(map(tuple, labels)))
+                current = self.histograms.setdefault(key, [0] * len(series))
+                for i, value in enumerate(series):
+                    current[i] += value
+
+
+metrics = MetricsRegistry()
+
+
+# ============================================================
+# Recording helpers
+# ============================================================
+
+def record_request(method: str, route: Optional[str], status: int, seconds: float,
+                   db_queries: int, db_seconds: float):
+    route = route or "unmatched"  # keep unknown paths from creating new series
+    metrics.inc("http_requests_total", method=method, route=route, status=status)
+    metrics.observe("http_request_duration_seconds", seconds, route=route, status=status)
+    metrics.observe("http_request_db_queries", db_queries, route=route)
+    metrics.observe("http_request_db_duration_seconds", db_seconds, route=route)
+    if status in (401, 403):
+        metrics.inc("auth_failures_total", route=route, status=status)
+
+
+def record_cache(cache: str, hit: bool):
+    metrics.inc("cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+# ============================================================
+# Sharing between workers
+# ============================================================
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _snapshot_files(directory: str) -> Iterable[Tuple[int, str]]:
+    for filename in os.listdir(directory):
+        stem, ext = os.path.splitext(filename)
+        if ext == ".json" and stem.isdigit():
+            yield int(stem), os.path.join(directory, filename)
+
+
+def _read(path: str) -> Optional[dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def flush(directory: Optional[str] = None):
+    directory = directory or settings.METRICS_DIR
+    path = os.path.join(directory, f"{os.getpid()}.json")
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(metrics.snapshot(), f)
+    os.replace(f"{path}.tmp", path)
+
+
+def absorb_exited_workers(directory: Optional[str] = None):
+    directory = directory or settings.METRICS_DIR
+    for pid, path in list(_snapshot_files(directory)):
+        if pid == os.getpid() or _pid_alive(pid):
+            continue
+
+        # Renaming claims the file, so only one live worker absorbs it
+        claimed = f"{path}.{os.getpid()}.absorbing"
+        try:
+            os.rename(path, claimed)
+        except OSError:
+            continue
+
+        snapshot = _read(claimed)
+        if snapshot:
+            metrics.absorb(snapshot)
+            flush(directory)
+        os.remove(claimed)
+
+
+def collect() -> List[dict]:
+    """
+    This process's registry plus the latest snapshot of every other live
+    worker sharing METRICS_DIR.
+    """
+    snapshots = [metrics.snapshot()]
+    if settings.METRICS_DIR and os.path.isdir(settings.METRICS_DIR):
+        for pid, path in _snapshot_files(settings.METRICS_DIR):
+            if pid != os.getpid() and _pid_alive(pid):
+                snapshot = _read(path)
+                if snapshot:
+                    snapshots.append(snapshot)
+    return snapshots
+
+
+class MetricsFlusher:
+    """
+    Background thread that shares this worker's registry via METRICS_DIR.
+    Does nothing when METRICS_DIR is unset (single process).
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if not settings.METRICS_DIR or self.interval <= 0:
+            return
+
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        flush()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                absorb_exited_workers()
+                flush()
+            except OSError:
+                pass
+
+
+metrics_flusher = MetricsFlusher(settings.METRICS_FLUSH_SECONDS)
+
+
+# ============================================================
+# Text exposition format
+# ============================================================
+
+def _format_labels(labels: Iterable, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [tuple(pair) for pair in labels] + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render(snapshots: List[dict]) -> str:
+    merged: Dict[str, Dict[Tuple, object]] = {name: {} for name in METRICS}
+    for snapshot in snapshots:
+        for kind in ("counters", "gauges"):
+            for name, labels, value in snapshot[kind]:
+                key = tuple(map(tuple, labels))
+                merged[name][key] = merged[name].get(key, 0) + value
+        for name, labels, series in snapshot["histograms"]:
+            key = tuple(map(tuple, labels))
+            current = merged[name].setdefault(key, [0] * len(series))
+            for i, value in enumerate(series):
+                current[i] += value
+
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in sorted(merged[name].items()):
+            if kind != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {_number(value)}")
+                continue
+
+            cumulative = 0
+            for bound, count in zip([*buckets, "+Inf"], value[:-1]):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(bound)
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', le))} {_number(cumulative)}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_number(value[-1])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {_number(cumulative)}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,146 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import List, Optional, Tuple
+
+from passlib.context import CryptContext
+from passlib.registry import get_crypt_handler
+
+from config.settings import settings
+
+
+# ============================================================
+# Hashing cost profiles
+# ============================================================
+
+# The first scheme hashes new passwords; hashes made with any later scheme, or
+# with fewer rounds than the profile asks for, are upgraded on next login.
+HASH_PROFILES = {
+    # Unit tests / local seeding: as cheap as bcrypt allows
+    "fast": {
+        "schemes": ["bcrypt"],
+        "bcrypt__rounds": 4,
+    },
+    "default": {
+        "schemes": ["bcrypt"],
+        "bcrypt__rounds": 12,
+    },
+    # Requires argon2-cffi
+    "strong": {
+        "schemes": ["argon2", "bcrypt"],
+        "argon2__time_cost": 3,
+        "argon2__memory_cost": 65536,
+        "argon2__parallelism": 2,
+        "bcrypt__rounds": 12,
+    },
+}
+
+
+def build_crypt_context(
+    profile: str,
+    schemes: Optional[List[str]] = None,
+    bcrypt_rounds: Optional[int] = None,
+) -> CryptContext:
+    if profile not in HASH_PROFILES:
+        raise ValueError(f"Unknown password hash profile: {profile}")
+
+    options = dict(HASH_PROFILES[profile])
+    if schemes:
+        options["schemes"] = schemes
+    if bcrypt_rounds:
+        options["bcrypt__rounds"] = bcrypt_rounds
+
+    for scheme in options["schemes"]:
+        handler = get_crypt_handler(scheme)
+        if hasattr(handler, "has_backend") and not handler.has_backend():
+            raise RuntimeError(f"Password scheme '{scheme}' has no backend installed")
+
+    # Treat the configured cost as the minimum so weaker hashes get rehashed
+    for key in [k for k in options if k.endswith("__rounds")]:
+        scheme = key.split("__")[0]
+        options[f"{scheme}__min_rounds"] = options[key]
+
+    return CryptContext(deprecated="auto", **options)
+
+
+class PasswordPoolSaturated(Exception):
+    """
+    Raised when the password pool is full; callers should answer 503.
+    """
+
+
+# ============================================================
+# Bounded worker pool for password hashing / verification
+# ============================================================
+
+class PasswordHasher:
+    """
+    Runs CPU-heavy hash/verify calls on a small dedicated pool instead of the
+    shared request threadpool. At most `workers + queue_depth` calls are in
+    flight; anything beyond that is rejected immediately so a login storm
+    cannot tie up every request thread. The *_async methods wait on the
+    event loop, so a pending call holds no request thread at all.
+    """
+
+    def __init__(self, context: CryptContext, workers: int, queue_depth: int, timeout: float):
+        self.context = context
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password")
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordPoolSaturated("Password pool is saturated")
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _run(self, fn, *args):
+        future = self._submit(fn, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordPoolSaturated("Password pool timed out")
+
+    async def _run_async(self, fn, *args):
+        future = self._submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            raise PasswordPoolSaturated("Password pool timed out")
+
+    def hash(self, password: str) -> str:
+        return self._run(self.context.hash, password)
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return self._run(self.context.verify, password, hashed)
+
+    def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """
+        Returns (valid, new_hash); new_hash is set when the stored hash uses
+        a deprecated scheme or a lower cost than the active profile.
+        """
+        return self._run(self.context.verify_and_update, password, hashed)
+
+    async def verify_and_update_async(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        return await self._run_async(self.context.verify_and_update, password, hashed)
+
+
+password_hasher = PasswordHasher(
+    build_crypt_context(
+        settings.PASSWORD_HASH_PROFILE,
+        schemes=settings.PASSWORD_HASH_SCHEMES,
+        bcrypt_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    ),
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_depth=settings.PASSWORD_HASH_QUEUE_DEPTH,
+    timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS,
+)
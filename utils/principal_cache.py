@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from config.settings import settings
+from utils.jwt_helper import hash_token
+from utils.metrics import record_cache
+
+
+# ============================================================
+# Authenticated principal snapshot
+# ============================================================
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Immutable view of an authenticated user.
+    Returned by get_current_user instead of the ORM User so it can be
+    cached and shared between requests without a DB session.
+    """
+    id: int
+    email: str
+    username: str
+    roles: Tuple[str, ...]
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            roles=tuple(r.name for r in user.roles),
+        )
+
+
+# ============================================================
+# Bounded TTL cache of verified access tokens
+# ============================================================
+
+class PrincipalCache:
+    """
+    LRU cache of verified access tokens keyed by the token digest.
+    Entries live for at most `ttl` seconds and never past the token's `exp`,
+    so a token revoked on another worker stops working within `ttl`.
+    """
+
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, Principal]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+
+    def get(self, token: str) -> Optional[Principal]:
+        if not self.enabled:
+            return None
+
+        key = hash_token(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        record_cache("principal", hit=entry is not None)
+        return entry[1] if entry else None
+
+    def set(self, token: str, principal: Principal, token_exp: Optional[float] = None):
+        if not self.enabled:
+            return
+
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+
+        key = hash_token(token)
+        with self._lock:
+            self._entries[key] = (expires_at, principal)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str):
+        self.invalidate_digest(hash_token(token))
+
+    def invalidate_digest(self, digest: bytes):
+        with self._lock:
+            self._entries.pop(digest, None)
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            stale = [k for k, (_, p) in self._entries.items() if p.id == user_id]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
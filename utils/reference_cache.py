@@ -0,0 +1,169 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from database.db import SessionLocal
+from utils.metrics import record_cache
+from app.controllers.contact_type_controller import ContactTypeOptionController
+from app.controllers.lead_type_controller import LeadTypeOptionController
+from app.controllers.timezone_controller import TimezoneController
+from app.models.contact_type_option import ContactTypeOption
+from app.models.lead_type_option import LeadTypeOption
+from app.models.timezone import Timezone
+
+# Minimum age of a table before an unknown id triggers a reload; an id still
+# unknown after that reload is remembered until the table is next reloaded
+MISS_RELOAD_SECONDS = 5
+
+
+# ============================================================
+# In-memory cache for small, rarely changing lookup tables
+# ============================================================
+
+class ReferenceDataCache:
+    """
+    Holds the full contents of each reference table as the list the API
+    returns, plus an id -> label map for serializers.
+
+    A table is reloaded when it is written through any Session in this
+    process, when `ttl` expires (to pick up writes from other processes), or
+    when invalidate() is called. ETags hash the content together with
+    REFERENCE_DATA_VERSION, so every worker hands out the same tag.
+    """
+
+    def __init__(self, session_factory, ttl: int, version: str):
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self.version = version
+        self._loaders: Dict[str, Callable[[Session], list]] = {}
+        self._models: Dict[type, str] = {}
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, model, loader: Callable[[Session], list]):
+        self._loaders[name] = loader
+        self._models[model] = name
+
+    def get(self, name: str) -> Tuple[list, str]:
+        entry = self._entry(name)
+        return entry["items"], entry["etag"]
+
+    def label(self, name: str, id: Optional[int]) -> Optional[str]:
+        if id is None:
+            return None
+
+        entry = self._entry(name)
+        if id in entry["labels"] or id in entry["missing"]:
+            return entry["labels"].get(id)
+
+        if entry["loaded_at"] + MISS_RELOAD_SECONDS < time.monotonic():
+            # Probably a row added by another process since the last load
+            self.invalidate(name)
+            entry = self._entry(name)
+            if id not in entry["labels"]:
+                # A dangling or probed id: don't reload again for it
+                entry["missing"].add(id)
+        return entry["labels"].get(id)
+
+    async def warm_async(self, name: str, ids: Iterable[Optional[int]] = ()):
+        """
+        For the event loop: make label(name, id) answerable without I/O for
+        each of `ids`. A stale table or an unknown id is (re)loaded in the
+        threadpool; a fresh table costs nothing.
+        """
+        ids = [id for id in ids if id is not None]
+        entry = self._entries.get(name)
+        if entry and entry["loaded_at"] + self.ttl > time.monotonic() and all(
+            id in entry["labels"] or id in entry["missing"] for id in ids
+        ):
+            return
+
+        def load():
+            self._entry(name)
+            for id in ids:
+                self.label(name, id)
+
+        await run_in_threadpool(load)
+
+    async def label_async(self, name: str, id: Optional[int]) -> Optional[str]:
+        await self.warm_async(name, [id])
+        return self.label(name, id)
+
+    def invalidate(self, name: Optional[str] = None):
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+
+    def invalidate_models(self, models):
+        for model in models:
+            name = self._models.get(model)
+            if name:
+                self.invalidate(name)
+
+    def _entry(self, name: str) -> dict:
+        entry = self._entries.get(name)
+        if entry and entry["loaded_at"] + self.ttl > time.monotonic():
+            record_cache("reference", hit=True)
+            return entry
+
+        record_cache("reference", hit=False)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry and entry["loaded_at"] + self.ttl > time.monotonic():
+                return entry
+
+            db = self.session_factory()
+            try:
+                items = self._loaders[name](db)
+            finally:
+                db.close()
+
+            digest = hashlib.sha1(json.dumps(items, sort_keys=True, default=str).encode()).hexdigest()
+            entry = {
+                "items": items,
+                "labels": {item["id"]: item["label"] for item in items},
+                "missing": set(),
+                "etag": f'"{name}-{self.version}-{digest[:16]}"',
+                "loaded_at": time.monotonic(),
+            }
+            self._entries[name] = entry
+            return entry
+
+
+def _track_reference_writes(session: Session, flush_context):
+    changed = session.info.setdefault("reference_models_changed", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        changed.add(type(obj))
+
+
+def _invalidate_after_commit(session: Session):
+    changed = session.info.pop("reference_models_changed", None)
+    if changed:
+        reference_cache.invalidate_models(changed)
+
+
+def _discard_after_rollback(session: Session, previous_transaction):
+    session.info.pop("reference_models_changed", None)
+
+
+reference_cache = ReferenceDataCache(
+    SessionLocal,
+    ttl=settings.REFERENCE_CACHE_TTL_SECONDS,
+    version=settings.REFERENCE_DATA_VERSION,
+)
+reference_cache.register("lead_types", LeadTypeOption, LeadTypeOptionController.get_all_lead_type_options)
+reference_cache.register("contact_types", ContactTypeOption, ContactTypeOptionController.get_all_contact_type_options)
+reference_cache.register("timezones", Timezone, TimezoneController.get_all_timezones)
+
+event.listen(Session, "after_flush", _track_reference_writes)
+event.listen(Session, "after_commit", _invalidate_after_commit)
+event.listen(Session, "after_soft_rollback", _discard_after_rollback)
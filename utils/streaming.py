@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import Iterable, Iterator, List
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Rows per chunk written to the socket
+CHUNK_ROWS = 500
+
+
+def _chunks(items: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _flatten(item: dict, prefix: str = "") -> dict:
+    """
+    One CSV cell per leaf: nested dicts become `parent.child` columns and
+    lists are joined with " | ".
+    """
+    flat = {}
+    for key, value in item.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, list):
+            flat[name] = " | ".join(str(v) for v in value)
+        else:
+            flat[name] = value
+    return flat
+
+
+def ndjson_stream(items: Iterable[dict]) -> Iterator[str]:
+    for chunk in _chunks(items, CHUNK_ROWS):
+        yield "".join(json.dumps(item, default=str) + "\n" for item in chunk)
+
+
+def csv_stream(items: Iterable[dict], columns: List[str]) -> Iterator[str]:
+    """
+    CSV with a fixed header; `columns` are the flattened names (e.g.
+    `company.name`). Missing values (e.g. a null company) are left empty.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    for chunk in _chunks(items, CHUNK_ROWS):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(_flatten(item) for item in chunk)
+        yield buffer.getvalue()
+
+
+def export_stream(items: Iterable[dict], export_format: str, csv_columns: List[str]) -> Iterator[str]:
+    if export_format == "csv":
+        return csv_stream(items, csv_columns)
+    return ndjson_stream(items)